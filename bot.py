@@ -2,6 +2,7 @@ import logging
 import os
 
 from telegram.ext import (
+    AIORateLimiter,
     ApplicationBuilder,
     CommandHandler,
     ConversationHandler,
@@ -44,6 +45,10 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
 )
+# Формат не использует thread/process - не собираем эти поля для каждой записи
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logger = logging.getLogger(__name__)
 
 
@@ -68,6 +73,11 @@ def get_bot_token() -> str:
     raise RuntimeError("BOT_TOKEN не установлен")
 
 
+async def _close_db_pool(application):
+    """post_shutdown: закрывает соединения пула PostgreSQL"""
+    db.close_connection_pool()
+
+
 def main():
     # Логируем версию бота при старте
     logger.info(f"🚀 ЗАПУСК БОТА - Версия: {BOT_VERSION}")
@@ -88,6 +98,7 @@ def main():
     db.migrate_add_videos_to_orders()  # Добавляем поле videos в таблицу orders (campaigns)
     db.migrate_add_name_change_tracking()  # Добавляем отслеживание изменения имени рекламодателя (1 раз в месяц)
     db.migrate_add_chat_system()  # Создаём таблицы для чата между рекламодателем и блогером
+    db.migrate_add_chat_unread_counters()  # Счётчики непрочитанных сообщений в чатах
     db.migrate_add_transactions()  # Создаём таблицу для истории транзакций
     db.migrate_add_notification_settings()  # Добавляем настройки уведомлений для блогеров
     db.migrate_normalize_categories()  # ИСПРАВЛЕНИЕ: Нормализация категорий блогеров (точный поиск вместо LIKE)
@@ -126,7 +137,25 @@ def main():
     logger.info("   - Исправлены тестовые команды и PostgreSQL Row доступ")
     logger.info("=" * 80)
 
-    application = ApplicationBuilder().token(token).build()
+    # Клиентский лимит исходящих запросов к Telegram API: сглаживает всплески
+    # (листание фото, массовые уведомления) вместо 429 и потерянных сообщений
+    builder = ApplicationBuilder().token(token)
+    try:
+        builder = builder.rate_limiter(AIORateLimiter(
+            overall_max_rate=30,
+            overall_time_period=1,
+            group_max_rate=20,
+            group_time_period=60,
+        ))
+    except RuntimeError as e:
+        # aiolimiter не установлен (нет extra python-telegram-bot[rate-limiter])
+        logger.warning(f"⚠️ AIORateLimiter недоступен, запуск без лимита запросов: {e}")
+    # Фоновые обработчики очереди уведомлений о новых кампаниях
+    builder = builder.post_init(handlers.start_notification_workers)
+    # post_stop выполняется раньше post_shutdown: очередь досылается, пока открыт пул БД
+    builder = builder.post_stop(handlers.stop_notification_workers)
+    builder = builder.post_shutdown(_close_db_pool)
+    application = builder.build()
 
     # --- Команда /start (ОТДЕЛЬНО от ConversationHandler) ---
     logger.info("🔧 [STARTUP] Регистрация команды /start в group=-1")
@@ -843,7 +872,8 @@ def main():
     application.add_handler(
         CallbackQueryHandler(
             handlers.blogger_campaign_photo_nav,
-            pattern="^order_photo_(prev|next)_"
+            pattern="^order_photo_(prev|next)_",
+            block=False  # Нажатия обрабатываются параллельно - нужно для дебаунса листания
         )
     )
 
@@ -1073,6 +1103,10 @@ def main():
         CommandHandler("banned", handlers.banned_users_command)
     )
 
+    application.add_handler(
+        CallbackQueryHandler(handlers.banned_users_page, pattern="^banned_users_page_")
+    )
+
     # Команда статистики (только для администратора)
     application.add_handler(
         CommandHandler("stats", handlers.stats_command)
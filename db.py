@@ -1,5 +1,9 @@
 import os
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -93,6 +97,138 @@ class RateLimiter:
 _rate_limiter = RateLimiter()
 
 
+class TTLCache:
+    """
+    In-memory кэш с ограничением размера и временем жизни записей.
+
+    Потокобезопасен: вызовы могут приходить как из event loop, так и из
+    потоков asyncio.to_thread. При переполнении сначала удаляются
+    просроченные записи, затем самые старые.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self._data = {}  # {key: (expires_at, value)}
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Возвращает значение или default, если записи нет или она просрочена"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        """Сохраняет значение с новым временем жизни"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self._maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + self._ttl, value)
+
+    def pop(self, key, default=None):
+        """Удаляет запись (инвалидация после изменения данных)"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        if len(self._data) >= self._maxsize:
+            # dict сохраняет порядок вставки - первый ключ самый старый
+            del self._data[next(iter(self._data))]
+
+
+# Кэши строк пользователя и профилей: читаются почти на каждое нажатие кнопки,
+# меняются редко. Любая запись в users/bloggers/advertisers сбрасывает все три.
+_user_cache = TTLCache(maxsize=10000, ttl=60)
+_worker_profile_cache = TTLCache(maxsize=10000, ttl=60)
+_client_profile_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+# Флаг уведомлений блогера: читается при рассылке о новых кампаниях, меняется
+# только переключателем в настройках (set_notifications_enabled сбрасывает запись)
+_notifications_enabled_cache = TTLCache(maxsize=10000, ttl=300)
+
+
+# Права админа: список меняется только через add_admin_user (сбрасывает запись)
+_admin_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+def invalidate_profile_caches():
+    """Сбрасывает кэши get_user / get_worker_profile / get_client_profile"""
+    _user_cache.clear()
+    _worker_profile_cache.clear()
+    _client_profile_cache.clear()
+
+
+class NegativeLookupFilter:
+    """
+    In-process фильтр для быстрых отрицательных ответов на проверки существования
+    (роль Bloom-фильтра, но без ложных "нет").
+
+    Для каждого владельца (мастера) загружает множество campaign_id и держит его
+    в TTLCache (ограничен по размеру и времени жизни).
+    "Нет в множестве" означает "точно нет в БД" - запрос не нужен;
+    "есть" перепроверяется SQL-запросом (запись могла быть удалена).
+    Новые записи добавляются через add() после commit в функции, что пишет в БД.
+
+    Загрузка идёт без блокировки. Записи, добавленные во время загрузки
+    (запрос мог их не увидеть), запоминаются и объединяются с результатом.
+    """
+
+    def __init__(self, loader, maxsize=10000, ttl=600):
+        self._loader = loader  # owner_id -> iterable campaign_id
+        self._items = TTLCache(maxsize=maxsize, ttl=ttl)  # {owner_id: set(campaign_id)}
+        self._pending = {}  # {owner_id: (число идущих загрузок, set добавленных за время загрузки)}
+        self._lock = threading.Lock()
+
+    def might_contain(self, owner_id, item):
+        items = self._items.get(owner_id)
+        if items is None:
+            items = self._load(owner_id)
+        return item in items
+
+    def _load(self, owner_id):
+        with self._lock:
+            loads, added = self._pending.get(owner_id, (0, set()))
+            self._pending[owner_id] = (loads + 1, added)
+        items = None
+        try:
+            items = set(self._loader(owner_id))
+        finally:
+            with self._lock:
+                loads, added = self._pending.pop(owner_id)
+                if loads > 1:
+                    self._pending[owner_id] = (loads - 1, added)
+                if items is not None:
+                    items |= added
+                    self._items.set(owner_id, items)
+        return items
+
+    def add(self, owner_id, item):
+        with self._lock:
+            items = self._items.get(owner_id)
+            # Если множество ещё не загружено - загрузка из БД увидит новую запись сама
+            if items is not None:
+                items.add(item)
+            pending = self._pending.get(owner_id)
+            if pending is not None:
+                pending[1].add(item)
+
+
 def validate_string_length(value, max_length, field_name):
     """
     Проверяет длину строки и обрезает если необходимо.
@@ -209,6 +345,20 @@ if DATABASE_URL:
 
     # Connection pool для PostgreSQL (повышает производительность в 10 раз)
     _connection_pool = None
+    # Размер пула настраивается через окружение (DB_POOL_MIN / DB_POOL_MAX)
+    DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "5"))
+    DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+    # ThreadedConnectionPool при исчерпании бросает PoolError; семафор заставляет
+    # потоки asyncio.to_thread ждать свободное соединение вместо ошибки
+    _pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+    POOL_WAIT_TIMEOUT = 30
+
+    class PreparedStatementsConnection(psycopg2.extensions.connection):
+        """Соединение, которое помнит, какие prepared statements уже созданы в его сессии"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prepared_statements = set()
 
     def init_connection_pool():
         """Инициализирует пул соединений при запуске приложения"""
@@ -216,11 +366,12 @@ if DATABASE_URL:
         if _connection_pool is None:
             try:
                 _connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=5,   # Минимум 5 готовых соединений
-                    maxconn=20,  # Максимум 20 одновременных соединений
-                    dsn=DATABASE_URL
+                    minconn=DB_POOL_MIN,  # Готовые соединения
+                    maxconn=DB_POOL_MAX,  # Максимум одновременных соединений
+                    dsn=DATABASE_URL,
+                    connection_factory=PreparedStatementsConnection
                 )
-                logger.info("✅ PostgreSQL connection pool инициализирован (5-20 соединений)")
+                logger.info(f"✅ PostgreSQL connection pool инициализирован ({DB_POOL_MIN}-{DB_POOL_MAX} соединений)")
             except psycopg2.OperationalError as e:
                 logger.error(f"❌ КРИТИЧЕСКАЯ ОШИБКА: Не удалось подключиться к PostgreSQL: {e}", exc_info=True)
                 raise
@@ -244,6 +395,10 @@ else:
     DATABASE_NAME = "/tmp/influencemarket_test.db"
     USE_POSTGRES = False
 
+    # Одно соединение на поток: sqlite3 кэширует скомпилированные выражения
+    # на уровне соединения, поэтому кэш живёт, пока живёт соединение
+    _sqlite_local = threading.local()
+
     def init_connection_pool():
         """Для SQLite пул не нужен"""
         pass
@@ -291,6 +446,8 @@ def is_retryable_postgres_error(error):
 def get_connection():
     """Возвращает подключение к базе данных (из пула для PostgreSQL или новое для SQLite)"""
     if USE_POSTGRES:
+        if not _pool_slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+            raise psycopg2.pool.PoolError(f"Нет свободных соединений в пуле за {POOL_WAIT_TIMEOUT} сек")
         try:
             # Берем соединение из пула (быстро!)
             conn = _connection_pool.getconn()
@@ -301,37 +458,93 @@ def get_connection():
                 conn = _connection_pool.getconn()
             return conn
         except psycopg2.pool.PoolError as e:
+            _pool_slots.release()
             logger.error(f"❌ Ошибка пула соединений PostgreSQL: {e}", exc_info=True)
             raise
         except Exception as e:
+            _pool_slots.release()
             logger.error(f"❌ Неожиданная ошибка при получении соединения: {e}", exc_info=True)
             raise
     else:
-        conn = sqlite3.connect(DATABASE_NAME)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(_sqlite_local, 'conn', None)
+        if conn is None:
+            conn = _open_sqlite_connection()
+            _sqlite_local.conn = conn
         return conn
 
 
+# Размер кэша скомпилированных выражений sqlite3 на соединение (по умолчанию 128).
+# В модуле больше сотни разных запросов - с запасом, чтобы горячие не вытеснялись.
+SQLITE_CACHED_STATEMENTS = 256
+
+
+def _open_sqlite_connection(check_same_thread=True):
+    """
+    Открывает соединение SQLite.
+
+    WAL позволяет читателям из разных потоков (asyncio.to_thread) не ждать писателя,
+    busy_timeout - подождать блокировку вместо мгновенной ошибки "database is locked".
+    Кэш выражений (cached_statements) избавляет повторные запросы от разбора SQL.
+    """
+    conn = sqlite3.connect(
+        DATABASE_NAME,
+        check_same_thread=check_same_thread,
+        cached_statements=SQLITE_CACHED_STATEMENTS,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
 def return_connection(conn):
     """Возвращает соединение в пул (только для PostgreSQL)"""
     if USE_POSTGRES:
-        _connection_pool.putconn(conn)
-    else:
-        # Для SQLite просто закрываем
-        conn.close()
+        try:
+            _connection_pool.putconn(conn)
+        finally:
+            _pool_slots.release()
+    # Для SQLite соединение остаётся открытым за потоком (сохраняется кэш выражений)
+
+
+# Соединение, привязанное к блоку db.* вызовов через request_scope()
+current_conn = ContextVar('current_conn', default=None)
 
 
 class DatabaseConnection:
     """
     Context manager для автоматического управления соединениями с пулом.
     ИСПРАВЛЕНО: Добавлен rollback при ошибках для PostgreSQL.
+    Внутри request_scope() используется соединение scope.
     """
 
     def __enter__(self):
+        self.scoped_conn = current_conn.get()
+        if self.scoped_conn is not None:
+            return self.scoped_conn
         self.conn = get_connection()
         return self.conn
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.scoped_conn is not None:
+            # Соединение scope общее, но транзакция у каждого вызова своя:
+            # commit/rollback как обычно, только без возврата соединения в пул
+            self.conn = self.scoped_conn
+            if exc_type is None:
+                try:
+                    self.conn.commit()
+                except Exception as e:
+                    logger.error(f"❌ ОШИБКА COMMIT БД: {e}", exc_info=True)
+                    self.conn.rollback()
+                    raise
+            else:
+                try:
+                    self.conn.rollback()
+                    logger.warning(f"⚠️ Rollback выполнен из-за ошибки: {exc_type.__name__}")
+                except Exception as rollback_error:
+                    logger.error(f"❌ ОШИБКА ROLLBACK: {rollback_error}", exc_info=True)
+            return False
+
         if exc_type is None:
             # Нет ошибок - коммитим изменения
             try:
@@ -370,6 +583,36 @@ def get_db_connection():
     return DatabaseConnection()
 
 
+@contextmanager
+def request_scope():
+    """
+    Привязывает одно соединение к блоку подряд идущих вызовов db.*.
+
+    Вызовы db.* внутри блока берут это соединение вместо отдельного соединения
+    из пула на каждый вызов. Транзакции при этом не объединяются: каждая функция
+    фиксирует свои изменения сама, как и без scope.
+    Блок должен содержать только синхронные вызовы БД - без await, иначе
+    соединение пула будет занято на время сетевых запросов к Telegram.
+    Вложенные scope переиспользуют внешний.
+
+    Использование:
+        with db.request_scope():
+            for campaign in campaigns:
+                db.check_worker_bid_exists(campaign['id'], blogger_id)
+    """
+    if current_conn.get() is not None:
+        yield
+        return
+
+    conn = get_connection()
+    token = current_conn.set(conn)
+    try:
+        yield
+    finally:
+        current_conn.reset(token)
+        return_connection(conn)
+
+
 def get_cursor(conn):
     """Возвращает курсор с правильными настройками"""
     if USE_POSTGRES:
@@ -429,6 +672,42 @@ class DBCursor:
 
         return result
 
+    def executemany(self, sql, seq_of_params):
+        """Выполняет один запрос для набора параметров (пакетная запись)"""
+        return self.cursor.executemany(convert_sql(sql), seq_of_params)
+
+    def execute_prepared(self, name, sql, params):
+        """
+        Выполняет часто повторяющийся запрос через prepared statement.
+
+        PostgreSQL: PREPARE выполняется один раз на сессию соединения, дальше только
+        EXECUTE - сервер не парсит и не планирует запрос заново на каждый вызов.
+        SQLite: обычный execute - sqlite3 сам кэширует скомпилированные выражения
+        на (постоянном) соединении.
+
+        Args:
+            name: Имя prepared statement (уникальное для текста запроса)
+            sql: Запрос с плейсхолдерами "?"
+            params: Параметры запроса
+        """
+        if not USE_POSTGRES:
+            return self.execute(sql, params)
+
+        conn = self.cursor.connection
+        prepared = getattr(conn, 'prepared_statements', None)
+        if prepared is None:
+            # Соединение не из пула (без PreparedStatementsConnection) - выполняем как обычно
+            return self.execute(sql, params)
+
+        if name not in prepared:
+            parts = sql.split('?')
+            pg_sql = parts[0] + ''.join(f"${i}{part}" for i, part in enumerate(parts[1:], start=1))
+            self.cursor.execute(f"PREPARE {name} AS {pg_sql}")
+            prepared.add(name)
+
+        placeholders = ', '.join(['%s'] * len(params))
+        return self.cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+
     def fetchone(self):
         return self.cursor.fetchone()
 
@@ -677,11 +956,19 @@ def migrate_add_portfolio_photos():
 # --- Пользователи ---
 
 def get_user(telegram_id):
+    user = _user_cache.get(telegram_id)
+    if user is not None:
+        return user
+
     with get_db_connection() as conn:
 
         cursor = get_cursor(conn)
-        cursor.execute("SELECT * FROM users WHERE telegram_id = ?", (telegram_id,))
-        return cursor.fetchone()
+        cursor.execute_prepared("get_user", "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,))
+        user = cursor.fetchone()
+        # Отсутствие пользователя не кэшируем - он может зарегистрироваться в любой момент
+        if user is not None:
+            _user_cache.set(telegram_id, user)
+        return user
 
 
 # Алиас для совместимости с кодом в handlers.py
@@ -707,6 +994,7 @@ def create_user(telegram_id, role):
             (telegram_id, role, created_at),
         )
         conn.commit()
+        invalidate_profile_caches()
         user_id = cursor.lastrowid
         logger.info(f"✅ Создан пользователь: ID={user_id}, Telegram={telegram_id}, Роль={role}")
         return user_id
@@ -725,6 +1013,7 @@ def update_user_role(user_id, new_role):
             (new_role, user_id),
         )
         conn.commit()
+        invalidate_profile_caches()
         logger.info(f"✅ Роль пользователя {user_id} обновлена на '{new_role}'")
         return True
 
@@ -845,6 +1134,8 @@ def delete_user_profile(telegram_id):
             logger.info(f"✅ Удалён пользователь {telegram_id} (user_id={user_id})")
 
             conn.commit()
+            invalidate_profile_caches()
+            _bump_workers_generation()
             logger.info(f"🎉 ВСЕ профили успешно удалены: telegram_id={telegram_id}")
             return True
 
@@ -899,6 +1190,8 @@ def create_worker_profile(user_id, name, phone, city, regions, categories, exper
         """, (user_id, name, phone, city, regions, categories, experience, description, portfolio_photos, profile_photo))
         blogger_id = cursor.lastrowid
         conn.commit()  # КРИТИЧНО: Без этого транзакция не фиксируется!
+        invalidate_profile_caches()
+        _bump_workers_generation()
         logger.info(f"✅ Создан профиль мастера: ID={blogger_id}, User={user_id}, Имя={name}, Город={city}")
 
     # ИСПРАВЛЕНИЕ: Добавляем категории в нормализованную таблицу
@@ -943,21 +1236,29 @@ def create_client_profile(user_id, name, phone, city, description, regions=None)
         """, (user_id, name, phone, city, description, regions))
         advertiser_id = cursor.lastrowid
         conn.commit()
+        invalidate_profile_caches()
         logger.info(f"✅ Создан профиль клиента: ID={advertiser_id}, User={user_id}, Имя={name}, Город={city}, Регион={regions}")
 
 
 def get_worker_profile(user_id):
     """Возвращает профиль мастера по user_id"""
+    profile = _worker_profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+
     with get_db_connection() as conn:
 
         cursor = get_cursor(conn)
-        cursor.execute("""
+        cursor.execute_prepared("get_worker_profile", """
             SELECT w.*, u.telegram_id
             FROM bloggers w
             JOIN users u ON w.user_id = u.id
             WHERE w.user_id = ?
         """, (user_id,))
-        return cursor.fetchone()
+        profile = cursor.fetchone()
+        if profile is not None:
+            _worker_profile_cache.set(user_id, profile)
+        return profile
 
 
 # Алиас для совместимости с кодом в handlers.py
@@ -1026,16 +1327,43 @@ def calculate_photo_limit(blogger_user_id):
 
 def get_client_profile(user_id):
     """Возвращает профиль заказчика по user_id"""
+    profile = _client_profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+
     with get_db_connection() as conn:
         
         cursor = get_cursor(conn)
-        cursor.execute("""
+        cursor.execute_prepared("get_client_profile", """
             SELECT c.*, u.telegram_id
             FROM advertisers c
             JOIN users u ON c.user_id = u.id
             WHERE c.user_id = ?
         """, (user_id,))
-        return cursor.fetchone()
+        profile = cursor.fetchone()
+        if profile is not None:
+            _client_profile_cache.set(user_id, profile)
+        return profile
+
+
+def get_profile_flags(user_id):
+    """
+    Проверяет наличие профилей блогера и рекламодателя одним запросом.
+
+    Данные профилей не загружаются - только признаки существования.
+
+    Returns:
+        tuple: (has_worker, has_client)
+    """
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute_prepared("get_profile_flags", """
+            SELECT
+                EXISTS(SELECT 1 FROM bloggers WHERE user_id = ?) AS has_worker,
+                EXISTS(SELECT 1 FROM advertisers WHERE user_id = ?) AS has_client
+        """, (user_id, user_id))
+        row = cursor.fetchone()
+        return bool(row['has_worker']), bool(row['has_client'])
 
 
 def get_client_by_id(advertiser_id):
@@ -1090,6 +1418,7 @@ def update_user_rating(user_id, new_rating, role_to):
             """, (new_rating, new_rating, user_id))
 
         conn.commit()
+        invalidate_profile_caches()
 
 
 def add_review(from_user_id, to_user_id, campaign_id, role_from, role_to, rating, comment):
@@ -1119,13 +1448,14 @@ def add_review(from_user_id, to_user_id, campaign_id, role_from, role_to, rating
             return False
 
 
-def get_reviews_for_user(user_id, role):
+def get_reviews_for_user(user_id, role, limit=None):
     """
-    Получает все отзывы о пользователе.
+    Получает отзывы о пользователе (новые первыми).
 
     Args:
         user_id: ID пользователя
         role: Роль пользователя ('blogger' или 'advertiser')
+        limit: Максимум отзывов (None - все)
 
     Returns:
         List of reviews with reviewer info
@@ -1133,8 +1463,8 @@ def get_reviews_for_user(user_id, role):
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
 
-        # Получаем отзывы с информацией о том, кто оставил
-        cursor.execute("""
+        # Получаем отзывы с информацией о том, кто оставил (имя - в том же запросе)
+        query = """
             SELECT
                 r.rating,
                 r.comment,
@@ -1150,11 +1480,29 @@ def get_reviews_for_user(user_id, role):
             LEFT JOIN advertisers c ON r.from_user_id = c.user_id AND r.role_from = 'advertiser'
             WHERE r.to_user_id = ? AND r.role_to = ?
             ORDER BY r.created_at DESC
-        """, (user_id, role))
+        """
+        params = [user_id, role]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        cursor.execute(query, params)
 
         return cursor.fetchall()
 
 
+def count_reviews_for_user(user_id, role):
+    """Количество отзывов о пользователе в роли (по индексу idx_reviews_to_user_role)."""
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute(
+            "SELECT COUNT(*) AS cnt FROM reviews WHERE to_user_id = ? AND role_to = ?",
+            (user_id, role),
+        )
+        row = cursor.fetchone()
+        return row['cnt'] if row else 0
+
+
 def check_review_exists(campaign_id, from_user_id):
     """
     Проверяет, оставил ли пользователь уже отзыв по этому заказу.
@@ -1318,6 +1666,7 @@ def increment_verified_reviews(user_id):
             WHERE user_id = ?
         """, (user_id,))
         conn.commit()
+        invalidate_profile_caches()
 
 
 # --- НОВОЕ: Фотографии завершённых работ ---
@@ -1430,6 +1779,7 @@ def verify_completed_work_photo(photo_id):
                     logger.info(f"✅ Подтверждённое фото {photo_file_id} добавлено в портфолио мастера {blogger_id}")
 
             conn.commit()
+            invalidate_profile_caches()
             return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Ошибка при подтверждении фото: {e}", exc_info=True)
@@ -1625,6 +1975,26 @@ def get_order_by_id(campaign_id):
         return cursor.fetchone()
 
 
+def get_advertiser_user_by_campaign(campaign_id):
+    """
+    Возвращает клиента кампании одним запросом вместо цепочки
+    get_order_by_id -> get_client_by_id -> get_user_by_id.
+
+    Returns:
+        dict-like с полями advertiser_id, telegram_id, user_id или None
+    """
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("""
+            SELECT c.id as advertiser_id, u.telegram_id, u.id as user_id
+            FROM campaigns o
+            JOIN advertisers c ON c.id = o.advertiser_id
+            JOIN users u ON u.id = c.user_id
+            WHERE o.id = ?
+        """, (campaign_id,))
+        return cursor.fetchone()
+
+
 def update_order_status(campaign_id, new_status):
     """
     Обновляет статус заказа.
@@ -1734,6 +2104,54 @@ def mark_order_completed_by_worker(campaign_id):
         return True
 
 
+def complete_campaign_and_get_parties(campaign_id, completed_by):
+    """
+    Завершает кампанию и сразу возвращает данные обеих сторон для уведомления -
+    одна транзакция вместо mark_order_completed_by_* + get_order_by_id +
+    get_worker_info_for_order + get_user_by_id.
+
+    Args:
+        campaign_id: ID кампании
+        completed_by: 'advertiser' или 'blogger' - кто завершает
+
+    Returns:
+        dict-like с полями advertiser_user_id, advertiser_telegram_id,
+        blogger_user_id, blogger_telegram_id (блогер - None, если не выбран)
+        или None, если кампания не найдена
+    """
+    flag_column = "completed_by_client" if completed_by == "advertiser" else "completed_by_worker"
+
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+
+        # Помечаем, кто завершил, и сразу меняем статус
+        cursor.execute(f"""
+            UPDATE campaigns
+            SET {flag_column} = 1,
+                status = 'completed'
+            WHERE id = ?
+        """, (campaign_id,))
+
+        cursor.execute("""
+            SELECT
+                c.user_id AS advertiser_user_id,
+                ua.telegram_id AS advertiser_telegram_id,
+                w.user_id AS blogger_user_id,
+                ub.telegram_id AS blogger_telegram_id
+            FROM campaigns o
+            JOIN advertisers c ON c.id = o.advertiser_id
+            JOIN users ua ON ua.id = c.user_id
+            LEFT JOIN bloggers w ON w.id = o.selected_worker_id
+            LEFT JOIN users ub ON ub.id = w.user_id
+            WHERE o.id = ?
+        """, (campaign_id,))
+        parties = cursor.fetchone()
+
+        conn.commit()
+        logger.info(f"✅ Заказ {campaign_id} завершен ({completed_by})")
+        return parties
+
+
 def get_worker_info_for_order(campaign_id):
     """
     Получает информацию о мастере, работающем над заказом.
@@ -1834,6 +2252,8 @@ def update_worker_field(user_id, field_name, new_value):
         logger.info(f"🔍 UPDATE выполнен")
 
         conn.commit()
+        invalidate_profile_caches()
+        _bump_workers_generation()
         logger.info(f"🔍 COMMIT выполнен")
 
         try:
@@ -1888,6 +2308,7 @@ def update_client_field(user_id, field_name, new_value):
         query = f"UPDATE advertisers SET {safe_field} = ? WHERE user_id = ?"
         cursor.execute(query, (new_value, user_id))
         conn.commit()
+        invalidate_profile_caches()
 
         return cursor.rowcount > 0
 
@@ -1980,6 +2401,7 @@ def update_advertiser_name(user_id, new_name):
         """, (new_name, now, user_id))
 
         conn.commit()
+        invalidate_profile_caches()
 
         if cursor.rowcount > 0:
             return (True, "Название страницы успешно изменено!")
@@ -1989,6 +2411,21 @@ def update_advertiser_name(user_id, new_name):
 
 # --- Поиск мастеров ---
 
+# Поколение данных мастеров: увеличивается при каждом изменении профилей/городов/категорий.
+# Кэши списков мастеров (листание у рекламодателя) включают его в ключ и сбрасываются сами.
+_workers_generation = 0
+
+
+def _bump_workers_generation():
+    global _workers_generation
+    _workers_generation += 1
+
+
+def get_workers_generation():
+    """Текущее поколение данных мастеров (для ключей кэша)"""
+    return _workers_generation
+
+
 def get_all_workers(city=None, category=None):
     """
     ИСПРАВЛЕНО: Использует точный поиск по категориям через blogger_categories.
@@ -2054,6 +2491,66 @@ def get_all_workers(city=None, category=None):
         return results
 
 
+def get_workers_for_campaign_notification(city, categories):
+    """
+    Блогеры для уведомления о новой кампании - одним запросом.
+
+    Те же условия по городу и категориям, что в get_all_workers, но сразу по всем
+    категориям кампании (без дубликатов) и только нужные для рассылки поля,
+    включая настройку уведомлений - без отдельного запроса на каждого блогера.
+
+    Args:
+        city: Город кампании ("Вся Беларусь" - без фильтра по городу)
+        categories: Список категорий кампании
+
+    Returns:
+        List of rows: telegram_id, user_id, notifications_enabled
+    """
+    if not categories:
+        return []
+
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+
+        query = """
+            SELECT DISTINCT u.telegram_id, w.user_id, w.notifications_enabled
+            FROM bloggers w
+            JOIN users u ON w.user_id = u.id
+            WHERE 1=1
+        """
+        params = []
+
+        if city and city != "Вся Беларусь":
+            query += """
+                AND (
+                    EXISTS (
+                        SELECT 1 FROM blogger_cities wc
+                        WHERE wc.blogger_id = w.id AND wc.city = ?
+                    )
+                    OR w.city = ?
+                )
+            """
+            params.extend([city, city])
+
+        # Любая из категорий: через blogger_categories ИЛИ через categories (для старых записей)
+        placeholders = ", ".join(["?"] * len(categories))
+        like_conditions = " OR ".join(["w.categories LIKE ?"] * len(categories))
+        query += f"""
+            AND (
+                EXISTS (
+                    SELECT 1 FROM blogger_categories wc
+                    WHERE wc.blogger_id = w.id AND wc.category IN ({placeholders})
+                )
+                OR {like_conditions}
+            )
+        """
+        params.extend(categories)
+        params.extend(f"%{category}%" for category in categories)
+
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+
 def get_worker_by_id(blogger_id):
     """Получает профиль мастера по ID"""
     with get_db_connection() as conn:
@@ -2099,6 +2596,7 @@ def add_worker_categories(blogger_id, categories_list):
                 pass
 
         conn.commit()
+        _bump_workers_generation()
 
 
 def get_worker_categories(blogger_id):
@@ -2139,6 +2637,7 @@ def clear_worker_categories(blogger_id):
             WHERE blogger_id = ?
         """, (blogger_id,))
         conn.commit()
+        _bump_workers_generation()
 
 
 def add_order_categories(campaign_id, categories_list):
@@ -3161,6 +3660,55 @@ def migrate_add_name_change_tracking():
             traceback.print_exc()
 
 
+def migrate_add_chat_unread_counters():
+    """
+    Добавляет в chats счётчики непрочитанных сообщений для каждой стороны
+    (unread_count_advertiser / unread_count_blogger).
+
+    Счётчик увеличивается при отправке сообщения и обнуляется при открытии чата -
+    вместо UPDATE по всей истории messages на каждое открытие.
+    """
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+
+        try:
+            if USE_POSTGRES:
+                cursor.execute("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_name = 'chats' AND column_name = 'unread_count_advertiser'
+                """)
+                needs_migration = cursor.fetchone() is None
+            else:
+                cursor.execute("PRAGMA table_info(chats)")
+                columns = [column[1] for column in cursor.fetchall()]
+                needs_migration = 'unread_count_advertiser' not in columns
+
+            if needs_migration:
+                cursor.execute("ALTER TABLE chats ADD COLUMN unread_count_advertiser INTEGER DEFAULT 0")
+                cursor.execute("ALTER TABLE chats ADD COLUMN unread_count_blogger INTEGER DEFAULT 0")
+
+                # Переносим текущее состояние непрочитанных сообщений в счётчики
+                cursor.execute("""
+                    UPDATE chats SET
+                        unread_count_advertiser = (
+                            SELECT COUNT(*) FROM messages m
+                            WHERE m.chat_id = chats.id AND m.sender_role = 'blogger' AND m.is_read = FALSE
+                        ),
+                        unread_count_blogger = (
+                            SELECT COUNT(*) FROM messages m
+                            WHERE m.chat_id = chats.id AND m.sender_role = 'advertiser' AND m.is_read = FALSE
+                        )
+                """)
+
+            conn.commit()
+            print("✅ Chat unread counters migration completed successfully!")
+
+        except Exception as e:
+            print(f"⚠️  Ошибка при добавлении счётчиков непрочитанных в chats: {e}")
+            import traceback
+            traceback.print_exc()
+
+
 # === CHAT SYSTEM HELPERS ===
 
 def create_chat(campaign_id, advertiser_user_id, blogger_user_id, offer_id):
@@ -3211,6 +3759,30 @@ def get_chat_by_id(chat_id):
         return cursor.fetchone()
 
 
+def get_counterpart_name(chat_id, my_role):
+    """
+    Возвращает имя собеседника в чате одним запросом.
+
+    Args:
+        chat_id: ID чата
+        my_role: Роль текущего пользователя ('advertiser' или 'blogger')
+
+    Returns:
+        str: Имя из профиля собеседника или None, если профиля нет
+    """
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("""
+            SELECT CASE WHEN ? = 'advertiser' THEN b.name ELSE a.name END AS name
+            FROM chats c
+            LEFT JOIN bloggers b ON b.user_id = c.blogger_user_id
+            LEFT JOIN advertisers a ON a.user_id = c.advertiser_user_id
+            WHERE c.id = ?
+        """, (my_role, chat_id))
+        result = cursor.fetchone()
+        return result['name'] if result else None
+
+
 def get_user_chats(user_id):
     """Получает все чаты пользователя"""
     with get_db_connection() as conn:
@@ -3233,63 +3805,102 @@ def send_message(chat_id, sender_user_id, sender_role, message_text):
         cursor = get_cursor(conn)
 
         # Добавляем сообщение
-        cursor.execute("""
-            INSERT INTO messages (chat_id, sender_user_id, sender_role, message_text, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (chat_id, sender_user_id, sender_role, message_text, datetime.now().isoformat()))
+        if USE_POSTGRES:
+            cursor.execute_prepared("send_message_insert", """
+                INSERT INTO messages (chat_id, sender_user_id, sender_role, message_text, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                RETURNING id
+            """, (chat_id, sender_user_id, sender_role, message_text, datetime.now().isoformat()))
+            row = cursor.fetchone()
+            message_id = row['id'] if row else None
+        else:
+            cursor.execute("""
+                INSERT INTO messages (chat_id, sender_user_id, sender_role, message_text, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (chat_id, sender_user_id, sender_role, message_text, datetime.now().isoformat()))
+            message_id = cursor.lastrowid
 
-        # Обновляем время последнего сообщения в чате
-        cursor.execute("""
+        # Обновляем время последнего сообщения и счётчик непрочитанных у собеседника
+        cursor.execute_prepared("send_message_touch_chat", """
             UPDATE chats
-            SET last_message_at = ?
+            SET last_message_at = ?,
+                unread_count_advertiser = unread_count_advertiser + CASE WHEN ? = 'blogger' THEN 1 ELSE 0 END,
+                unread_count_blogger = unread_count_blogger + CASE WHEN ? = 'advertiser' THEN 1 ELSE 0 END
             WHERE id = ?
-        """, (datetime.now().isoformat(), chat_id))
+        """, (datetime.now().isoformat(), sender_role, sender_role, chat_id))
 
         conn.commit()
-        return cursor.lastrowid
+        return message_id
 
 
 def get_chat_messages(chat_id, limit=50):
-    """Получает сообщения чата"""
+    """
+    Получает последние сообщения чата в хронологическом порядке (старые сверху).
+
+    Возвращает колонки, а не строки: (sender_roles, texts, created_ats) -
+    рендер истории проходит по ним через zip без создания dict на каждое сообщение.
+    """
     with get_db_connection() as conn:
-        cursor = get_cursor(conn)
-        cursor.execute("""
-            SELECT * FROM messages
+        # Обычный (не RealDict) курсор - строки приходят кортежами
+        cursor = conn.cursor()
+        cursor.execute(convert_sql("""
+            SELECT sender_role, message_text, created_at FROM messages
             WHERE chat_id = ?
             ORDER BY created_at DESC
             LIMIT ?
-        """, (chat_id, limit))
-        return cursor.fetchall()
+        """), (chat_id, limit))
+        rows = cursor.fetchall()
+        rows.reverse()
+        if not rows:
+            return (), (), ()
+        sender_roles, texts, created_ats = zip(*rows)
+        return sender_roles, texts, created_ats
+
+
+def reset_unread_count(chat_id, role):
+    """
+    Обнуляет счётчик непрочитанных сообщений для стороны чата (при открытии чата).
 
+    messages.is_read поддерживается в том же commit, но только если счётчик был
+    ненулевым: открытие уже прочитанного чата - один UPDATE по chats, а отмечаются
+    лишь ещё не прочитанные сообщения собеседника, а не вся история.
+
+    Args:
+        chat_id: ID чата
+        role: Роль читающего пользователя ('advertiser' или 'blogger')
+    """
+    if role not in ('advertiser', 'blogger'):
+        raise ValueError(f"Недопустимая роль: {role}")
+    other_role = 'blogger' if role == 'advertiser' else 'advertiser'
 
-def mark_messages_as_read(chat_id, user_id):
-    """Отмечает сообщения как прочитанные для пользователя"""
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
-        cursor.execute("""
-            UPDATE messages
-            SET is_read = TRUE
-            WHERE chat_id = ? AND sender_user_id != ?
-        """, (chat_id, user_id))
+        cursor.execute(
+            f"UPDATE chats SET unread_count_{role} = 0 WHERE id = ? AND unread_count_{role} > 0",
+            (chat_id,)
+        )
+        if cursor.rowcount > 0:
+            cursor.execute("""
+                UPDATE messages SET is_read = TRUE
+                WHERE chat_id = ? AND sender_role = ? AND is_read = FALSE
+            """, (chat_id, other_role))
         conn.commit()
 
 
 def get_unread_messages_count(chat_id, user_id):
-    """Получает количество непрочитанных сообщений"""
+    """Получает количество непрочитанных сообщений (из счётчика в chats)"""
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
         cursor.execute("""
-            SELECT COUNT(*) FROM messages
-            WHERE chat_id = ? AND sender_user_id != ? AND is_read = FALSE
-        """, (chat_id, user_id))
+            SELECT CASE WHEN advertiser_user_id = ? THEN unread_count_advertiser
+                        ELSE unread_count_blogger END AS unread_count
+            FROM chats
+            WHERE id = ?
+        """, (user_id, chat_id))
         result = cursor.fetchone()
         if not result:
             return 0
-        # PostgreSQL возвращает dict, SQLite может вернуть tuple
-        if isinstance(result, dict):
-            return result.get('count', 0)
-        else:
-            return result[0]
+        return result['unread_count'] or 0
 
 
 def confirm_worker_in_chat(chat_id):
@@ -3372,14 +3983,9 @@ def get_active_chat(telegram_id):
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
 
-        if USE_POSTGRES:
-            cursor.execute("""
-                SELECT chat_id, role FROM active_chats WHERE telegram_id = %s
-            """, (telegram_id,))
-        else:
-            cursor.execute("""
-                SELECT chat_id, role FROM active_chats WHERE telegram_id = ?
-            """, (telegram_id,))
+        cursor.execute_prepared("get_active_chat", """
+            SELECT chat_id, role FROM active_chats WHERE telegram_id = ?
+        """, (telegram_id,))
 
         result = cursor.fetchone()
 
@@ -3477,6 +4083,74 @@ def get_expired_chats(hours=24):
         return cursor.fetchall()
 
 
+def expire_unanswered_chats(hours=24):
+    """
+    Обрабатывает чаты, где блогер не ответил за hours часов, одной транзакцией.
+
+    Для всех таких чатов сразу: рейтинг блогера снижается (оценка 1.0),
+    кампания возвращается в 'open', отклик помечается 'rejected', чат - 'expired'
+    (чтобы следующий запуск не обработал его повторно).
+    Вместо 6 запросов на каждый чат - один SELECT с JOIN и по одному UPDATE на таблицу.
+
+    Returns:
+        Список обработанных чатов: id, campaign_id, title,
+        advertiser_telegram_id, blogger_telegram_id
+    """
+    from datetime import datetime, timedelta
+
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        expiration_time = datetime.now() - timedelta(hours=hours)
+
+        # Чаты без кампании или пользователей отсекаются JOIN-ами
+        cursor.execute("""
+            SELECT
+                ch.id,
+                ch.campaign_id,
+                ch.blogger_user_id,
+                ch.offer_id,
+                o.title,
+                ua.telegram_id AS advertiser_telegram_id,
+                uw.telegram_id AS blogger_telegram_id
+            FROM chats ch
+            JOIN campaigns o ON ch.campaign_id = o.id
+            JOIN users ua ON ch.advertiser_user_id = ua.id
+            JOIN users uw ON ch.blogger_user_id = uw.id
+            WHERE ch.blogger_confirmed = FALSE
+            AND ch.created_at < ?
+            AND COALESCE(ch.status, 'active') <> 'expired'
+        """, (expiration_time.isoformat(),))
+        chats = cursor.fetchall()
+
+        if not chats:
+            return []
+
+        # 1. Снижаем рейтинг блогеров (негативная оценка 1.0 из 5.0) - тот же
+        # атомарный UPDATE, что в update_user_rating, пакетом
+        cursor.executemany("""
+            UPDATE bloggers
+            SET
+                rating = CASE
+                    WHEN rating_count = 0 THEN ?
+                    ELSE (rating * rating_count + ?) / (rating_count + 1)
+                END,
+                rating_count = rating_count + 1
+            WHERE user_id = ?
+        """, [(1.0, 1.0, chat['blogger_user_id']) for chat in chats])
+
+        # 2. Кампании снова открыты, 3. отклики отклонены, 4. чаты обработаны
+        for sql, ids in (
+            ("UPDATE campaigns SET status = 'open' WHERE id IN ({})", {chat['campaign_id'] for chat in chats}),
+            ("UPDATE offers SET status = 'rejected' WHERE id IN ({})", {chat['offer_id'] for chat in chats}),
+            ("UPDATE chats SET status = 'expired' WHERE id IN ({})", {chat['id'] for chat in chats}),
+        ):
+            cursor.execute(sql.format(', '.join(['?'] * len(ids))), tuple(ids))
+
+        conn.commit()
+        invalidate_profile_caches()
+        return chats
+
+
 def mark_chat_as_expired(chat_id):
     """Помечает чат как просроченный (мастер не ответил вовремя)"""
     with get_db_connection() as conn:
@@ -3499,6 +4173,10 @@ def are_notifications_enabled(user_id):
         True если уведомления включены или настройка не найдена (по умолчанию включены)
         False если уведомления отключены
     """
+    enabled = _notifications_enabled_cache.get(user_id)
+    if enabled is not None:
+        return enabled
+
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
         cursor.execute("""
@@ -3510,14 +4188,16 @@ def are_notifications_enabled(user_id):
 
         # Если запись не найдена или поле не существует - по умолчанию включены
         if not result:
-            return True
-
+            enabled = True
         # PostgreSQL возвращает dict, SQLite может вернуть tuple
-        if isinstance(result, dict):
-            return bool(result.get('notifications_enabled', True))
+        elif isinstance(result, dict):
+            enabled = bool(result.get('notifications_enabled', True))
         else:
             # SQLite хранит boolean как INTEGER (1 или 0)
-            return bool(result[0]) if result[0] is not None else True
+            enabled = bool(result[0]) if result[0] is not None else True
+
+        _notifications_enabled_cache.set(user_id, enabled)
+        return enabled
 
 
 def set_notifications_enabled(user_id, enabled):
@@ -3552,6 +4232,8 @@ def set_notifications_enabled(user_id, enabled):
             """, (value, user_id))
 
         conn.commit()
+        invalidate_profile_caches()
+        _notifications_enabled_cache.pop(user_id)
         return cursor.rowcount > 0
 
 
@@ -3619,6 +4301,7 @@ def set_client_notifications_enabled(user_id, enabled):
             """, (value, user_id))
 
         conn.commit()
+        invalidate_profile_caches()
         return cursor.rowcount > 0
 
 
@@ -3729,6 +4412,7 @@ def ban_user(telegram_id, reason, banned_by):
             WHERE telegram_id = ?
         """, (reason, datetime.now().isoformat(), banned_by, telegram_id))
         conn.commit()
+        invalidate_profile_caches()
         return cursor.rowcount > 0
 
 
@@ -3745,22 +4429,47 @@ def unban_user(telegram_id):
             WHERE telegram_id = ?
         """, (telegram_id,))
         conn.commit()
+        invalidate_profile_caches()
         return cursor.rowcount > 0
 
 
-def get_banned_users():
-    """Получает список всех забаненных пользователей"""
+def get_banned_users(limit=None, offset=0):
+    """
+    Получает забаненных пользователей (новые баны первыми).
+
+    Args:
+        limit: Размер страницы (None - все)
+        offset: Сколько пропустить от начала списка
+    """
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
-        cursor.execute("""
+        query = """
             SELECT telegram_id, ban_reason, banned_at, banned_by
             FROM users
             WHERE is_banned = TRUE
             ORDER BY banned_at DESC
-        """)
+        """
+        if limit is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query + " LIMIT ? OFFSET ?", (limit, offset))
         return cursor.fetchall()
 
 
+def count_banned_users():
+    """Количество забаненных пользователей"""
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("SELECT COUNT(*) FROM users WHERE is_banned = TRUE")
+        result = cursor.fetchone()
+        if not result:
+            return 0
+        # PostgreSQL возвращает dict, SQLite может вернуть tuple
+        if isinstance(result, dict):
+            return result.get('count', 0)
+        return result[0]
+
+
 def search_users(query, limit=20):
     """Ищет пользователей по telegram_id, имени или username"""
     with get_db_connection() as conn:
@@ -3940,115 +4649,69 @@ def _get_count_from_result(result):
         return result[0]
 
 def get_analytics_stats():
-    """Получает подробную статистику для админ-панели"""
-    with get_db_connection() as conn:
-        cursor = get_cursor(conn)
-
-        stats = {}
-
-        # === ПОЛЬЗОВАТЕЛИ ===
-        cursor.execute("SELECT COUNT(*) FROM users")
-        stats['total_users'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM users WHERE is_banned = TRUE")
-        stats['banned_users'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM bloggers")
-        stats['total_workers'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM advertisers")
-        stats['total_clients'] = _get_count_from_result(cursor.fetchone())
-
-        # Пользователи с двумя профилями (и мастер и клиент)
-        cursor.execute("""
-            SELECT COUNT(DISTINCT w.user_id)
-            FROM bloggers w
-            INNER JOIN advertisers c ON w.user_id = c.user_id
-        """)
-        stats['dual_profile_users'] = _get_count_from_result(cursor.fetchone())
+    """
+    Получает подробную статистику для админ-панели.
 
-        # === ЗАКАЗЫ ===
-        cursor.execute("SELECT COUNT(*) FROM campaigns")
-        stats['total_orders'] = _get_count_from_result(cursor.fetchone())
+    ИСПРАВЛЕНО: вместо ~25 отдельных SELECT COUNT(*) вся статистика собирается
+    одним запросом из скалярных подзапросов - один round-trip к БД на каждый /stats.
+    """
+    if USE_POSTGRES:
+        day_ago = "CAST(created_at AS TIMESTAMP) >= NOW() - INTERVAL '1 day'"
+        week_ago = "CAST(created_at AS TIMESTAMP) >= NOW() - INTERVAL '7 days'"
+    else:
+        day_ago = "created_at >= datetime('now', '-1 day')"
+        week_ago = "created_at >= datetime('now', '-7 days')"
 
-        cursor.execute("SELECT COUNT(*) FROM campaigns WHERE status = 'open'")
-        stats['open_orders'] = _get_count_from_result(cursor.fetchone())
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
 
-        cursor.execute("""
-            SELECT COUNT(*) FROM campaigns
-            WHERE status IN ('master_selected', 'contact_shared', 'master_confirmed', 'waiting_master_confirmation')
+        cursor.execute(f"""
+            SELECT
+                -- === ПОЛЬЗОВАТЕЛИ ===
+                (SELECT COUNT(*) FROM users) AS total_users,
+                (SELECT COUNT(*) FROM users WHERE is_banned = TRUE) AS banned_users,
+                (SELECT COUNT(*) FROM bloggers) AS total_workers,
+                (SELECT COUNT(*) FROM advertisers) AS total_clients,
+                -- Пользователи с двумя профилями (и блогер и рекламодатель)
+                (SELECT COUNT(DISTINCT w.user_id)
+                 FROM bloggers w
+                 INNER JOIN advertisers c ON w.user_id = c.user_id) AS dual_profile_users,
+
+                -- === ЗАКАЗЫ ===
+                (SELECT COUNT(*) FROM campaigns) AS total_orders,
+                (SELECT COUNT(*) FROM campaigns WHERE status = 'open') AS open_orders,
+                (SELECT COUNT(*) FROM campaigns
+                 WHERE status IN ('master_selected', 'contact_shared', 'master_confirmed', 'waiting_master_confirmation')) AS active_orders,
+                (SELECT COUNT(*) FROM campaigns WHERE status IN ('done', 'completed')) AS completed_orders,
+                (SELECT COUNT(*) FROM campaigns WHERE status = 'canceled') AS canceled_orders,
+
+                -- === ОТКЛИКИ ===
+                (SELECT COUNT(*) FROM offers) AS total_bids,
+                (SELECT COUNT(*) FROM offers WHERE status = 'pending') AS pending_bids,
+                (SELECT COUNT(*) FROM offers WHERE status = 'selected') AS selected_bids,
+                (SELECT COUNT(*) FROM offers WHERE status = 'rejected') AS rejected_bids,
+
+                -- === ЧАТЫ И СООБЩЕНИЯ ===
+                (SELECT COUNT(*) FROM chats) AS total_chats,
+                (SELECT COUNT(*) FROM messages) AS total_messages,
+
+                -- === ОТЗЫВЫ ===
+                (SELECT COUNT(*) FROM reviews) AS total_reviews,
+                (SELECT AVG(rating) FROM reviews) AS average_rating,
+
+                -- === АКТИВНОСТЬ ===
+                (SELECT COUNT(*) FROM campaigns WHERE {day_ago}) AS orders_last_24h,
+                (SELECT COUNT(*) FROM users WHERE {week_ago}) AS users_last_7days,
+
+                -- Premium статус
+                (SELECT value FROM settings WHERE key = 'premium_enabled') AS premium_enabled
         """)
-        stats['active_orders'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM campaigns WHERE status IN ('done', 'completed')")
-        stats['completed_orders'] = _get_count_from_result(cursor.fetchone())
+        row = dict(cursor.fetchone())
 
-        cursor.execute("SELECT COUNT(*) FROM campaigns WHERE status = 'canceled'")
-        stats['canceled_orders'] = _get_count_from_result(cursor.fetchone())
-
-        # === ОТКЛИКИ ===
-        cursor.execute("SELECT COUNT(*) FROM offers")
-        stats['total_bids'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM offers WHERE status = 'pending'")
-        stats['pending_bids'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM offers WHERE status = 'selected'")
-        stats['selected_bids'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM offers WHERE status = 'rejected'")
-        stats['rejected_bids'] = _get_count_from_result(cursor.fetchone())
-
-        # === ЧАТЫ И СООБЩЕНИЯ ===
-        cursor.execute("SELECT COUNT(*) FROM chats")
-        stats['total_chats'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT COUNT(*) FROM messages")
-        stats['total_messages'] = _get_count_from_result(cursor.fetchone())
-
-        # === ОТЗЫВЫ ===
-        cursor.execute("SELECT COUNT(*) FROM reviews")
-        stats['total_reviews'] = _get_count_from_result(cursor.fetchone())
-
-        cursor.execute("SELECT AVG(rating) FROM reviews")
-        result = cursor.fetchone()
-        if result:
-            avg_rating = result['avg'] if isinstance(result, dict) else result[0]
-            stats['average_rating'] = float(avg_rating) if avg_rating else 0.0
-        else:
-            stats['average_rating'] = 0.0
-
-        # === АКТИВНОСТЬ ===
-        # Заказов за последние 24 часа
-        if USE_POSTGRES:
-            cursor.execute("""
-                SELECT COUNT(*) FROM campaigns
-                WHERE CAST(created_at AS TIMESTAMP) >= NOW() - INTERVAL '1 day'
-            """)
-        else:
-            cursor.execute("""
-                SELECT COUNT(*) FROM campaigns
-                WHERE created_at >= datetime('now', '-1 day')
-            """)
-        stats['orders_last_24h'] = _get_count_from_result(cursor.fetchone())
-
-        # Новых пользователей за 7 дней
-        if USE_POSTGRES:
-            cursor.execute("""
-                SELECT COUNT(*) FROM users
-                WHERE CAST(created_at AS TIMESTAMP) >= NOW() - INTERVAL '7 days'
-            """)
-        else:
-            cursor.execute("""
-                SELECT COUNT(*) FROM users
-                WHERE created_at >= datetime('now', '-7 days')
-            """)
-        stats['users_last_7days'] = _get_count_from_result(cursor.fetchone())
-
-        # Premium статус
-        stats['premium_enabled'] = is_premium_enabled()
-
-        return stats
+    stats = {key: value or 0 for key, value in row.items()}
+    stats['average_rating'] = float(row['average_rating']) if row['average_rating'] else 0.0
+    stats['premium_enabled'] = row['premium_enabled'] == 'true'
+    return stats
 
 
 def get_followers_stats():
@@ -4107,10 +4770,11 @@ def get_followers_stats():
         return stats
 
 
-def create_indexes():
+def _create_base_indexes():
     """
     Создает индексы для оптимизации производительности запросов.
-    Должна вызываться после init_db().
+    Вызывается из create_indexes() (раньше функция с тем же именем ниже
+    перекрывала эту, и индексы отсюда не создавались).
     """
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
@@ -4655,6 +5319,7 @@ def create_bid(campaign_id, blogger_id, proposed_price, currency, comment="", re
 
         conn.commit()
         offer_id = cursor.lastrowid
+        _bid_filter.add(blogger_id, campaign_id)
         logger.info(f"✅ Создан отклик: ID={offer_id}, Заказ={campaign_id}, Мастер={blogger_id}, Цена={proposed_price} {currency}, Срок={ready_in_days} дн.")
         return offer_id
 
@@ -4703,12 +5368,27 @@ def get_bids_for_order(campaign_id):
         return cursor.fetchall()
 
 
+def get_bid_campaign_ids(blogger_id):
+    """Возвращает ID всех кампаний, на которые откликался мастер"""
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("SELECT campaign_id FROM offers WHERE blogger_id = ?", (blogger_id,))
+        return [row['campaign_id'] for row in cursor.fetchall()]
+
+
+# Быстрый отрицательный ответ для check_worker_bid_exists (большинство кампаний без отклика)
+_bid_filter = NegativeLookupFilter(get_bid_campaign_ids)
+
+
 def check_worker_bid_exists(campaign_id, blogger_id):
     """Проверяет, откликался ли уже мастер на этот заказ"""
+    if not _bid_filter.might_contain(blogger_id, campaign_id):
+        return False
+
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
 
-        cursor.execute("""
+        cursor.execute_prepared("check_worker_bid_exists", """
             SELECT COUNT(*) FROM offers
             WHERE campaign_id = ? AND blogger_id = ?
         """, (campaign_id, blogger_id))
@@ -5000,6 +5680,7 @@ def add_test_orders(telegram_id):
                 print(f"Ошибка при создании заказа: {e}")
 
         conn.commit()
+        invalidate_profile_caches()
 
         return (True, f"✅ Успешно добавлено {orders_created} тестовых заказов!", orders_created)
 
@@ -5154,6 +5835,7 @@ def add_test_workers(telegram_id):
 
         # Создаем отклики от мастеров на подходящие заказы
         bids_created = 0
+        created_bids = []
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         for campaign in campaigns:
@@ -5195,12 +5877,17 @@ def add_test_workers(telegram_id):
                             now,
                             "active"
                         ))
+                        created_bids.append((blogger_id, campaign_id))
                         bids_created += 1
 
                 except Exception as e:
                     print(f"Ошибка при создании отклика: {e}")
 
         conn.commit()
+        invalidate_profile_caches()
+        # Фильтр откликов пополняется только после commit
+        for blogger_id, campaign_id in created_bids:
+            _bid_filter.add(blogger_id, campaign_id)
 
         message = f"✅ Успешно добавлено:\n• {workers_created} тестовых мастеров\n• {bids_created} откликов на заказы"
         return (True, message, workers_created)
@@ -5305,6 +5992,7 @@ def add_test_advertisers(telegram_id):
                 print(f"Ошибка при создании рекламодателя: {e}")
 
         conn.commit()
+        invalidate_profile_caches()
         message = f"✅ Успешно создано {advertisers_created} тестовых рекламодателей"
         return (True, message, advertisers_created)
 
@@ -5374,13 +6062,18 @@ def migrate_add_ready_in_days_and_notifications():
 
 # === BLOGGER NOTIFICATIONS HELPERS ===
 
-def save_worker_notification(blogger_user_id, message_id, chat_id, orders_count=0):
-    """Сохраняет или обновляет ID сообщения с уведомлением для мастера"""
+def save_worker_notification(blogger_user_id, message_id, chat_id, orders_count=0, sent_at=None):
+    """
+    Сохраняет или обновляет ID сообщения с уведомлением для мастера.
+
+    sent_at - время отправки сообщения (last_update_timestamp); по умолчанию сейчас.
+    При беззвучном редактировании передаётся время исходной отправки.
+    """
     from datetime import datetime
 
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
-        timestamp = int(datetime.now().timestamp())
+        timestamp = sent_at or int(datetime.now().timestamp())
 
         if USE_POSTGRES:
             cursor.execute("""
@@ -5402,6 +6095,46 @@ def save_worker_notification(blogger_user_id, message_id, chat_id, orders_count=
         conn.commit()
 
 
+def save_worker_notifications(rows):
+    """
+    Пакетный вариант save_worker_notification: один executemany и один commit.
+
+    Args:
+        rows: Список кортежей (blogger_user_id, message_id, chat_id, orders_count, sent_at),
+              sent_at=None - сейчас
+    """
+    from datetime import datetime
+
+    if not rows:
+        return
+
+    now = int(datetime.now().timestamp())
+    params = [(user_id, message_id, chat_id, sent_at or now, orders_count)
+              for user_id, message_id, chat_id, orders_count, sent_at in rows]
+
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+
+        if USE_POSTGRES:
+            cursor.executemany("""
+                INSERT INTO blogger_notifications
+                (user_id, notification_message_id, notification_chat_id, last_update_timestamp, available_orders_count)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    notification_message_id = EXCLUDED.notification_message_id,
+                    notification_chat_id = EXCLUDED.notification_chat_id,
+                    last_update_timestamp = EXCLUDED.last_update_timestamp,
+                    available_orders_count = EXCLUDED.available_orders_count
+            """, params)
+        else:
+            cursor.executemany("""
+                INSERT OR REPLACE INTO blogger_notifications
+                (user_id, notification_message_id, notification_chat_id, last_update_timestamp, available_orders_count)
+                VALUES (?, ?, ?, ?, ?)
+            """, params)
+        conn.commit()
+
+
 def get_worker_notification(blogger_user_id):
     """Получает сохраненное уведомление мастера"""
     with get_db_connection() as conn:
@@ -5422,13 +6155,17 @@ def delete_worker_notification(blogger_user_id):
 
 # === ADVERTISER NOTIFICATIONS HELPERS ===
 
-def save_client_notification(advertiser_user_id, message_id, chat_id, bids_count=0):
-    """Сохраняет или обновляет ID сообщения с уведомлением для клиента"""
+def save_client_notification(advertiser_user_id, message_id, chat_id, bids_count=0, sent_at=None):
+    """
+    Сохраняет или обновляет ID сообщения с уведомлением для клиента.
+
+    sent_at - как в save_worker_notification.
+    """
     from datetime import datetime
 
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
-        timestamp = int(datetime.now().timestamp())
+        timestamp = sent_at or int(datetime.now().timestamp())
 
         if USE_POSTGRES:
             cursor.execute("""
@@ -5548,6 +6285,54 @@ def get_orders_with_unread_bids(advertiser_user_id):
         return [dict(row) for row in cursor.fetchall()]
 
 
+def count_unread_bids_total(advertiser_user_id):
+    """
+    Суммарное количество активных откликов на открытые заказы клиента.
+
+    То же, что сумма offer_count из get_orders_with_unread_bids, но одним
+    числом из БД - для уведомлений, где строки заказов не нужны.
+    """
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute("""
+            SELECT COUNT(b.id)
+            FROM campaigns o
+            JOIN offers b ON o.id = b.campaign_id AND b.status = 'active'
+            WHERE o.advertiser_id = (SELECT id FROM advertisers WHERE user_id = ?)
+                AND o.status = 'open'
+        """, (advertiser_user_id,))
+        result = cursor.fetchone()
+        if not result:
+            return 0
+        # PostgreSQL возвращает dict, SQLite может вернуть tuple
+        if isinstance(result, dict):
+            return result.get('count', 0)
+        return result[0]
+
+
+# Общие условия подсчёта доступных кампаний блогера b по кампании o:
+# открыта, в его городах (FALLBACK: нет blogger_cities - основной город из bloggers),
+# у блогера есть хоть один город, отклика ещё нет
+_AVAILABLE_ORDERS_CONDITIONS = """
+    o.status = 'open'
+    AND (
+        EXISTS (SELECT 1 FROM blogger_cities bc WHERE bc.blogger_id = b.id)
+        OR COALESCE(b.city, '') <> ''
+    )
+    AND (
+        o.city = 'Вся Беларусь'
+        OR o.city IN (SELECT bc.city FROM blogger_cities bc WHERE bc.blogger_id = b.id)
+        OR (
+            NOT EXISTS (SELECT 1 FROM blogger_cities bc WHERE bc.blogger_id = b.id)
+            AND o.city = b.city
+        )
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM offers f WHERE f.campaign_id = o.id AND f.blogger_id = b.id
+    )
+"""
+
+
 def count_available_orders_for_worker(blogger_user_id):
     """
     ИСПРАВЛЕНО: Подсчитывает количество доступных заказов для мастера.
@@ -5555,120 +6340,52 @@ def count_available_orders_for_worker(blogger_user_id):
     Использует blogger_cities для поиска заказов во всех городах мастера.
 
     (в его городах и его категориях, на которые он еще не откликнулся)
+
+    Вызывается на каждое уведомление блогеру, поэтому для блогера с
+    blogger_categories всё считается одним запросом (раньше было до пяти
+    последовательных). FALLBACK: нет blogger_categories - второй запрос по старому
+    полю categories; оно разбирается в Python (split + strip), как и раньше.
     """
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
 
-        # Получаем blogger_id по user_id
-        cursor.execute("SELECT id FROM bloggers WHERE user_id = ?", (blogger_user_id,))
-        blogger = cursor.fetchone()
+        cursor.execute_prepared("count_available_orders_for_worker", f"""
+            SELECT
+                b.id,
+                b.categories,
+                EXISTS (SELECT 1 FROM blogger_categories bcat WHERE bcat.blogger_id = b.id) AS has_categories,
+                (
+                    SELECT COUNT(DISTINCT o.id)
+                    FROM campaigns o
+                    JOIN campaign_categories oc ON oc.campaign_id = o.id
+                    WHERE oc.category IN (SELECT bcat.category FROM blogger_categories bcat WHERE bcat.blogger_id = b.id)
+                    AND {_AVAILABLE_ORDERS_CONDITIONS}
+                ) AS available_count
+            FROM bloggers b
+            WHERE b.user_id = ?
+        """, (blogger_user_id,))
 
+        blogger = cursor.fetchone()
         if not blogger:
             return 0
+        if blogger['has_categories']:
+            return blogger['available_count'] or 0
 
-        # PostgreSQL возвращает dict, SQLite может вернуть tuple
-        if isinstance(blogger, dict):
-            blogger_id = blogger['id']
-        else:
-            blogger_id = blogger[0]
-
-        # Получаем список городов мастера
-        cursor.execute("SELECT city FROM blogger_cities WHERE blogger_id = ?", (blogger_id,))
-        cities_result = cursor.fetchall()
-
-        # FALLBACK: Если нет городов в blogger_cities, используем основной город из bloggers
-        if not cities_result:
-            cursor.execute("SELECT city FROM bloggers WHERE id = ?", (blogger_id,))
-            main_city = cursor.fetchone()
-            if main_city:
-                city_value = main_city['city'] if isinstance(main_city, dict) else main_city[0]
-                if city_value:
-                    cities = [city_value]
-                else:
-                    logger.warning(f"⚠️ У блогера {blogger_id} нет городов")
-                    return 0
-            else:
-                return 0
-        else:
-            # PostgreSQL возвращает dict, SQLite может вернуть tuple
-            if cities_result and isinstance(cities_result[0], dict):
-                cities = [row['city'] for row in cities_result]
-            else:
-                cities = [row[0] for row in cities_result]
-
-        logger.info(f"🔍 Подсчет доступных заказов для blogger_id={blogger_id}, города={cities}")
-
-        # ИСПРАВЛЕНО: Используем нормализованные таблицы вместо LIKE
-        # Ищем заказы через JOIN с campaign_categories и blogger_categories
-        # FALLBACK: если нет категорий в blogger_categories, используем поле categories (LIKE)
-        # Проверяем, что заказ находится в одном из городов мастера ИЛИ город = "Вся Беларусь"
-        placeholders = ','.join('?' * len(cities))
-
-        # Сначала проверяем есть ли у блогера категории в blogger_categories
-        cursor.execute("SELECT COUNT(*) FROM blogger_categories WHERE blogger_id = ?", (blogger_id,))
-        cat_count_result = cursor.fetchone()
-        has_categories_table = False
-        if cat_count_result:
-            cat_count = cat_count_result['count'] if isinstance(cat_count_result, dict) else cat_count_result[0]
-            has_categories_table = cat_count > 0
-
-        if has_categories_table:
-            # Используем нормализованную таблицу blogger_categories
-            query = f"""
-                SELECT COUNT(DISTINCT o.id)
-                FROM campaigns o
-                JOIN campaign_categories oc ON o.id = oc.campaign_id
-                JOIN blogger_categories wc ON oc.category = wc.category
-                WHERE o.status = 'open'
-                AND (o.city IN ({placeholders}) OR o.city = 'Вся Беларусь')
-                AND wc.blogger_id = ?
-                AND o.id NOT IN (
-                    SELECT campaign_id FROM offers WHERE blogger_id = ?
-                )
-            """
-            cursor.execute(query, (*cities, blogger_id, blogger_id))
-        else:
-            # FALLBACK: используем старое поле categories с LIKE
-            logger.info(f"⚠️ Блогер {blogger_id} использует старое поле categories (FALLBACK)")
-            cursor.execute("SELECT categories FROM bloggers WHERE id = ?", (blogger_id,))
-            cat_result = cursor.fetchone()
-            if not cat_result:
-                return 0
-
-            categories_str = cat_result['categories'] if isinstance(cat_result, dict) else cat_result[0]
-            if not categories_str:
-                return 0
-
-            # Разбиваем категории и строим запрос с OR для каждой категории
-            categories_list = [c.strip() for c in categories_str.split(',') if c.strip()]
-
-            # Используем campaign_categories для точного поиска
-            cat_placeholders = ','.join('?' * len(categories_list))
-            query = f"""
-                SELECT COUNT(DISTINCT o.id)
-                FROM campaigns o
-                JOIN campaign_categories oc ON o.id = oc.campaign_id
-                WHERE o.status = 'open'
-                AND (o.city IN ({placeholders}) OR o.city = 'Вся Беларусь')
-                AND oc.category IN ({cat_placeholders})
-                AND o.id NOT IN (
-                    SELECT campaign_id FROM offers WHERE blogger_id = ?
-                )
-            """
-            cursor.execute(query, (*cities, *categories_list, blogger_id))
-
-        result = cursor.fetchone()
-        if not result:
-            logger.warning(f"⚠️ Запрос не вернул результат для blogger_id={blogger_id}")
+        # FALLBACK: старое поле categories (через запятую)
+        categories_list = [c.strip() for c in (blogger['categories'] or '').split(',') if c.strip()]
+        if not categories_list:
             return 0
-        # PostgreSQL возвращает dict, SQLite может вернуть tuple
-        if isinstance(result, dict):
-            count = result.get('count', 0)
-        else:
-            count = result[0]
 
-        logger.info(f"✅ Найдено доступных заказов для blogger_id={blogger_id}: {count}")
-        return count
+        cat_placeholders = ','.join('?' * len(categories_list))
+        cursor.execute(f"""
+            SELECT COUNT(DISTINCT o.id)
+            FROM campaigns o
+            JOIN campaign_categories oc ON oc.campaign_id = o.id
+            JOIN bloggers b ON b.id = ?
+            WHERE oc.category IN ({cat_placeholders})
+            AND {_AVAILABLE_ORDERS_CONDITIONS}
+        """, (blogger['id'], *categories_list))
+        return _get_count_from_result(cursor.fetchone())
 
 
 # ============================================
@@ -5913,23 +6630,31 @@ def add_admin_user(telegram_id, role='admin', added_by=None):
             """, (telegram_id, role, now, added_by))
 
         conn.commit()
+        _admin_cache.pop(telegram_id)
         logger.info(f"✅ Админ добавлен: telegram_id={telegram_id}, role={role}")
 
 
 def is_admin(telegram_id):
     """Проверяет является ли пользователь админом"""
+    cached = _admin_cache.get(telegram_id)
+    if cached is not None:
+        return cached
+
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
         cursor.execute("SELECT COUNT(*) FROM admin_users WHERE telegram_id = ?", (telegram_id,))
         result = cursor.fetchone()
         if not result:
-            return False
+            admin = False
         # PostgreSQL возвращает dict, SQLite может вернуть tuple
-        if isinstance(result, dict):
-            count = result.get('count', 0)
-            return count > 0
+        elif isinstance(result, dict):
+            admin = result.get('count', 0) > 0
         else:
-            return result[0] > 0
+            admin = result[0] > 0
+
+        # Кэшируем и отрицательный ответ: проверка стоит в начале каждой админ-команды
+        _admin_cache.set(telegram_id, admin)
+        return admin
 
 
 def create_broadcast(message_text, target_audience, photo_file_id, created_by):
@@ -6044,18 +6769,19 @@ def get_active_ad(placement, user_id=None, user_categories=None):
         return dict(result) if result else None
 
 
-def get_active_ads(placement, user_id=None, user_categories=None, user_role=None):
+def get_active_ads(placement, user_id=None, user_categories=None, user_role=None, limit=None):
     """
-    Получает ВСЕ активные рекламы для показа (без LIMIT).
+    Получает активные рекламы для показа (все, если limit не задан).
 
     Args:
         placement: где показывать ('menu_banner', 'morning_digest')
         user_id: ID пользователя (для проверки лимита показов)
         user_categories: список категорий пользователя (для таргетинга)
         user_role: роль пользователя ('blogger', 'advertiser') для фильтрации по target_audience
+        limit: максимальное количество реклам (новые первыми)
 
     Returns:
-        список dict с данными реклам
+        список dict с данными реклам (только поля, нужные для показа)
     """
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
@@ -6064,7 +6790,7 @@ def get_active_ads(placement, user_id=None, user_categories=None, user_role=None
 
         # Базовый запрос (PostgreSQL: используем TRUE вместо 1)
         query = """
-            SELECT a.*
+            SELECT a.id, a.title, a.description, a.photo_file_id, a.button_text, a.button_url
             FROM ads a
             WHERE a.active = TRUE
             AND a.placement = ?
@@ -6108,7 +6834,10 @@ def get_active_ads(placement, user_id=None, user_categories=None, user_role=None
             """
             params.extend([user_id, today_start])
 
-        query += " ORDER BY a.id DESC"  # БЕЗ LIMIT - показываем все
+        query += " ORDER BY a.id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
 
         cursor.execute(query, params)
         results = cursor.fetchall()
@@ -6141,6 +6870,32 @@ def record_ad_view(ad_id, user_id, placement='menu_banner'):
     return log_ad_view(ad_id, user_id, placement, clicked=False)
 
 
+def record_ad_views_bulk(user_id, ad_ids, placement='menu_banner'):
+    """
+    НОВОЕ: Пакетный вариант record_ad_view - все просмотры одним executemany,
+    счетчики одним UPDATE ... IN и один commit вместо отдельной транзакции на каждую рекламу.
+    """
+    if not ad_ids:
+        return
+
+    with get_db_connection() as conn:
+        cursor = get_cursor(conn)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        cursor.executemany("""
+            INSERT INTO ad_views (ad_id, user_id, viewed_at, clicked, placement)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(ad_id, user_id, now, False, placement) for ad_id in ad_ids])
+
+        placeholders = ', '.join(['?'] * len(ad_ids))
+        cursor.execute(
+            f"UPDATE ads SET view_count = view_count + 1 WHERE id IN ({placeholders})",
+            tuple(ad_ids)
+        )
+
+        conn.commit()
+
+
 def has_unviewed_ads(user_id, placement='menu_banner', user_role=None):
     """
     Проверяет, есть ли непросмотренные активные рекламы для пользователя.
@@ -6470,6 +7225,7 @@ def add_worker_city(blogger_id, city):
                 VALUES (?, ?)
             """, (blogger_id, city))
         conn.commit()
+        _bump_workers_generation()
         logger.info(f"✅ Город '{city}' добавлен мастеру blogger_id={blogger_id}")
 
 
@@ -6481,6 +7237,7 @@ def remove_worker_city(blogger_id, city):
             DELETE FROM blogger_cities WHERE blogger_id = ? AND city = ?
         """, (blogger_id, city))
         conn.commit()
+        _bump_workers_generation()
         logger.info(f"✅ Город '{city}' удален у мастера blogger_id={blogger_id}")
 
 
@@ -6511,6 +7268,7 @@ def clear_worker_cities(blogger_id):
         cursor = get_cursor(conn)
         cursor.execute("DELETE FROM blogger_cities WHERE blogger_id = ?", (blogger_id,))
         conn.commit()
+        _bump_workers_generation()
         logger.info(f"✅ Все города удалены у мастера blogger_id={blogger_id}")
 
 
@@ -6932,6 +7690,7 @@ def decline_order(blogger_id, campaign_id):
                 """, (blogger_id, campaign_id, declined_at))
 
             conn.commit()
+            _declined_filter.add(blogger_id, campaign_id)
             return True
         except Exception as e:
             logger.error(f"Ошибка при отказе от заказа: {e}", exc_info=True)
@@ -6950,6 +7709,9 @@ def check_order_declined(blogger_id, campaign_id):
     Returns:
         True если отказался, False если нет
     """
+    if not _declined_filter.might_contain(blogger_id, campaign_id):
+        return False
+
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
 
@@ -7003,6 +7765,10 @@ def get_declined_orders(blogger_id):
         return [row['campaign_id'] if isinstance(row, dict) else row[0] for row in results]
 
 
+# Быстрый отрицательный ответ для check_order_declined
+_declined_filter = NegativeLookupFilter(get_declined_orders)
+
+
 # ===== NEW MIGRATIONS FOR INFLUENCEMARKET =====
 
 def migrate_add_blogger_platform_fields():
@@ -7427,13 +8193,16 @@ def migrate_fix_old_campaigns_for_multiple_bloggers():
 def create_indexes():
     """
     Создаёт индексы для оптимизации производительности БД.
+    Должна вызываться после init_db() и миграций.
     """
+    _create_base_indexes()
+
     with get_db_connection() as conn:
         cursor = get_cursor(conn)
         
         try:
             # Индексы для быстрого поиска
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bloggers_telegram_id ON bloggers(telegram_id)")
+            # (у bloggers нет колонки telegram_id - он ищется через users, см. idx_users_telegram_id)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_bloggers_verified ON bloggers(verified_ownership)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_bloggers_trust_score ON bloggers(trust_score)")
             
@@ -7448,6 +8217,12 @@ def create_indexes():
             
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_campaign ON campaign_reports(campaign_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_offer ON campaign_reports(offer_id)")
+
+            # Рассылка о новой кампании: EXISTS по (blogger_id, category) - только по индексу
+            # (для blogger_cities ту же роль играет UNIQUE (blogger_id, city))
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_blogger_categories_match ON blogger_categories(blogger_id, category)")
+            # Отзывы о пользователе в роли, новые первыми (show_reviews)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_to_user_role ON reviews(to_user_id, role_to, created_at DESC)")
             
             conn.commit()
             logger.info("✅ All indexes created successfully!")
@@ -7475,6 +8250,7 @@ def generate_verification_code(blogger_id):
             WHERE user_id = ?
         """, (code, blogger_id))
         conn.commit()
+        invalidate_profile_caches()
         
         logger.info(f"✅ Код верификации создан для blogger_id={blogger_id}: {code}")
         return code
@@ -7499,6 +8275,7 @@ def verify_blogger_ownership(blogger_id):
         new_score = calculate_trust_score(blogger_id)
         
         conn.commit()
+        invalidate_profile_caches()
         logger.info(f"✅ Блогер {blogger_id} верифицирован! Trust Score: {new_score}")
         return new_score
 
@@ -7646,6 +8423,7 @@ def calculate_trust_score(blogger_id):
         """, (score, blogger_id))
         
         conn.commit()
+        invalidate_profile_caches()
         logger.info(f"✅ Trust Score пересчитан для blogger_id={blogger_id}: {score}")
         return score
 
@@ -0,0 +1,152 @@
+"""
+Асинхронные обёртки над функциями db.py.
+
+Функции db.* синхронные (psycopg2/sqlite3) и блокируют цикл событий на время запроса.
+Здесь они выполняются в пуле потоков через asyncio.to_thread, поэтому другие
+пользователи бота обслуживаются, пока идёт запрос, а независимые запросы можно
+запускать параллельно через asyncio.gather.
+"""
+
+import asyncio
+
+import db
+
+
+# ===== ПОЛЬЗОВАТЕЛИ И ПРОФИЛИ =====
+
+async def get_user(telegram_id):
+    return await asyncio.to_thread(db.get_user, telegram_id)
+
+
+async def get_worker_profile(user_id):
+    return await asyncio.to_thread(db.get_worker_profile, user_id)
+
+
+async def get_user_by_id(user_id):
+    return await asyncio.to_thread(db.get_user_by_id, user_id)
+
+
+async def get_workers_for_campaign_notification(city, categories):
+    return await asyncio.to_thread(db.get_workers_for_campaign_notification, city, categories)
+
+
+async def get_profile_flags(user_id):
+    return await asyncio.to_thread(db.get_profile_flags, user_id)
+
+
+# ===== КАМПАНИИ И ОТКЛИКИ =====
+
+async def get_order_by_id(campaign_id):
+    return await asyncio.to_thread(db.get_order_by_id, campaign_id)
+
+
+async def get_advertiser_user_by_campaign(campaign_id):
+    return await asyncio.to_thread(db.get_advertiser_user_by_campaign, campaign_id)
+
+
+async def create_order(**kwargs):
+    return await asyncio.to_thread(db.create_order, **kwargs)
+
+
+async def get_orders_by_categories(categories, **kwargs):
+    return await asyncio.to_thread(db.get_orders_by_categories, categories, **kwargs)
+
+
+async def check_worker_bid_exists(campaign_id, blogger_id):
+    return await asyncio.to_thread(db.check_worker_bid_exists, campaign_id, blogger_id)
+
+
+async def check_order_declined(blogger_id, campaign_id):
+    return await asyncio.to_thread(db.check_order_declined, blogger_id, campaign_id)
+
+
+async def create_bid(**kwargs):
+    return await asyncio.to_thread(db.create_bid, **kwargs)
+
+
+async def decline_order(blogger_id, campaign_id):
+    return await asyncio.to_thread(db.decline_order, blogger_id, campaign_id)
+
+
+async def complete_campaign_and_get_parties(campaign_id, completed_by):
+    return await asyncio.to_thread(db.complete_campaign_and_get_parties, campaign_id, completed_by)
+
+
+async def get_worker_info_for_order(campaign_id):
+    return await asyncio.to_thread(db.get_worker_info_for_order, campaign_id)
+
+
+async def count_orders_between_users(user1_id, user2_id, days=7):
+    return await asyncio.to_thread(db.count_orders_between_users, user1_id, user2_id, days=days)
+
+
+# ===== ОТЗЫВЫ =====
+
+async def check_review_exists(campaign_id, from_user_id):
+    return await asyncio.to_thread(db.check_review_exists, campaign_id, from_user_id)
+
+
+async def add_review(from_user_id, to_user_id, campaign_id, role_from, role_to, rating, comment):
+    return await asyncio.to_thread(
+        db.add_review, from_user_id, to_user_id, campaign_id, role_from, role_to, rating, comment
+    )
+
+
+async def get_reviews_for_user(user_id, role, limit=None):
+    return await asyncio.to_thread(db.get_reviews_for_user, user_id, role, limit=limit)
+
+
+async def count_reviews_for_user(user_id, role):
+    return await asyncio.to_thread(db.count_reviews_for_user, user_id, role)
+
+
+# ===== РЕКЛАМА И ПРЕДЛОЖЕНИЯ =====
+
+async def get_active_ads(placement, **kwargs):
+    return await asyncio.to_thread(db.get_active_ads, placement, **kwargs)
+
+
+async def record_ad_views_bulk(user_id, ad_ids, placement='menu_banner'):
+    return await asyncio.to_thread(db.record_ad_views_bulk, user_id, ad_ids, placement)
+
+
+async def create_suggestion(user_id, user_role, message):
+    return await asyncio.to_thread(db.create_suggestion, user_id, user_role, message)
+
+
+# ===== УВЕДОМЛЕНИЯ-СЧЁТЧИКИ =====
+
+async def are_notifications_enabled(user_id):
+    return await asyncio.to_thread(db.are_notifications_enabled, user_id)
+
+
+async def are_client_notifications_enabled(user_id):
+    return await asyncio.to_thread(db.are_client_notifications_enabled, user_id)
+
+
+async def count_available_orders_for_worker(blogger_user_id):
+    return await asyncio.to_thread(db.count_available_orders_for_worker, blogger_user_id)
+
+
+async def count_unread_bids_total(advertiser_user_id):
+    return await asyncio.to_thread(db.count_unread_bids_total, advertiser_user_id)
+
+
+async def get_worker_notification(blogger_user_id):
+    return await asyncio.to_thread(db.get_worker_notification, blogger_user_id)
+
+
+async def save_worker_notification(blogger_user_id, message_id, chat_id, orders_count=0, sent_at=None):
+    return await asyncio.to_thread(
+        db.save_worker_notification, blogger_user_id, message_id, chat_id, orders_count, sent_at
+    )
+
+
+async def get_client_notification(advertiser_user_id):
+    return await asyncio.to_thread(db.get_client_notification, advertiser_user_id)
+
+
+async def save_client_notification(advertiser_user_id, message_id, chat_id, bids_count=0, sent_at=None):
+    return await asyncio.to_thread(
+        db.save_client_notification, advertiser_user_id, message_id, chat_id, bids_count, sent_at
+    )
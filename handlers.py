@@ -1,7 +1,12 @@
 import logging
 import re
 import asyncio
+import csv
+import functools
 import html
+import io
+import itertools
+import operator
 from datetime import datetime, timedelta
 from telegram import (
     Update,
@@ -17,8 +22,10 @@ from telegram.ext import (
     CallbackQueryHandler,
     filters,
 )
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
 
 import db
+import db_async
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +124,205 @@ BLOGGER_TOPICS = {
 }
 
 
+# Разбор строки file_id через запятую (пустые элементы пропускаются) - один проход в C-движке re
+_PHOTO_SPLIT_RE = re.compile(r"[^,]+")
+
+
+# ===== ПОСТОЯННЫЕ КНОПКИ =====
+# Кнопки без переменных частей создаются один раз и переиспользуются во всех клавиатурах
+BTN_BACK_CLIENT_MENU = InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")
+BTN_BACK_WORKER_MENU = InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")
+BTN_WORKER_MAIN_MENU = InlineKeyboardButton("💼 Главное меню", callback_data="show_worker_menu")
+BTN_TO_ORDERS_LIST = InlineKeyboardButton("📋 К списку заказов", callback_data="worker_view_orders")
+BTN_BACK_TO_ORDERS = InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
+BTN_BACK_TO_MY_BIDS = InlineKeyboardButton("⬅️ Назад", callback_data="worker_my_bids")
+# Состояния карточки кампании, не зависящие от кампании (своя кампания / уже откликнулся)
+BTN_OWN_ORDER = InlineKeyboardButton("🚫 Это ваша кампания", callback_data="noop")
+BTN_ALREADY_BID = InlineKeyboardButton("✅ Вы уже откликнулись", callback_data="noop")
+
+# Клавиатуры создания кампании из статических справочников - строятся один раз при импорте
+CAMPAIGN_REGION_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton(region_data["display"], callback_data=f"campaignregion_{region_name}")]
+    for region_name, region_data in BELARUS_REGIONS.items()
+])
+
+def _build_campaign_city_markup(cities):
+    """Клавиатура городов области: по 2 в ряд + "Другой город" и "Назад"."""
+    buttons = [InlineKeyboardButton(city, callback_data=f"campaigncity_{city}") for city in cities]
+    rows = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
+    # ЛОГИКА "ДРУГОЙ ГОРОД":
+    # - Рекламодатель может указать любой город, не входящий в основной список
+    # - Блогеры, работающие в этом городе, увидят кампанию
+    # - Это полезно для небольших городов и посёлков
+    rows.append([InlineKeyboardButton("📍 Другой город в области", callback_data="campaigncity_other")])
+    rows.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_region")])
+    return InlineKeyboardMarkup(rows)
+
+
+# Клавиатуры выбора города для каждой области (регионы типа city/country городов не имеют)
+CAMPAIGN_CITY_MARKUPS = {
+    region_name: _build_campaign_city_markup(region_data.get("cities", []))
+    for region_name, region_data in BELARUS_REGIONS.items()
+    if region_data["type"] not in ("city", "country")
+}
+_main_category_buttons = [
+    InlineKeyboardButton(category, callback_data=f"order_cat_{idx}")
+    for idx, category in enumerate(BLOGGER_CATEGORIES)
+]
+CAMPAIGN_MAIN_CATEGORY_MARKUP = InlineKeyboardMarkup(
+    [_main_category_buttons[i:i + 2] for i in range(0, len(_main_category_buttons), 2)]
+    + [[InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_city")]]
+)
+
+# Кнопки категорий с чекбоксом: для каждой категории заранее готовы оба состояния
+_CAMPAIGN_CATEGORY_CHECK_BUTTONS = [
+    (
+        InlineKeyboardButton(f"⬜ {category}", callback_data=f"order_cat_{idx}"),
+        InlineKeyboardButton(f"✅ {category}", callback_data=f"order_cat_{idx}"),
+    )
+    for idx, category in enumerate(BLOGGER_CATEGORIES)
+]
+_CAMPAIGN_CATEGORIES_DONE_ROW = [InlineKeyboardButton("✅ Готово", callback_data="order_categories_done")]
+_CAMPAIGN_CATEGORIES_BACK_ROWS = {
+    callback: [InlineKeyboardButton("⬅️ Назад", callback_data=callback)]
+    for callback in ("create_campaign_back_to_region", "create_campaign_back_to_city", "create_campaign_back_to_maincat")
+}
+
+
+def _build_campaign_categories_markup(selected, back_callback):
+    """Клавиатура множественного выбора категорий кампании (2 в ряд).
+
+    Собирается из готовых кнопок - на каждый вызов выбирается лишь состояние чекбокса.
+    Кнопка "Готово" показывается, если выбрана хотя бы одна категория.
+    """
+    buttons = [
+        pair[category in selected]
+        for category, pair in zip(BLOGGER_CATEGORIES, _CAMPAIGN_CATEGORY_CHECK_BUTTONS)
+    ]
+    keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
+    if selected:
+        keyboard.append(_CAMPAIGN_CATEGORIES_DONE_ROW)
+    keyboard.append(_CAMPAIGN_CATEGORIES_BACK_ROWS[back_callback])
+    return InlineKeyboardMarkup(keyboard)
+
+
+
+
+# Клавиатуры публикации, отзывов и возврата в меню - статичные, создаются один раз
+REVIEW_BACK_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")]])
+REVIEW_CANCELLED_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ В главное меню", callback_data="go_main_menu")]])
+REVIEW_RATING_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⭐" * rating, callback_data=f"review_rating_{rating}") for rating in (1, 2, 3)],
+    [InlineKeyboardButton("⭐" * rating, callback_data=f"review_rating_{rating}") for rating in (4, 5)],
+    [InlineKeyboardButton("❌ Отмена", callback_data="cancel_review")],
+])
+REVIEW_SKIP_COMMENT_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⏭ Пропустить комментарий", callback_data="review_skip_comment")]
+])
+GO_MAIN_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("💼 Главное меню", callback_data="go_main_menu")]])
+CLIENT_MENU_MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ В меню", callback_data="show_client_menu")]])
+CAMPAIGN_PUBLISHED_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")],
+    [InlineKeyboardButton("⬅️ В меню", callback_data="show_client_menu")],
+])
+MAIN_MENU_MARKUPS = {
+    menu_callback: InlineKeyboardMarkup([[InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)]])
+    for menu_callback in ("show_worker_menu", "show_client_menu")
+}
+# Главное меню по роли: блогер и оба профиля - меню блогера, остальные - меню рекламодателя
+ROLE_MENU_CALLBACKS = {"blogger": "show_worker_menu", "both": "show_worker_menu"}
+# Кнопка "Назад" экрана новостей и акций - по меню возврата
+NEWS_BACK_BUTTONS = {
+    "show_worker_menu": InlineKeyboardButton("🔙 Назад в меню блогера", callback_data="show_worker_menu"),
+    "show_client_menu": InlineKeyboardButton("🔙 Назад в меню", callback_data="show_client_menu"),
+}
+NEWS_BACK_MARKUPS = {menu_callback: InlineKeyboardMarkup([[button]]) for menu_callback, button in NEWS_BACK_BUTTONS.items()}
+
+
+def _role_from_profile_flags(has_worker, has_client):
+    """Роль по наличию профилей (db.get_profile_flags): 'both' / 'blogger' / 'advertiser' / 'unknown'."""
+    if has_worker and has_client:
+        return 'both'
+    if has_worker:
+        return 'blogger'
+    if has_client:
+        return 'advertiser'
+    return 'unknown'
+
+
+def _role_menu_callback(role):
+    """callback главного меню для роли пользователя."""
+    return ROLE_MENU_CALLBACKS.get(role, "show_client_menu")
+
+# Кнопки "Мои кампании" после завершения кампании - по роли того, кому показываем
+_COMPLETED_CAMPAIGN_ROWS = {
+    "advertiser": ("⭐ Оценить блогера", [InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")]),
+    "blogger": ("⭐ Оценить рекламодатела", [InlineKeyboardButton("📦 Мои кампании", callback_data="worker_my_orders")]),
+}
+
+
+def _campaign_completed_markup(campaign_id, role):
+    """Клавиатура после завершения кампании: оценка второй стороны + "Мои кампании"."""
+    review_text, orders_row = _COMPLETED_CAMPAIGN_ROWS[role]
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(review_text, callback_data=f"leave_review_{campaign_id}")],
+        orders_row,
+    ])
+
+# Варианты оплаты кампании: (ключ в payment_types, текст кнопки)
+_CAMPAIGN_PAYMENT_OPTIONS = (
+    ("fixed_budget", "💰 Указать бюджет"),
+    ("blogger_offer", "💬 Блогеры предложат цену"),
+    ("barter", "🤝 Бартер"),
+)
+
+
+def _build_campaign_payment_markup(flags):
+    """Клавиатура выбора типов оплаты для набора флагов (выбран/нет) по каждому варианту."""
+    keyboard = [
+        [InlineKeyboardButton(f"{'✅' if flag else '⬜'} {label}", callback_data=f"payment_type_{key}")]
+        for (key, label), flag in zip(_CAMPAIGN_PAYMENT_OPTIONS, flags)
+    ]
+    # Кнопка "Готово" (активна только если выбран хотя бы один вариант)
+    if any(flags):
+        keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="payment_types_done")])
+    keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_maincat")])
+    return InlineKeyboardMarkup(keyboard)
+
+
+# Вариантов всего три - готовим клавиатуры для всех 8 комбинаций выбора
+CAMPAIGN_PAYMENT_MARKUPS = {
+    flags: _build_campaign_payment_markup(flags)
+    for flags in itertools.product((False, True), repeat=len(_CAMPAIGN_PAYMENT_OPTIONS))
+}
+
+
+def _campaign_payment_markup(selected_payments):
+    """Готовая клавиатура типов оплаты для текущего выбора пользователя."""
+    return CAMPAIGN_PAYMENT_MARKUPS[tuple(key in selected_payments for key, _ in _CAMPAIGN_PAYMENT_OPTIONS)]
+
+# Клавиатура для сообщений об ошибке в обработчиках заказов блогера
+ERROR_BACK_MARKUP = InlineKeyboardMarkup([[BTN_BACK_TO_ORDERS]])
+CANCEL_OFFER_MARKUP = InlineKeyboardMarkup([[
+    InlineKeyboardButton("❌ Отмена", callback_data="cancel_offer")
+]])
+
+# Символы валют и подписи сроков готовности для формы отклика
+_CURRENCY_SYMBOLS = {
+    'BYN': '₽',
+    'USD': '$',
+    'EUR': '€'
+}
+_READY_DAYS_LABELS = {
+    0: "Сегодня",
+    1: "Завтра",
+    3: "Через 3 дня",
+    7: "Через неделю",
+    14: "Через 2 недели",
+    30: "Через месяц",
+}
+
+
 # ===== HELPER FUNCTIONS =====
 
 async def safe_edit_message(query, text, context=None, **kwargs):
@@ -131,8 +337,6 @@ async def safe_edit_message(query, text, context=None, **kwargs):
 
     Если редактирование невозможно, удаляет старое и отправляет новое сообщение.
     """
-    import telegram
-
     try:
         # Проверяем, есть ли в сообщении фото
         if query.message.photo:
@@ -142,7 +346,7 @@ async def safe_edit_message(query, text, context=None, **kwargs):
         else:
             # Обычное текстовое сообщение - редактируем
             await query.edit_message_text(text, **kwargs)
-    except telegram.error.BadRequest as e:
+    except BadRequest as e:
         error_msg = str(e).lower()
 
         if "message is not modified" in error_msg:
@@ -231,6 +435,10 @@ def validate_required_fields(context, required_fields):
     return (len(missing) == 0, missing)
 
 
+# Допустимый file_id целиком: безопасные символы, длина 20-250
+_FILE_ID_RE = re.compile(r'[A-Za-z0-9_\-=]{20,250}')
+
+
 def validate_file_id(file_id):
     """
     КРИТИЧЕСКИ ВАЖНО: Валидация file_id от Telegram.
@@ -253,6 +461,11 @@ def validate_file_id(file_id):
         ❌ "abc"                    # слишком короткий
         ❌ "abc<script>"            # недопустимые символы
     """
+    # Быстрый путь: один проход скомпилированного регулярного выражения
+    if isinstance(file_id, str) and _FILE_ID_RE.fullmatch(file_id):
+        return True
+
+    # Ниже - только диагностика причины отказа
     if not file_id or not isinstance(file_id, str):
         logger.warning(f"❌ file_id невалиден: пустой или не строка ({type(file_id)})")
         return False
@@ -263,11 +476,8 @@ def validate_file_id(file_id):
         return False
 
     # Проверка разрешенных символов (только безопасные для Telegram)
-    if not re.match(r'^[A-Za-z0-9_\-=]+$', file_id):
-        logger.warning(f"❌ file_id невалиден: недопустимые символы")
-        return False
-
-    return True
+    logger.warning(f"❌ file_id невалиден: недопустимые символы")
+    return False
 
 
 def _get_bids_word(count):
@@ -413,7 +623,7 @@ def is_profile_complete(user_id: int, role: str) -> bool:
 # /start
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_telegram_id = update.effective_user.id
-    logger.info(f"[CMD] /start вызван от пользователя {user_telegram_id}")
+    logger.info("[CMD] /start вызван от пользователя %s", user_telegram_id)
 
     # Проверяем не забанен ли пользователь
     if db.is_user_banned(user_telegram_id):
@@ -980,7 +1190,7 @@ async def register_blogger_photos(update: Update, context: ContextTypes.DEFAULT_
 
 async def handle_blogger_photos(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработка загруженных фотографий"""
-    logger.info(f"📱 DEBUG: handle_master_photos вызван. Текст: {update.message.text if update.message.text else 'фото'}")
+    logger.info("📱 DEBUG: handle_master_photos вызван. Текст: %s", update.message.text if update.message.text else 'фото')
 
     # КРИТИЧНО: Проверяем, не зарегистрирован ли уже пользователь
     telegram_id = update.effective_user.id
@@ -996,7 +1206,7 @@ async def handle_blogger_photos(update: Update, context: ContextTypes.DEFAULT_TY
             "Профиль → Добавить фото контент\n\n"
             "Или нажмите /start для возврата в главное меню.",
             reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("💼 Главное меню", callback_data="show_worker_menu")
+                BTN_WORKER_MAIN_MENU
             ]])
         )
 
@@ -1036,7 +1246,7 @@ async def handle_blogger_photos(update: Update, context: ContextTypes.DEFAULT_TY
     # Проверяем текст сообщения
     if update.message.text:
         text = update.message.text.strip().lower()
-        logger.info(f"Получен текст: '{text}'")
+        logger.info("Получен текст: '%s'", text)
 
         # Проверяем различные варианты команды
         if text in ['/done_photos', 'done_photos', '/donephotos', 'donephotos', 'готово']:
@@ -1070,7 +1280,7 @@ async def handle_blogger_photos(update: Update, context: ContextTypes.DEFAULT_TY
         if len(context.user_data["portfolio_photos"]) < 10:
             context.user_data["portfolio_photos"].append(file_id)
             count = len(context.user_data["portfolio_photos"])
-            logger.info(f"Фото добавлено. Всего: {count}")
+            logger.info("Фото добавлено. Всего: %s", count)
 
             # Разные сообщения в зависимости от номера фото
             if count == 1:
@@ -1155,11 +1365,11 @@ async def finalize_blogger_registration(update, context):
         existing_user = db.get_user(telegram_id)
         if existing_user:
             user_id = existing_user['id']
-            logger.info(f"Пользователь {telegram_id} уже существует, используем существующий ID: {user_id}")
+            logger.info("Пользователь %s уже существует, используем существующий ID: %s", telegram_id, user_id)
         else:
             user_id = db.create_user(telegram_id, "blogger")
             user_created = True  # КРИТИЧНО: Отмечаем что создали нового пользователя
-            logger.info(f"Создан новый пользователь {telegram_id} с ID: {user_id}")
+            logger.info("Создан новый пользователь %s с ID: %s", telegram_id, user_id)
 
         # Сохраняем фото контент (если есть)
         portfolio_photos = context.user_data.get("portfolio_photos", [])
@@ -1197,7 +1407,7 @@ async def finalize_blogger_registration(update, context):
         if user_created and user_id:
             try:
                 db.delete_user_profile(telegram_id)
-                logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
             except Exception as rollback_error:
                 logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1222,7 +1432,7 @@ async def finalize_blogger_registration(update, context):
         if user_created and user_id:
             try:
                 db.delete_user_profile(telegram_id)
-                logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
             except Exception as rollback_error:
                 logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1292,19 +1502,19 @@ async def finalize_simple_blogger_registration(update: Update, context: ContextT
         if existing_user:
             user_id = existing_user['id']
             current_role = existing_user.get('role', 'blogger')
-            logger.info(f"Пользователь {telegram_id} уже существует с ролью {current_role}")
+            logger.info("Пользователь %s уже существует с ролью %s", telegram_id, current_role)
 
             # Если пользователь был рекламодателем - обновляем роль на 'both'
             if current_role == 'advertiser':
                 db.update_user_role(user_id, 'both')
-                logger.info(f"Роль пользователя {telegram_id} обновлена на 'both'")
+                logger.info("Роль пользователя %s обновлена на 'both'", telegram_id)
             elif current_role == 'blogger':
                 # Уже блогер - ничего не делаем
                 pass
             # Если 'both' - тоже ничего не делаем
         else:
             user_id = db.create_user(telegram_id, "blogger")
-            logger.info(f"Создан новый пользователь {telegram_id} с ID: {user_id}")
+            logger.info("Создан новый пользователь %s с ID: %s", telegram_id, user_id)
 
         # Создаём минимальный профиль блогера (только с именем)
         db.create_worker_profile(
@@ -1321,7 +1531,7 @@ async def finalize_simple_blogger_registration(update: Update, context: ContextT
             cities=None
         )
 
-        logger.info(f"Создан упрощенный профиль блогера для user_id={user_id}")
+        logger.info("Создан упрощенный профиль блогера для user_id=%s", user_id)
 
     except Exception as e:
         logger.error(f"❌ Ошибка при создании упрощенного профиля: {e}", exc_info=True)
@@ -1368,19 +1578,19 @@ async def finalize_simple_advertiser_registration(update: Update, context: Conte
         if existing_user:
             user_id = existing_user['id']
             current_role = existing_user.get('role', 'advertiser')
-            logger.info(f"Пользователь {telegram_id} уже существует с ролью {current_role}")
+            logger.info("Пользователь %s уже существует с ролью %s", telegram_id, current_role)
 
             # Если пользователь был блогером - обновляем роль на 'both'
             if current_role == 'blogger':
                 db.update_user_role(user_id, 'both')
-                logger.info(f"Роль пользователя {telegram_id} обновлена на 'both'")
+                logger.info("Роль пользователя %s обновлена на 'both'", telegram_id)
             elif current_role == 'advertiser':
                 # Уже рекламодатель - ничего не делаем
                 pass
             # Если 'both' - тоже ничего не делаем
         else:
             user_id = db.create_user(telegram_id, "advertiser")
-            logger.info(f"Создан новый пользователь {telegram_id} с ID: {user_id}")
+            logger.info("Создан новый пользователь %s с ID: %s", telegram_id, user_id)
 
         # Создаём минимальный профиль рекламодателя (только с именем)
         db.create_client_profile(
@@ -1391,7 +1601,7 @@ async def finalize_simple_advertiser_registration(update: Update, context: Conte
             description=""
         )
 
-        logger.info(f"Создан упрощенный профиль рекламодателя для user_id={user_id}")
+        logger.info("Создан упрощенный профиль рекламодателя для user_id=%s", user_id)
 
     except Exception as e:
         logger.error(f"❌ Ошибка при создании упрощенного профиля: {e}", exc_info=True)
@@ -1485,11 +1695,11 @@ async def register_advertiser_region_select(update: Update, context: ContextType
         # Создаём профиль клиента
         telegram_id = query.from_user.id
 
-        logger.info(f"=== Создание профиля клиента ===")
-        logger.info(f"Telegram ID: {telegram_id}")
-        logger.info(f"Имя: {context.user_data.get('name')}")
-        logger.info(f"Телефон: {context.user_data.get('phone')}")
-        logger.info(f"Регион: {region}")
+        logger.info("=== Создание профиля клиента ===")
+        logger.info("Telegram ID: %s", telegram_id)
+        logger.info("Имя: %s", context.user_data.get('name'))
+        logger.info("Телефон: %s", context.user_data.get('phone'))
+        logger.info("Регион: %s", region)
 
         # КРИТИЧНО: Обработка ошибок БД при создании пользователя и профиля
         user_created = False  # Флаг для отслеживания создания нового пользователя
@@ -1500,11 +1710,11 @@ async def register_advertiser_region_select(update: Update, context: ContextType
             existing_user = db.get_user(telegram_id)
             if existing_user:
                 user_id = existing_user["id"]
-                logger.info(f"Существующий user_id: {user_id}")
+                logger.info("Существующий user_id: %s", user_id)
             else:
                 user_id = db.create_user(telegram_id, "advertiser")
                 user_created = True  # КРИТИЧНО: Отмечаем что создали нового пользователя
-                logger.info(f"Создан новый user_id: {user_id}")
+                logger.info("Создан новый user_id: %s", user_id)
 
             db.create_client_profile(
                 user_id=user_id,
@@ -1524,7 +1734,7 @@ async def register_advertiser_region_select(update: Update, context: ContextType
             if user_created and user_id:
                 try:
                     db.delete_user_profile(telegram_id)
-                    logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                    logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
                 except Exception as rollback_error:
                     logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1547,7 +1757,7 @@ async def register_advertiser_region_select(update: Update, context: ContextType
             if user_created and user_id:
                 try:
                     db.delete_user_profile(telegram_id)
-                    logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                    logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
                 except Exception as rollback_error:
                     logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1654,12 +1864,12 @@ async def register_advertiser_city_select(update: Update, context: ContextTypes.
         # Создаём профиль
         telegram_id = query.from_user.id
 
-        logger.info(f"=== Создание профиля клиента ===")
-        logger.info(f"Telegram ID: {telegram_id}")
-        logger.info(f"Имя: {context.user_data.get('name')}")
-        logger.info(f"Телефон: {context.user_data.get('phone')}")
-        logger.info(f"Город: {city}")
-        logger.info(f"Регион: {region}")
+        logger.info("=== Создание профиля клиента ===")
+        logger.info("Telegram ID: %s", telegram_id)
+        logger.info("Имя: %s", context.user_data.get('name'))
+        logger.info("Телефон: %s", context.user_data.get('phone'))
+        logger.info("Город: %s", city)
+        logger.info("Регион: %s", region)
 
         # КРИТИЧНО: Обработка ошибок БД при создании пользователя и профиля
         user_created = False  # Флаг для отслеживания создания нового пользователя
@@ -1670,11 +1880,11 @@ async def register_advertiser_city_select(update: Update, context: ContextTypes.
             existing_user = db.get_user(telegram_id)
             if existing_user:
                 user_id = existing_user["id"]
-                logger.info(f"Существующий user_id: {user_id}")
+                logger.info("Существующий user_id: %s", user_id)
             else:
                 user_id = db.create_user(telegram_id, "advertiser")
                 user_created = True  # КРИТИЧНО: Отмечаем что создали нового пользователя
-                logger.info(f"Создан новый user_id: {user_id}")
+                logger.info("Создан новый user_id: %s", user_id)
 
             db.create_client_profile(
                 user_id=user_id,
@@ -1694,7 +1904,7 @@ async def register_advertiser_city_select(update: Update, context: ContextTypes.
             if user_created and user_id:
                 try:
                     db.delete_user_profile(telegram_id)
-                    logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                    logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
                 except Exception as rollback_error:
                     logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1717,7 +1927,7 @@ async def register_advertiser_city_select(update: Update, context: ContextTypes.
             if user_created and user_id:
                 try:
                     db.delete_user_profile(telegram_id)
-                    logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                    logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
                 except Exception as rollback_error:
                     logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1789,7 +1999,7 @@ async def register_advertiser_city_other(update: Update, context: ContextTypes.D
         if user_created and user_id:
             try:
                 db.delete_user_profile(telegram_id)
-                logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
             except Exception as rollback_error:
                 logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1811,7 +2021,7 @@ async def register_advertiser_city_other(update: Update, context: ContextTypes.D
         if user_created and user_id:
             try:
                 db.delete_user_profile(telegram_id)
-                logger.info(f"🔄 Откат: удален пользователь {telegram_id} после ошибки создания профиля")
+                logger.info("🔄 Откат: удален пользователь %s после ошибки создания профиля", telegram_id)
             except Exception as rollback_error:
                 logger.error(f"❌ Ошибка при откате создания пользователя: {rollback_error}")
 
@@ -1977,7 +2187,7 @@ async def blogger_view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         if not all_orders:
             keyboard = [
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")],
+                [BTN_BACK_WORKER_MENU],
             ]
 
             await query.edit_message_text(
@@ -2064,7 +2274,7 @@ async def blogger_view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE
                 nav_buttons.append(InlineKeyboardButton("Вперёд ▶️", callback_data="campaigns_next_page"))
             keyboard.append(nav_buttons)
 
-        keyboard.append([InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")])
+        keyboard.append([BTN_BACK_WORKER_MENU])
 
         await safe_edit_message(
             query,
@@ -2080,7 +2290,7 @@ async def blogger_view_orders(update: Update, context: ContextTypes.DEFAULT_TYPE
             "❌ Произошла ошибка при загрузке кампаний.\n\n"
             "Попробуйте позже.",
             reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]
+                [BTN_BACK_WORKER_MENU]
             ])
         )
 
@@ -2174,7 +2384,7 @@ async def navigate_campaigns_page(update: Update, context: ContextTypes.DEFAULT_
             nav_buttons.append(InlineKeyboardButton("Вперёд ▶️", callback_data="campaigns_next_page"))
         keyboard.append(nav_buttons)
 
-    keyboard.append([InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")])
+    keyboard.append([BTN_BACK_WORKER_MENU])
 
     await safe_edit_message(
         query,
@@ -2721,7 +2931,7 @@ async def start_edit_advertiser_name(update: Update, context: ContextTypes.DEFAU
     can_change, days_remaining = db.can_change_advertiser_name(user['id'])
 
     if not can_change:
-        keyboard = [[InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")]]
+        keyboard = [[BTN_BACK_CLIENT_MENU]]
 
         if days_remaining is not None:
             await query.edit_message_text(
@@ -2838,7 +3048,6 @@ async def advertiser_my_payments(update: Update, context: ContextTypes.DEFAULT_T
         total_spent += amount
 
         # Форматируем дату
-        from datetime import datetime
         created_at_raw = trans_dict['created_at']
         # PostgreSQL возвращает datetime объект, SQLite возвращает строку
         if isinstance(created_at_raw, str):
@@ -2891,7 +3100,7 @@ async def show_blogger_profile(update: Update, context: ContextTypes.DEFAULT_TYP
     context.user_data.clear()
 
     telegram_id = query.from_user.id
-    logger.info(f"Запрос профиля блогера для telegram_id: {telegram_id}")
+    logger.info("Запрос профиля блогера для telegram_id: %s", telegram_id)
     
     try:
         user = db.get_user(telegram_id)
@@ -2909,7 +3118,7 @@ async def show_blogger_profile(update: Update, context: ContextTypes.DEFAULT_TYP
         user_id = user_dict.get("id")
         role = user_dict.get("role")
         
-        logger.info(f"Найден пользователь: id={user_id}, role={role}")
+        logger.info("Найден пользователь: id=%s, role=%s", user_id, role)
 
         if role not in ["blogger", "both"]:
             logger.error(f"Пользователь не является мастером: role={role}")
@@ -2929,7 +3138,7 @@ async def show_blogger_profile(update: Update, context: ContextTypes.DEFAULT_TYP
             )
             return
 
-        logger.info(f"Профиль блогера найден для user_id={user_id}")
+        logger.info("Профиль блогера найден для user_id=%s", user_id)
 
         # ИСПРАВЛЕНО: Конвертируем в dict для безопасного доступа к sqlite3.Row
         profile_dict = dict(worker_profile)
@@ -3029,7 +3238,7 @@ async def show_blogger_profile(update: Update, context: ContextTypes.DEFAULT_TYP
         if rating_count > 0:
             keyboard.append([InlineKeyboardButton(f"📊 Отзывы ({rating_count})", callback_data=f"show_reviews_worker_{user_id}")])
 
-        keyboard.append([InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")])
+        keyboard.append([BTN_BACK_WORKER_MENU])
 
         # Показываем фото профиля (лицо), если есть. Иначе - первое из портфолио
         photo_to_show = profile_photo if profile_photo else (portfolio_photos.split(",")[0] if portfolio_photos else None)
@@ -3058,7 +3267,7 @@ async def show_blogger_profile(update: Update, context: ContextTypes.DEFAULT_TYP
                 reply_markup=InlineKeyboardMarkup(keyboard),
             )
 
-        logger.info(f"Профиль успешно отображён для telegram_id={telegram_id}")
+        logger.info("Профиль успешно отображён для telegram_id=%s", telegram_id)
 
     except Exception as e:
         logger.error(f"Ошибка при отображении профиля: {e}", exc_info=True)
@@ -3089,7 +3298,7 @@ async def blogger_add_photos_start(update: Update, context: ContextTypes.DEFAULT
     current_photos = profile_dict.get("portfolio_photos") or ""
     
     # Подсчитываем текущие фото
-    current_photos_list = [p for p in current_photos.split(",") if p] if current_photos else []
+    current_photos_list = _PHOTO_SPLIT_RE.findall(current_photos) if current_photos else []
     current_count = len(current_photos_list)
 
     # Динамический лимит на основе выполненных заказов
@@ -3102,9 +3311,9 @@ async def blogger_add_photos_start(update: Update, context: ContextTypes.DEFAULT
     context.user_data["existing_photos"] = current_photos_list
     context.user_data["new_photos"] = []
 
-    logger.info(f"📱 DEBUG: Флаг adding_photos установлен для user_id={user_id}, telegram_id={telegram_id}")
-    logger.info(f"📊 Лимит фото для блогера: {max_photos} (завершено заказов: {completed_orders})")
-    logger.info(f"Запущен режим добавления фото для user_id={user_id}")
+    logger.info("📱 DEBUG: Флаг adding_photos установлен для user_id=%s, telegram_id=%s", user_id, telegram_id)
+    logger.info("📊 Лимит фото для блогера: %s (завершено заказов: %s)", max_photos, completed_orders)
+    logger.info("Запущен режим добавления фото для user_id=%s", user_id)
 
     if available_slots <= 0:
         await query.edit_message_text(
@@ -3153,23 +3362,23 @@ async def blogger_add_photos_upload(update: Update, context: ContextTypes.DEFAUL
     """Обработка загружаемых фото (photo или document)"""
 
     telegram_id = update.effective_user.id
-    logger.info(f"📱 DEBUG: worker_add_photos_upload вызван для telegram_id={telegram_id}")
-    logger.info(f"📱 DEBUG: context.user_data = {context.user_data}")
-    logger.info(f"📱 DEBUG: uploading_profile_photo = {context.user_data.get('uploading_profile_photo')}")
-    logger.info(f"📱 DEBUG: adding_photos = {context.user_data.get('adding_photos')}")
+    logger.info("📱 DEBUG: worker_add_photos_upload вызван для telegram_id=%s", telegram_id)
+    logger.info("📱 DEBUG: context.user_data = %s", context.user_data)
+    logger.info("📱 DEBUG: uploading_profile_photo = %s", context.user_data.get('uploading_profile_photo'))
+    logger.info("📱 DEBUG: adding_photos = %s", context.user_data.get('adding_photos'))
 
     # КРИТИЧНО: Проверяем, зарегистрирован ли пользователь
     # Если НЕТ - пропускаем (пусть ConversationHandler регистрации обработает)
     existing_user = db.get_user(telegram_id)
     if not existing_user:
-        logger.info(f"📱 DEBUG: Пользователь {telegram_id} НЕ зарегистрирован - пропускаем обработку")
+        logger.info("📱 DEBUG: Пользователь %s НЕ зарегистрирован - пропускаем обработку", telegram_id)
         return  # Пропускаем, чтобы ConversationHandler мог обработать
 
-    logger.info(f"📱 DEBUG: Пользователь {telegram_id} ЗАРЕГИСТРИРОВАН - обрабатываем фото")
+    logger.info("📱 DEBUG: Пользователь %s ЗАРЕГИСТРИРОВАН - обрабатываем фото", telegram_id)
 
     # Если активен режим загрузки фото профиля - передаем управление туда
     if context.user_data.get("uploading_profile_photo"):
-        logger.info(f"📱 DEBUG: Передаем управление в upload_profile_photo")
+        logger.info("📱 DEBUG: Передаем управление в upload_profile_photo")
         return await upload_profile_photo(update, context)
 
     # Проверяем активен ли режим добавления фото
@@ -3267,7 +3476,7 @@ async def blogger_add_photos_upload(update: Update, context: ContextTypes.DEFAUL
     remaining = max_photos - total_count
 
     media_type = "Видео" if is_video else "Фото"
-    logger.info(f"{media_type} добавлено. Новых: {new_count}, Всего: {total_count}")
+    logger.info("%s добавлено. Новых: %s, Всего: %s", media_type, new_count, total_count)
 
     # ДОБАВЛЯЕМ КНОПКУ для завершения
     keyboard = [[InlineKeyboardButton("✅ Завершить добавление", callback_data="finish_adding_photos")]]
@@ -3293,7 +3502,7 @@ async def blogger_add_photos_finish_callback(update: Update, context: ContextTyp
     except Exception:
         pass
 
-    logger.info(f"Нажата кнопка завершения добавления фото. Context: {context.user_data}")
+    logger.info("Нажата кнопка завершения добавления фото. Context: %s", context.user_data)
 
     # Проверяем есть ли новые фото (более надежная проверка чем флаг adding_photos)
     new_photos = context.user_data.get("new_photos", [])
@@ -3306,7 +3515,7 @@ async def blogger_add_photos_finish_callback(update: Update, context: ContextTyp
                 "⚠️ Режим добавления фото не активен.\n\n"
                 "Возможно произошла ошибка. Попробуйте еще раз.",
                 reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]
+                    [BTN_BACK_WORKER_MENU]
                 ])
             )
         except Exception as e:
@@ -3315,7 +3524,7 @@ async def blogger_add_photos_finish_callback(update: Update, context: ContextTyp
                 chat_id=query.from_user.id,
                 text="⚠️ Режим добавления фото не активен.\n\nВозвращаемся в меню.",
                 reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]
+                    [BTN_BACK_WORKER_MENU]
                 ])
             )
         return
@@ -3328,17 +3537,17 @@ async def blogger_add_photos_finish(query, context: ContextTypes.DEFAULT_TYPE):
     """Завершение добавления фото - сохранение в БД"""
 
     logger.info("=== worker_add_photos_finish вызвана ===")
-    logger.info(f"Context user_data: {context.user_data}")
+    logger.info("Context user_data: %s", context.user_data)
 
     new_photos = context.user_data.get("new_photos", [])
     existing_photos = context.user_data.get("existing_photos", [])
 
-    logger.info(f"new_photos count: {len(new_photos)}")
-    logger.info(f"existing_photos count: {len(existing_photos)}")
+    logger.info("new_photos count: %s", len(new_photos))
+    logger.info("existing_photos count: %s", len(existing_photos))
 
     if not new_photos:
         logger.warning("Нет новых фото для сохранения")
-        keyboard = [[InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]]
+        keyboard = [[BTN_BACK_WORKER_MENU]]
 
         # Удаляем старое сообщение и отправляем новое
         try:
@@ -3375,11 +3584,11 @@ async def blogger_add_photos_finish(query, context: ContextTypes.DEFAULT_TYPE):
 
         photos_string = ",".join(valid_photos)
 
-        logger.info(f"Объединённые фото (всего {len(valid_photos)} валидных из {len(all_photos)})")
+        logger.info("Объединённые фото (всего %s валидных из %s)", len(valid_photos), len(all_photos))
         
         # Получаем telegram_id
         telegram_id = query.from_user.id
-        logger.info(f"telegram_id: {telegram_id}")
+        logger.info("telegram_id: %s", telegram_id)
         
         # Получаем user из БД
         user = db.get_user(telegram_id)
@@ -3389,14 +3598,14 @@ async def blogger_add_photos_finish(query, context: ContextTypes.DEFAULT_TYPE):
         
         user_dict = dict(user)
         user_id = user_dict.get("id")
-        logger.info(f"user_id из БД: {user_id}")
+        logger.info("user_id из БД: %s", user_id)
         
         # Обновляем в БД
         result = db.update_worker_field(user_id, "portfolio_photos", photos_string)
-        logger.info(f"Результат обновления БД: {result}")
+        logger.info("Результат обновления БД: %s", result)
         
         keyboard = [[InlineKeyboardButton("👤 Мой профиль", callback_data="worker_profile")],
-                    [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]]
+                    [BTN_BACK_WORKER_MENU]]
 
         # Подсчитываем валидные фото (для точной статистики)
         valid_new_photos = [fid for fid in new_photos if validate_file_id(fid)]
@@ -3457,7 +3666,7 @@ async def blogger_add_photos_finish(query, context: ContextTypes.DEFAULT_TYPE):
             f"Попробуйте ещё раз или обратитесь в поддержку."
         )
         
-        keyboard = [[InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]]
+        keyboard = [[BTN_BACK_WORKER_MENU]]
         
         # Удаляем старое и отправляем новое
         try:
@@ -3648,7 +3857,7 @@ async def edit_profile_photo_start(update: Update, context: ContextTypes.DEFAULT
     # Устанавливаем флаг загрузки фото профиля
     context.user_data['uploading_profile_photo'] = True
     context.user_data['user_id'] = user_id
-    logger.info(f"📱 DEBUG: Флаг uploading_profile_photo установлен для user_id={user_id}, telegram_id={telegram_id}")
+    logger.info("📱 DEBUG: Флаг uploading_profile_photo установлен для user_id=%s, telegram_id=%s", user_id, telegram_id)
 
     if current_photo:
         # Показываем текущее фото
@@ -3684,7 +3893,7 @@ async def upload_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
     """Обработка загружаемого фото профиля"""
 
     telegram_id = update.effective_user.id
-    logger.info(f"📱 DEBUG: upload_profile_photo вызван для telegram_id={telegram_id}")
+    logger.info("📱 DEBUG: upload_profile_photo вызван для telegram_id=%s", telegram_id)
 
     # Этот handler вызывается только если флаг установлен (проверка в worker_add_photos_upload)
     # Двойная проверка не нужна
@@ -3735,7 +3944,7 @@ async def upload_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
     if user_id:
         try:
             db.update_worker_field(user_id, "profile_photo", file_id)
-            logger.info(f"Фото профиля сохранено для user_id={user_id}")
+            logger.info("Фото профиля сохранено для user_id=%s", user_id)
 
             await update.message.reply_text(
                 "✅ <b>Фото профиля успешно обновлено!</b>\n\n"
@@ -3743,7 +3952,7 @@ async def upload_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
                 parse_mode="HTML",
                 reply_markup=InlineKeyboardMarkup([
                     [InlineKeyboardButton("👤 Посмотреть профиль", callback_data="worker_profile")],
-                    [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]
+                    [BTN_BACK_WORKER_MENU]
                 ])
             )
 
@@ -3755,7 +3964,7 @@ async def upload_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text(
                 f"❌ Ошибка при сохранении фото: {str(e)}",
                 reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")
+                    BTN_BACK_WORKER_MENU
                 ]])
             )
             context.user_data.clear()
@@ -3966,7 +4175,7 @@ async def delete_portfolio_photo(update: Update, context: ContextTypes.DEFAULT_T
     new_portfolio = ",".join(photos_list)
     db.update_worker_field(user_id, "portfolio_photos", new_portfolio)
 
-    logger.info(f"Удалено фото из портфолио блогера {user_id}: индекс {index}")
+    logger.info("Удалено фото из портфолио блогера %s: индекс %s", user_id, index)
 
     # Если остались фото - показываем следующее или предыдущее
     if photos_list:
@@ -5124,7 +5333,7 @@ async def advertiser_my_campaigns(update: Update, context: ContextTypes.DEFAULT_
         if not all_orders:
             keyboard = [
                 [InlineKeyboardButton("📝 Создать первую кампанию", callback_data="client_create_order")],
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")],
+                [BTN_BACK_CLIENT_MENU],
             ]
 
             await safe_edit_message(
@@ -5162,7 +5371,7 @@ async def advertiser_my_campaigns(update: Update, context: ContextTypes.DEFAULT_
             [InlineKeyboardButton(f"📱 В работе ({in_progress_count})", callback_data="advertiser_in_progress_campaigns")],
             [InlineKeyboardButton(f"✅ Завершённые ({completed_count})", callback_data="advertiser_completed_campaigns")],
             [InlineKeyboardButton("📝 Создать новую кампанию", callback_data="client_create_order")],
-            [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")]
+            [BTN_BACK_CLIENT_MENU]
         ]
 
         await safe_edit_message(
@@ -5175,7 +5384,7 @@ async def advertiser_my_campaigns(update: Update, context: ContextTypes.DEFAULT_
     except Exception as e:
         logger.error(f"Ошибка в client_my_orders: {e}", exc_info=True)
 
-        keyboard = [[InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")]]
+        keyboard = [[BTN_BACK_CLIENT_MENU]]
 
         await query.edit_message_text(
             f"❌ Ошибка при загрузке заказов:\n{str(e)}\n\nПопробуйте позже.",
@@ -5532,23 +5741,28 @@ async def cancel_campaign_handler(update: Update, context: ContextTypes.DEFAULT_
             return
 
         # Успешная отмена - уведомляем мастеров
-        notified_count = 0
-        for blogger_user_id in result['notified_workers']:
+        # Отправки независимы - запускаем их одновременно, а не по очереди
+        async def _notify_one(blogger_user_id):
             try:
-                worker_user = db.get_user_by_id(blogger_user_id)
-                if worker_user:
-                    await context.bot.send_message(
-                        chat_id=worker_user['telegram_id'],
-                        text=(
-                            f"❌ <b>Кампания #{campaign_id} отменен</b>\n\n"
-                            f"Клиент отменил кампанию на который вы откликались.\n"
-                            f"Ваше предложение больше не актуально."
-                        ),
-                        parse_mode="HTML"
-                    )
-                    notified_count += 1
+                worker_user = await db_async.get_user_by_id(blogger_user_id)
+                if not worker_user:
+                    return False
+                await context.bot.send_message(
+                    chat_id=worker_user['telegram_id'],
+                    text=(
+                        f"❌ <b>Кампания #{campaign_id} отменен</b>\n\n"
+                        f"Клиент отменил кампанию на который вы откликались.\n"
+                        f"Ваше предложение больше не актуально."
+                    ),
+                    parse_mode="HTML"
+                )
+                return True
             except Exception as e:
                 logger.warning(f"Не удалось отправить уведомление блогеру {blogger_user_id}: {e}")
+                return False
+
+        results = await asyncio.gather(*(_notify_one(uid) for uid in result['notified_workers']))
+        notified_count = sum(results)
 
         # Сообщаем клиенту об успехе
         await query.edit_message_text(
@@ -5562,7 +5776,7 @@ async def cancel_campaign_handler(update: Update, context: ContextTypes.DEFAULT_
             ]])
         )
 
-        logger.info(f"Кампания {campaign_id} отменена пользователем {user['id']}. Уведомлено блогеров: {notified_count}")
+        logger.info("Кампания %s отменена пользователем %s. Уведомлено блогеров: %s", campaign_id, user['id'], notified_count)
 
     except Exception as e:
         logger.error(f"Ошибка при отмене кампания: {e}", exc_info=True)
@@ -5588,7 +5802,7 @@ async def complete_campaign_handler(update: Update, context: ContextTypes.DEFAUL
 
     try:
         # Извлекаем campaign_id из callback_data
-        campaign_id = int(query.data.replace("complete_campaign_", ""))
+        campaign_id = int(query.data[len(_CB_COMPLETE_CAMPAIGN):])
 
         # Получаем пользователя
         user = db.get_user(query.from_user.id)
@@ -5707,7 +5921,7 @@ async def complete_campaign_handler(update: Update, context: ContextTypes.DEFAUL
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
-        logger.info(f"{'Клиент' if is_client else 'Блогер'} {user_dict['id']} открыл форму завершения кампания {campaign_id}")
+        logger.info("%s %s открыл форму завершения кампания %s", 'Клиент' if is_client else 'Блогер', user_dict['id'], campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при открытии формы завершения кампания: {e}", exc_info=True)
@@ -5717,6 +5931,58 @@ async def complete_campaign_handler(update: Update, context: ContextTypes.DEFAUL
         )
 
 
+async def _send_completion_notice(bot, campaign_id, notify_user_id, is_client, opposite_review_exists):
+    """
+    Уведомляет противоположную сторону о завершении кампании после оценки.
+
+    Запускается фоновой задачей из submit_campaign_rating, поэтому ошибки
+    только логируются.
+    """
+    try:
+        notify_user = await db_async.get_user_by_id(notify_user_id)
+        if not notify_user:
+            logger.error(f"❌ Пользователь {notify_user_id} не найден для отправки уведомления")
+            return
+
+        telegram_id = notify_user['telegram_id']
+        logger.info("📨 Отправка уведомления о завершении кампания #%s пользователю %s (telegram_id=%s)", campaign_id, notify_user_id, telegram_id)
+
+        # ИСПРАВЛЕНО: НЕ показываем рейтинг в уведомлении
+        # Пользователь НЕ должен видеть кто и какую оценку ему поставил
+
+        # Предлагаем противоположной стороне оценить
+        keyboard = []
+        if not opposite_review_exists:
+            if is_client:
+                # Клиент оценил блогера - предлагаем блогеру оценить клиента
+                keyboard.append([InlineKeyboardButton("⭐ Оценить рекламодателя", callback_data=f"leave_review_{campaign_id}")])
+                extra_text = "\n\n💡 Оцените рекламодателя - это поможет другим блогерам!"
+                logger.info("⭐ Клиент оценил блогера - предлагаем блогеру оценить клиента")
+            else:
+                # Блогер оценил клиента - предлагаем клиенту оценить блогера
+                keyboard.append([InlineKeyboardButton("⭐ Оценить блогера", callback_data=f"leave_review_{campaign_id}")])
+                extra_text = "\n\n💡 Оцените работу блогера - это поможет другим рекламодателям!"
+                logger.info("⭐ Блогер оценил клиента - предлагаем клиенту оценить блогера")
+        else:
+            extra_text = ""
+
+        await _send_with_retry(
+            bot.send_message,
+            chat_id=telegram_id,
+            text=(
+                f"✅ <b>Кампания #{campaign_id} завершена!</b>\n\n"
+                f"Противоположная сторона завершила кампанию.\n\n"
+                f"🎉 Поздравляем с успешным {'выполнением контента' if is_client else 'заказом'}!"
+                f"{extra_text}"
+            ),
+            parse_mode="HTML",
+            reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None
+        )
+        logger.info("✅ Уведомление о завершении кампания #%s успешно отправлено пользователю %s", campaign_id, notify_user_id)
+    except Exception as e:
+        logger.error(f"❌ Ошибка при отправке уведомления пользователю {notify_user_id}: {e}", exc_info=True)
+
+
 async def submit_campaign_rating(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     ОБНОВЛЕНО: Обработчик сохранения оценки кампания - работает для ОБЕИХ сторон.
@@ -5834,56 +6100,17 @@ async def submit_campaign_rating(update: Update, context: ContextTypes.DEFAULT_T
         # Это делает кампанию видимой в "Завершенные кампании" у обеих сторон
         if campaign_dict['status'] not in ['completed', 'done']:
             db.update_order_status(campaign_id, 'completed')
-            logger.info(f"✅ Кампания {campaign_id} помечена как 'completed' - первая оценка получена")
+            logger.info("✅ Кампания %s помечена как 'completed' - первая оценка получена", campaign_id)
 
         # Если обе стороны оценили, дополнительно помечаем как 'done'
         if opposite_review_exists and campaign_dict['status'] != 'done':
             db.update_order_status(campaign_id, 'done')
-            logger.info(f"✅ Кампания {campaign_id} помечена как 'done' - обе стороны оценили")
+            logger.info("✅ Кампания %s помечена как 'done' - обе стороны оценили", campaign_id)
 
-        # Уведомляем противоположную сторону
-        try:
-            notify_user = db.get_user_by_id(notify_user_id)
-            if not notify_user:
-                logger.error(f"❌ Пользователь {notify_user_id} не найден для отправки уведомления")
-                return
-
-            notify_user_dict = dict(notify_user)
-            logger.info(f"📨 Отправка уведомления о завершении кампания #{campaign_id} пользователю {notify_user_id} (telegram_id={notify_user_dict['telegram_id']})")
-
-            # ИСПРАВЛЕНО: НЕ показываем рейтинг в уведомлении
-            # Пользователь НЕ должен видеть кто и какую оценку ему поставил
-
-            # Предлагаем противоположной стороне оценить
-            keyboard = []
-            if not opposite_review_exists:
-                if is_client:
-                    # Клиент оценил блогера - предлагаем блогеру оценить клиента
-                    keyboard.append([InlineKeyboardButton("⭐ Оценить рекламодателя", callback_data=f"leave_review_{campaign_id}")])
-                    extra_text = "\n\n💡 Оцените рекламодателя - это поможет другим блогерам!"
-                    logger.info(f"⭐ Клиент оценил блогера - предлагаем блогеру оценить клиента")
-                else:
-                    # Блогер оценил клиента - предлагаем клиенту оценить блогера
-                    keyboard.append([InlineKeyboardButton("⭐ Оценить блогера", callback_data=f"leave_review_{campaign_id}")])
-                    extra_text = "\n\n💡 Оцените работу блогера - это поможет другим рекламодателям!"
-                    logger.info(f"⭐ Блогер оценил клиента - предлагаем клиенту оценить блогера")
-            else:
-                extra_text = ""
-
-            await context.bot.send_message(
-                chat_id=notify_user_dict['telegram_id'],
-                text=(
-                    f"✅ <b>Кампания #{campaign_id} завершена!</b>\n\n"
-                    f"Противоположная сторона завершила кампанию.\n\n"
-                    f"🎉 Поздравляем с успешным {'выполнением контента' if is_client else 'заказом'}!"
-                    f"{extra_text}"
-                ),
-                parse_mode="HTML",
-                reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None
-            )
-            logger.info(f"✅ Уведомление о завершении кампания #{campaign_id} успешно отправлено пользователю {notify_user_id}")
-        except Exception as e:
-            logger.error(f"❌ Ошибка при отправке уведомления пользователю {notify_user_id}: {e}", exc_info=True)
+        # Уведомляем противоположную сторону в фоне - ответ пользователю не ждёт отправку
+        _run_in_background(_send_completion_notice(
+            context.bot, campaign_id, notify_user_id, is_client, opposite_review_exists
+        ))
 
         # Показываем сообщение об успехе
         stars = "⭐" * rating
@@ -5907,7 +6134,7 @@ async def submit_campaign_rating(update: Update, context: ContextTypes.DEFAULT_T
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
-        logger.info(f"{'Клиент' if is_client else 'Блогер'} {user_dict['id']} завершил кампанию {campaign_id} с оценкой {rating}")
+        logger.info("%s %s завершил кампанию %s с оценкой %s", 'Клиент' if is_client else 'Блогер', user_dict['id'], campaign_id, rating)
 
     except Exception as e:
         logger.error(f"Ошибка при сохранении оценки кампания: {e}", exc_info=True)
@@ -5959,7 +6186,7 @@ async def add_comment_to_review(update: Update, context: ContextTypes.DEFAULT_TY
             parse_mode="HTML"
         )
 
-        logger.info(f"Пользователь {user_dict['id']} начал добавление комментария к отзыву по кампании {campaign_id}")
+        logger.info("Пользователь %s начал добавление комментария к отзыву по кампании %s", user_dict['id'], campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при начале добавления комментария: {e}", exc_info=True)
@@ -6017,7 +6244,7 @@ async def receive_review_comment(update: Update, context: ContextTypes.DEFAULT_T
             parse_mode="HTML",
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
-        logger.info(f"Пользователь {user_dict['id']} добавил комментарий к отзыву по кампании {campaign_id}")
+        logger.info("Пользователь %s добавил комментарий к отзыву по кампании %s", user_dict['id'], campaign_id)
     else:
         await update.message.reply_text(
             "❌ Не удалось обновить комментарий.\n\n"
@@ -6075,7 +6302,7 @@ async def blogger_upload_work_photo_start(update: Update, context: ContextTypes.
         # Инициализируем список загруженных фото
         context.user_data['uploaded_work_photos'] = []
 
-        logger.info(f"Блогер начал загрузку фото для кампания {campaign_id}")
+        logger.info("Блогер начал загрузку фото для кампания %s", campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при начале загрузки фото контента: {e}", exc_info=True)
@@ -6112,7 +6339,7 @@ async def blogger_skip_work_photo(update: Update, context: ContextTypes.DEFAULT_
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
-        logger.info(f"Блогер пропустил загрузку фото для кампания {campaign_id}")
+        logger.info("Блогер пропустил загрузку фото для кампания %s", campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при пропуске загрузки фото: {e}", exc_info=True)
@@ -6168,7 +6395,7 @@ async def blogger_upload_work_photo_receive(update: Update, context: ContextType
                     parse_mode="HTML"
                 )
 
-            logger.info(f"Получено фото {count}/3 для кампания {campaign_id}")
+            logger.info("Получено фото %s/3 для кампания %s", count, campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при получении фото контента: {e}", exc_info=True)
@@ -6295,7 +6522,7 @@ async def blogger_finish_work_photos(update: Update, context: ContextTypes.DEFAU
         keyboard = [
             [InlineKeyboardButton("👤 Мой профиль", callback_data="worker_profile")],
             [InlineKeyboardButton("📦 Мои кампании", callback_data="worker_my_orders")],
-            [InlineKeyboardButton("💼 Главное меню", callback_data="show_worker_menu")]
+            [BTN_WORKER_MAIN_MENU]
         ]
 
         await safe_edit_message(
@@ -6313,7 +6540,7 @@ async def blogger_finish_work_photos(update: Update, context: ContextTypes.DEFAU
         context.user_data.pop('uploading_work_photo_order_id', None)
         context.user_data.pop('uploaded_work_photos', None)
 
-        logger.info(f"Блогер {worker_dict['id']} загрузил {saved_count} фото для кампания {campaign_id}")
+        logger.info("Блогер %s загрузил %s фото для кампания %s", worker_dict['id'], saved_count, campaign_id)
 
     except Exception as e:
         logger.error(f"Ошибка при завершении загрузки фото: {e}", exc_info=True)
@@ -6708,10 +6935,10 @@ async def advertiser_verify_work_photo(update: Update, context: ContextTypes.DEF
                                     parse_mode="HTML",
                                     reply_markup=InlineKeyboardMarkup([[
                                         InlineKeyboardButton("👤 Мой профиль", callback_data="worker_profile"),
-                                        InlineKeyboardButton("💼 Главное меню", callback_data="show_worker_menu")
+                                        BTN_WORKER_MAIN_MENU
                                     ]])
                                 )
-                                logger.info(f"✅ Отправлено уведомление блогеру {worker_id} о подтверждении фото {photo_id}")
+                                logger.info("✅ Отправлено уведомление блогеру %s о подтверждении фото %s", worker_id, photo_id)
                             except Exception as e:
                                 logger.warning(f"Не удалось уведомить блогера о подтверждении фото: {e}")
 
@@ -6729,7 +6956,7 @@ async def advertiser_verify_work_photo(update: Update, context: ContextTypes.DEF
                 parse_mode="HTML",
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
-            logger.info(f"✅ Клиент подтвердил фото {photo_id}, добавлено в портфолио")
+            logger.info("✅ Клиент подтвердил фото %s, добавлено в портфолио", photo_id)
         else:
             await query.answer("❌ Ошибка при подтверждении фото", show_alert=True)
 
@@ -7137,7 +7364,7 @@ async def reject_blogger_from_offer(update: Update, context: ContextTypes.DEFAUL
 
         # Отклоняем предложение в БД
         db.update_bid_status(offer_id, 'rejected')
-        logger.info(f"Предложение {offer_id} отклонено рекламодателем")
+        logger.info("Предложение %s отклонено рекламодателем", offer_id)
 
         # Удаляем отклонённый отклик из списка
         bids = bid_data['bids']
@@ -7388,7 +7615,7 @@ async def process_offer_selection(update: Update, context: ContextTypes.DEFAULT_
 
         if existing_chat:
             chat_id = existing_chat['id']
-            logger.info(f"Чат #{chat_id} уже существует, используем его")
+            logger.info("Чат #%s уже существует, используем его", chat_id)
         else:
             # Создаём новый чат
             chat_id = db.create_chat(
@@ -7397,7 +7624,7 @@ async def process_offer_selection(update: Update, context: ContextTypes.DEFAULT_
                 blogger_user_id=blogger_user_id,
                 offer_id=offer_id
             )
-            logger.info(f"✅ Чат #{chat_id} создан между рекламодателем {user['id']} и блогером {blogger_user_id}")
+            logger.info("✅ Чат #%s создан между рекламодателем %s и блогером %s", chat_id, user['id'], blogger_user_id)
 
         # 3. Отмечаем предложение как выбранное
         # Кампания остается открытой - рекламодатель может выбрать нескольких блогеров
@@ -7583,6 +7810,41 @@ async def test_payment_success(update: Update, context: ContextTypes.DEFAULT_TYP
 # СИСТЕМА ЧАТОВ
 # ============================================
 
+def _render_history(messages, my_role, other_name, chat_dict):
+    """
+    Формирует текст чата с историей сообщений.
+
+    messages - колонки (sender_roles, texts, created_ats) из db.get_chat_messages.
+    Чистый CPU-bound код без обращений к БД и Telegram - вызывается через
+    asyncio.to_thread, чтобы длинная история не блокировала event loop.
+    """
+    sender_roles, texts, created_ats = messages
+
+    text = f"💬 <b>Чат с {other_name}</b>\n"
+    text += f"📋 Кампания #{chat_dict['campaign_id']}\n\n"
+
+    if sender_roles:
+        text += "<b>История сообщений:</b>\n\n"
+        for sender_role, message_text, created_at_raw in zip(sender_roles, texts, created_ats):
+            # PostgreSQL возвращает datetime объект, SQLite возвращает строку
+            if isinstance(created_at_raw, str):
+                created_at = created_at_raw[:16]  # Обрезаем до минут
+            else:
+                # datetime объект - форматируем
+                created_at = created_at_raw.strftime('%Y-%m-%d %H:%M')
+
+            if sender_role == my_role:
+                text += f"<b>Вы:</b> {message_text}\n"
+            else:
+                text += f"<b>{other_name}:</b> {message_text}\n"
+            text += f"<i>{created_at}</i>\n\n"
+    else:
+        text += "<i>Пока нет сообщений</i>\n\n"
+
+    text += "💡 Напишите сообщение для отправки в чат:"
+    return text
+
+
 async def open_chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Открывает чат между клиентом и мастером"""
     query = update.callback_query
@@ -7620,67 +7882,18 @@ async def open_chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
         my_role = "advertiser" if is_client else "blogger"
         other_role = "blogger" if is_client else "advertiser"
 
-        # Получаем информацию о собеседнике
-        if is_client:
-            blogger = db.get_user_by_id(chat_dict['blogger_user_id'])
-            if blogger:
-                blogger = dict(blogger)
-                worker_profile = db.get_worker_profile(blogger['id'])
-                if worker_profile:
-                    worker_profile = dict(worker_profile)
-                    other_name = worker_profile['name']
-                else:
-                    other_name = "Блогер"
-            else:
-                other_name = "Блогер"
-        else:
-            advertiser = db.get_user_by_id(chat_dict['advertiser_user_id'])
-            if advertiser:
-                advertiser = dict(advertiser)
-                client_profile = db.get_client_profile(advertiser['id'])
-                if client_profile:
-                    client_profile = dict(client_profile)
-                    other_name = client_profile['name']
-                else:
-                    other_name = "Клиент"
-            else:
-                other_name = "Клиент"
+        # Получаем имя собеседника (один JOIN вместо user + profile)
+        other_name = db.get_counterpart_name(chat_id, my_role) or ("Блогер" if is_client else "Клиент")
 
         # Получаем последние сообщения (увеличен лимит для показа всей истории)
+        # Колонки уже в хронологическом порядке: старые сверху, новые снизу
         messages = db.get_chat_messages(chat_id, limit=100)
-        messages_list = list(reversed(messages))  # Старые сверху, новые снизу
-
-        # Отмечаем сообщения как прочитанные
-        db.mark_messages_as_read(chat_id, user_dict['id'])
-
-        # Формируем текст чата
-        text = f"💬 <b>Чат с {other_name}</b>\n"
-        text += f"📋 Кампания #{chat_dict['campaign_id']}\n\n"
-
-        if messages_list:
-            text += "<b>История сообщений:</b>\n\n"
-            for msg in messages_list:
-                msg_dict = dict(msg)
-                sender_role = msg_dict['sender_role']
-                message_text = msg_dict['message_text']
-
-                # PostgreSQL возвращает datetime объект, SQLite возвращает строку
-                created_at_raw = msg_dict['created_at']
-                if isinstance(created_at_raw, str):
-                    created_at = created_at_raw[:16]  # Обрезаем до минут
-                else:
-                    # datetime объект - форматируем
-                    created_at = created_at_raw.strftime('%Y-%m-%d %H:%M')
 
-                if sender_role == my_role:
-                    text += f"<b>Вы:</b> {message_text}\n"
-                else:
-                    text += f"<b>{other_name}:</b> {message_text}\n"
-                text += f"<i>{created_at}</i>\n\n"
-        else:
-            text += "<i>Пока нет сообщений</i>\n\n"
+        # Отмечаем сообщения как прочитанные (обнуляем счётчик своей стороны)
+        db.reset_unread_count(chat_id, my_role)
 
-        text += "💡 Напишите сообщение для отправки в чат:"
+        # Формируем текст чата (вне event loop - история может быть длинной)
+        text = await asyncio.to_thread(_render_history, messages, my_role, other_name, chat_dict)
 
         # ИСПРАВЛЕНО: Сохраняем активный чат в БД вместо user_data
         # Это решает проблему потери состояния при перезапуске бота
@@ -7708,28 +7921,28 @@ async def open_chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обрабатывает сообщения, отправленные в активный чат"""
-    logger.info(f"[DEBUG] handle_chat_message вызван для пользователя {update.effective_user.id}, текст: {update.message.text[:50] if update.message and update.message.text else 'N/A'}")
-    logger.info(f"[DEBUG] context.user_data: suggestion_active={context.user_data.get('suggestion_active')}, broadcast_active={context.user_data.get('broadcast_active')}, ad_step={context.user_data.get('ad_step')}")
+    logger.info("[DEBUG] handle_chat_message вызван для пользователя %s, текст: %s", update.effective_user.id, update.message.text[:50] if update.message and update.message.text else 'N/A')
+    logger.info("[DEBUG] context.user_data: suggestion_active=%s, broadcast_active=%s, ad_step=%s", context.user_data.get('suggestion_active'), context.user_data.get('broadcast_active'), context.user_data.get('ad_step'))
 
     # FIX B: Прямая маршрутизация для гарантированной работы ConversationHandler
     # (это резервная проверка, основная обработка в direct_routing group=-1)
     if context.user_data.get("suggestion_active"):
-        logger.info(f"[FIX B] Прямая маршрутизация в receive_suggestion_text")
+        logger.info("[FIX B] Прямая маршрутизация в receive_suggestion_text")
         return await receive_suggestion_text(update, context)
 
     if context.user_data.get("broadcast_active"):
-        logger.info(f"[FIX B] Прямая маршрутизация в admin_broadcast_send")
+        logger.info("[FIX B] Прямая маршрутизация в admin_broadcast_send")
         return await admin_broadcast_send(update, context)
 
     # Если пользователь в процессе создания рекламы - пропускаем, дать ConversationHandler обработать
     if context.user_data.get('ad_step'):
-        logger.info(f"[FIX B] Пользователь в процессе создания рекламы, пропускаем")
+        logger.info("[FIX B] Пользователь в процессе создания рекламы, пропускаем")
         return  # Пропускаем, уже обработано в direct_routing
     if context.user_data.get('ad_step'):
-        logger.info(f"[FIX B] Пользователь в процессе создания рекламы, пропускаем")
+        logger.info("[FIX B] Пользователь в процессе создания рекламы, пропускаем")
         return  # Пропускаем, уже обработано в direct_routing
     if context.user_data.get('ad_step'):
-        logger.info(f"[FIX B] Пользователь в процессе создания рекламы, пропускаем")
+        logger.info("[FIX B] Пользователь в процессе создания рекламы, пропускаем")
         return  # Пропускаем, уже обработано в direct_routing
 
     # КРИТИЧНО: Проверяем, не находится ли пользователь в ConversationHandler
@@ -7739,7 +7952,7 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                         'uploading_work_photo_order_id', 'order_client_id']
     if any(key in context.user_data for key in conversation_keys):
         # Пользователь в ConversationHandler, пропускаем
-        logger.info(f"[DEBUG] handle_chat_message: пользователь в ConversationHandler, пропускаем")
+        logger.info("[DEBUG] handle_chat_message: пользователь в ConversationHandler, пропускаем")
         return
 
     # ИСПРАВЛЕНО: Получаем активный чат из БД вместо user_data
@@ -7748,7 +7961,7 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     if not active_chat:
         # Нет активного чата, пропускаем
-        logger.info(f"[DEBUG] handle_chat_message: нет активного чата для пользователя {update.effective_user.id}, пропускаем")
+        logger.info("[DEBUG] handle_chat_message: нет активного чата для пользователя %s, пропускаем", update.effective_user.id)
         return
 
     chat_id = active_chat['chat_id']
@@ -7771,12 +7984,12 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
         # Отправляем сообщение в чат
         message_id = db.send_message(chat_id, user_dict['id'], my_role, message_text)
 
-        logger.info(f"✅ Сообщение #{message_id} отправлено в чат #{chat_id} от {my_role}")
+        logger.info("✅ Сообщение #%s отправлено в чат #%s от %s", message_id, chat_id, my_role)
 
         # Если это первое сообщение блогера - подтверждаем готовность
         if my_role == "blogger" and not db.is_worker_confirmed(chat_id):
             db.confirm_worker_in_chat(chat_id)
-            logger.info(f"✅ Блогер подтвердил готовность в чате #{chat_id}")
+            logger.info("✅ Блогер подтвердил готовность в чате #%s", chat_id)
 
             # НОВАЯ ЛОГИКА: Кампания остаётся открытой для множественного выбора блогеров
             # Статус не меняется, заказчик может продолжать выбирать других блогеров
@@ -7811,7 +8024,7 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 if order_status in ['open', 'waiting_master_confirmation', 'master_confirmed', 'in_progress']:
                     should_notify = True
                 else:
-                    logger.info(f"Кампания #{chat_dict['campaign_id']} имеет статус '{order_status}' - пропускаем уведомление о сообщении")
+                    logger.info("Кампания #%s имеет статус '%s' - пропускаем уведомление о сообщении", chat_dict['campaign_id'], order_status)
 
             if should_notify:
                 try:
@@ -7848,14 +8061,14 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                                 existing_notification['notification_message_id'],
                                 existing_notification['notification_chat_id']
                             )
-                            logger.info(f"✅ Обновлено уведомление о сообщении для пользователя {other_user_id}")
+                            logger.info("✅ Обновлено уведомление о сообщении для пользователя %s", other_user_id)
                         else:
                             # Сообщения нет - отправляем НОВОЕ
                             raise Exception("No existing notification")
 
                     except Exception as edit_error:
                         # Не удалось отредактировать (сообщение удалено или не существует) - отправляем новое
-                        logger.info(f"Отправка нового уведомления о сообщении для пользователя {other_user_id}: {edit_error}")
+                        logger.info("Отправка нового уведомления о сообщении для пользователя %s: %s", other_user_id, edit_error)
                         msg = await context.bot.send_message(
                             chat_id=other_user_dict['telegram_id'],
                             text=notification_text,
@@ -7864,7 +8077,7 @@ async def handle_chat_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                         )
                         # Сохраняем message_id для будущих обновлений
                         db.save_chat_message_notification(other_user_id, msg.message_id, other_user_dict['telegram_id'])
-                        logger.info(f"✅ Отправлено новое уведомление о сообщении пользователю {other_user_id}")
+                        logger.info("✅ Отправлено новое уведомление о сообщении пользователю %s", other_user_id)
 
                 except Exception as e:
                     logger.error(f"Ошибка при отправке уведомления: {e}")
@@ -7942,7 +8155,7 @@ async def cancel_from_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Позволяет пользователю выйти из застрявшего диалога.
     """
     context.user_data.clear()
-    logger.info(f"User {update.effective_user.id} cancelled conversation via /start")
+    logger.info("User %s cancelled conversation via /start", update.effective_user.id)
 
     # Вызываем обычный start_command для показа меню
     return await start_command(update, context)
@@ -7962,7 +8175,7 @@ async def cancel_from_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         pass
 
     context.user_data.clear()
-    logger.info(f"User {query.from_user.id} cancelled conversation via callback: {query.data}")
+    logger.info("User %s cancelled conversation via callback: %s", query.from_user.id, query.data)
 
     # Перенаправляем на соответствующий обработчик меню
     if query.data == "go_main_menu":
@@ -7979,7 +8192,7 @@ async def cancel_from_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 async def cancel_from_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Отмена через команду /cancel"""
     context.user_data.clear()
-    logger.info(f"User {update.effective_user.id} cancelled conversation via /cancel command")
+    logger.info("User %s cancelled conversation via /cancel command", update.effective_user.id)
 
     await update.message.reply_text(
         "❌ Действие отменено.\n\n"
@@ -8023,7 +8236,7 @@ async def reset_profile_command(update: Update, context: ContextTypes.DEFAULT_TY
 async def add_test_campaigns_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Команда для добавления тестовых заказов (только для администраторов)"""
     telegram_id = update.effective_user.id
-    logger.info(f"[CMD] /add_test_campaigns вызван от пользователя {telegram_id}")
+    logger.info("[CMD] /add_test_campaigns вызван от пользователя %s", telegram_id)
 
     # Проверка прав администратора
     if not db.is_admin(telegram_id):
@@ -8039,7 +8252,7 @@ async def add_test_campaigns_command(update: Update, context: ContextTypes.DEFAU
 async def add_test_bloggers_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Команда для добавления тестовых блогеров (только для администраторов)"""
     telegram_id = update.effective_user.id
-    logger.info(f"[CMD] /add_test_bloggers вызван от пользователя {telegram_id}")
+    logger.info("[CMD] /add_test_bloggers вызван от пользователя %s", telegram_id)
 
     # Проверка прав администратора
     if not db.is_admin(telegram_id):
@@ -8055,7 +8268,7 @@ async def add_test_bloggers_command(update: Update, context: ContextTypes.DEFAUL
 async def add_test_advertisers_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Команда для добавления тестовых рекламодателей (только для администраторов)"""
     telegram_id = update.effective_user.id
-    logger.info(f"[CMD] /add_test_advertisers вызван от пользователя {telegram_id}")
+    logger.info("[CMD] /add_test_advertisers вызван от пользователя %s", telegram_id)
 
     # Проверка прав администратора
     if not db.is_admin(telegram_id):
@@ -8155,7 +8368,7 @@ async def add_test_offers_command(update: Update, context: ContextTypes.DEFAULT_
 
                 conn.commit()
                 created_count += 1
-                logger.info(f"✅ Создано тестовое предложение от блогера {worker_id} на кампанию {campaign_id}")
+                logger.info("✅ Создано тестовое предложение от блогера %s на кампанию %s", worker_id, campaign_id)
 
         except Exception as e:
             logger.error(f"Ошибка создания тестового предложения: {e}")
@@ -8181,6 +8394,54 @@ async def add_test_offers_command(update: Update, context: ContextTypes.DEFAULT_
 
 # ------- ПРОСМОТР ЗАКАЗОВ ДЛЯ МАСТЕРОВ -------
 
+# Короткоживущий кэш кампаний для карточки кампании:
+# повторные открытия и листание фото в течение 30 секунд не ходят в БД
+_campaign_view_cache = db.TTLCache(maxsize=1024, ttl=30)
+
+
+def _get_campaign_cached(campaign_id):
+    """db.get_order_by_id через _campaign_view_cache (возвращает dict, только для чтения)"""
+    campaign = _campaign_view_cache.get(campaign_id)
+    if campaign is None:
+        campaign = db.get_order_by_id(campaign_id)
+        if campaign:
+            # dict создаётся один раз при заполнении кэша; обработчики не копируют строку сами
+            campaign = dict(campaign)
+            _campaign_view_cache.set(campaign_id, campaign)
+    return campaign
+
+
+def _get_campaign_fresh(campaign_id):
+    """
+    db.get_order_by_id мимо кэша - для решений, зависящих от статуса (начало отклика).
+    Свежая строка заодно обновляет _campaign_view_cache.
+    """
+    campaign = db.get_order_by_id(campaign_id)
+    if not campaign:
+        _campaign_view_cache.pop(campaign_id)
+        return None
+    campaign = dict(campaign)
+    _campaign_view_cache.set(campaign_id, campaign)
+    return campaign
+
+
+def _invalidate_campaign_card(context, campaign_id):
+    """Сбрасывает закэшированное состояние карточки после отклика/отказа"""
+    _campaign_view_cache.pop(campaign_id)
+    context.user_data.get('_campaign_cache', {}).pop(campaign_id, None)
+
+
+def _filter_unanswered_campaigns(campaigns, worker_id, user_id):
+    """
+    Оставляет кампании без отклика и без отказа блогера.
+    Все проверки идут через одно соединение (request_scope) вместо соединения на каждую.
+    """
+    with db.request_scope():
+        return [campaign for campaign in campaigns
+                if not db.check_worker_bid_exists(campaign['id'], worker_id)
+                and not db.check_order_declined(user_id, campaign['id'])]
+
+
 async def blogger_view_campaigns(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Просмотр доступных заказов для блогера"""
     query = update.callback_query
@@ -8191,15 +8452,15 @@ async def blogger_view_campaigns(update: Update, context: ContextTypes.DEFAULT_T
 
     try:
         # Получаем профиль блогера
-        user = db.get_user(query.from_user.id)
+        user = await db_async.get_user(query.from_user.id)
         if not user:
             await query.edit_message_text("❌ Ошибка: пользователь не найден.")
             return
 
         # НОВОЕ: Обнуляем счётчик непрочитанных кампаний (пользователь их просматривает)
-        db.save_worker_notification(user['id'], None, None, 0)
+        await db_async.save_worker_notification(user['id'], None, None, 0)
 
-        worker_profile = db.get_worker_profile(user["id"])
+        worker_profile = await db_async.get_worker_profile(user["id"])
         if not worker_profile:
             await query.edit_message_text("❌ Ошибка: профиль блогера не найден.")
             return
@@ -8212,19 +8473,17 @@ async def blogger_view_campaigns(update: Update, context: ContextTypes.DEFAULT_T
         # ИСПРАВЛЕНО: Фильтрация по городам блогера (worker_id)
         # Раньше: 5 категорий = 5 SQL запросов, блогер видел кампании из ВСЕХ городов
         # Теперь: 5 категорий = 1 SQL запрос, блогер видит кампании ТОЛЬКО из своих городов
-        all_orders = db.get_orders_by_categories(categories, per_page=10000, blogger_id=worker_id)
+        all_orders = await db_async.get_orders_by_categories(categories, per_page=10000, blogger_id=worker_id)
         all_orders = [dict(campaign) for campaign in all_orders]
 
         # Фильтруем кампании - не показываем те, на которые блогер уже откликнулся
         # НОВОЕ: Также не показываем кампании, от которых блогер отказался
         # ИСПРАВЛЕНО: Используем worker_id (ID профиля блогера), а не user["id"] (ID пользователя)
-        all_orders = [campaign for campaign in all_orders
-                     if not db.check_worker_bid_exists(campaign['id'], worker_id)
-                     and not db.check_order_declined(user["id"], campaign['id'])]
+        all_orders = await asyncio.to_thread(_filter_unanswered_campaigns, all_orders, worker_id, user["id"])
         
         if not all_orders:
             keyboard = [
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")],
+                [BTN_BACK_WORKER_MENU],
             ]
             
             await query.edit_message_text(
@@ -8294,7 +8553,7 @@ async def blogger_view_campaigns(update: Update, context: ContextTypes.DEFAULT_T
         if len(all_orders) > 5:
             orders_text += f"<i>... и ещё {len(all_orders) - 5} заказов</i>\n\n"
 
-        keyboard.append([InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")])
+        keyboard.append([BTN_BACK_WORKER_MENU])
 
         await safe_edit_message(
             query,
@@ -8310,135 +8569,136 @@ async def blogger_view_campaigns(update: Update, context: ContextTypes.DEFAULT_T
             "❌ Произошла ошибка при загрузке заказов.\n\n"
             "Попробуйте позже.",
             reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_worker_menu")]
+                [BTN_BACK_WORKER_MENU]
             ])
         )
 
 
-async def blogger_view_campaign_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Детальный просмотр кампания мастером"""
-    query = update.callback_query
-    try:
-        await query.answer()
-    except Exception:
-        pass  # query уже отвечен если вызвано из другого handler-а
+def _format_campaign_card_text(campaign_dict):
+    """Текст карточки кампании для блогера (подпись к фото или текст сообщения)"""
+    # ИСПРАВЛЕНО: Правильное отображение типа оплаты
+    payment_type = campaign_dict.get('payment_type', 'paid')
+    budget_type = campaign_dict.get('budget_type', 'none')
+    budget_value = campaign_dict.get('budget_value', 0)
 
-    try:
-        # Извлекаем campaign_id из callback_data или из user_data (если вызвано из decline_no)
-        if '_view_campaign_id' in context.user_data:
-            campaign_id = context.user_data.pop('_view_campaign_id')
-        else:
-            campaign_id = int(query.data.replace("view_order_", ""))
+    payment_parts = []
 
-        # Получаем кампанию
-        campaign = db.get_order_by_id(campaign_id)
-        if not campaign:
-            await query.edit_message_text("❌ Кампания не найдена.")
-            return
-        
-        campaign_dict = dict(campaign)
-        
-        # Проверяем есть ли уже предложение от этого блогера
-        user = db.get_user(query.from_user.id)
-        worker_profile = db.get_worker_profile(user["id"]) if user else None
+    # Если оплата денежная (paid или both)
+    if payment_type in ['paid', 'both']:
+        if budget_value and budget_value > 0:
+            if budget_type == 'fixed':
+                payment_parts.append(f"💰 {int(budget_value)} BYN (фиксированная)")
+            elif budget_type == 'flexible':
+                payment_parts.append(f"💰 {int(budget_value)} BYN (гибкая)")
+            else:
+                payment_parts.append(f"💰 {int(budget_value)} BYN")
+        elif budget_type == 'flexible':
+            payment_parts.append("💬 Блогеры предложат цену")
 
-        already_bid = db.check_worker_bid_exists(campaign_id, worker_profile["id"]) if worker_profile else False
+    # Если есть бартер
+    if payment_type in ['barter', 'both']:
+        payment_parts.append("🤝 Бартер")
 
-        # ПРОВЕРКА: Блогер не может откликаться на свою кампанию
-        advertiser = db.get_client_by_id(campaign_dict['advertiser_id'])
-        is_own_order = False
-        if advertiser:
-            client_dict = dict(advertiser)
-            is_own_order = (client_dict['user_id'] == user["id"])
+    payment_text = ' + '.join(payment_parts) if payment_parts else "По договорённости"
+    advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
 
-        # Формируем текст
-        advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
-        text = f"📋 <b>{advertiser_name}</b>\n\n"
-        text += f"📍 <b>Город:</b> {campaign_dict.get('city', 'Не указан')}\n"
-        text += f"📱 <b>Категория:</b> {campaign_dict.get('category', 'Не указана')}\n"
+    # Строки собираются одним join вместо цепочки +=
+    lines = [
+        f"📋 <b>{advertiser_name}</b>",
+        "",
+        f"📍 <b>Город:</b> {campaign_dict.get('city', 'Не указан')}",
+        f"📱 <b>Категория:</b> {campaign_dict.get('category', 'Не указана')}",
+        f"<b>Оплата:</b> {payment_text}",
+        f"📅 <b>Создан:</b> {campaign_dict.get('created_at', '')}",
+        "",
+        "📝 <b>Описание:</b>",
+        f"{campaign_dict.get('description', 'Нет описания')}",
+        "",
+        # Информация о клиенте
+        f"👤 <b>Рекламодател:</b> {advertiser_name}",
+    ]
+    advertiser_rating_count = campaign_dict.get('advertiser_rating_count', 0)
+    if advertiser_rating_count > 0:
+        lines.append(f"⭐ {campaign_dict.get('advertiser_rating', 0):.1f} ({advertiser_rating_count} отзывов)")
+    lines.append("")
+    return "\n".join(lines)
 
-        # ИСПРАВЛЕНО: Правильное отображение типа оплаты
-        payment_type = campaign_dict.get('payment_type', 'paid')
-        budget_type = campaign_dict.get('budget_type', 'none')
-        budget_value = campaign_dict.get('budget_value', 0)
 
-        payment_parts = []
+def _build_order_action_keyboard(campaign_dict, worker_profile, is_own_order, already_bid):
+    """
+    Строки кнопок действий и возврата для карточки кампании блогера.
 
-        # Если оплата денежная (paid или both)
-        if payment_type in ['paid', 'both']:
-            if budget_value and budget_value > 0:
-                if budget_type == 'fixed':
-                    payment_parts.append(f"💰 {int(budget_value)} BYN (фиксированная)")
-                elif budget_type == 'flexible':
-                    payment_parts.append(f"💰 {int(budget_value)} BYN (гибкая)")
-                else:
-                    payment_parts.append(f"💰 {int(budget_value)} BYN")
-            elif budget_type == 'flexible':
-                payment_parts.append("💬 Блогеры предложат цену")
+    Returns:
+        list[list[InlineKeyboardButton]]: Ряды клавиатуры (без навигации по фото)
+    """
+    campaign_id = campaign_dict['id']
+    order_status = campaign_dict.get('status', 'open')
+    selected_worker_id = campaign_dict.get('selected_worker_id')
+    rows = []
+
+    # Кнопка завершения кампания если блогер работает над ним
+    if order_status == 'in_progress' and worker_profile and selected_worker_id == worker_profile["id"]:
+        rows.append([InlineKeyboardButton("✅ Контента завершена", callback_data=f"blogger_complete_campaign_{campaign_id}")])
+    # Кнопка предложения (только для открытых заказов)
+    elif order_status == 'open':
+        if is_own_order:
+            rows.append([BTN_OWN_ORDER])
+        elif already_bid:
+            rows.append([BTN_ALREADY_BID])
+        else:
+            rows.append([InlineKeyboardButton("💰 Откликнуться", callback_data=f"offer_on_campaign_{campaign_id}")])
+            # НОВОЕ: Кнопка "Отказаться от кампания" (не показывать эту кампанию больше)
+            rows.append([InlineKeyboardButton("🚫 Отказаться от кампания", callback_data=f"decline_campaign_{campaign_id}")])
 
-        # Если есть бартер
-        if payment_type in ['barter', 'both']:
-            payment_parts.append("🤝 Бартер")
+    # ИСПРАВЛЕНО: Если блогер откликнулся на кампанию - возвращаем в "Мои отклики", иначе в "Доступные кампании"
+    rows.append([BTN_BACK_TO_MY_BIDS if already_bid else BTN_BACK_TO_ORDERS])
+    return rows
 
-        # Показываем оплату
-        if payment_parts:
-            text += f"<b>Оплата:</b> {' + '.join(payment_parts)}\n"
-        else:
-            text += f"<b>Оплата:</b> По договорённости\n"
 
-        text += f"📅 <b>Создан:</b> {campaign_dict.get('created_at', '')}\n\n"
-        text += f"📝 <b>Описание:</b>\n{campaign_dict.get('description', 'Нет описания')}\n\n"
+async def _render_order_card(query, context, campaign_dict, worker_profile, is_own_order, already_bid):
+    """
+    Отрисовывает карточку кампании для блогера по уже полученному состоянию.
+
+    Используется blogger_view_campaign_details и возвратом из отказа (blogger_decline_campaign_no).
+    """
+    campaign_id = campaign_dict['id']
+    text = _format_campaign_card_text(campaign_dict)
 
-        # Информация о клиенте
-        text += f"👤 <b>Рекламодател:</b> {campaign_dict.get('advertiser_name', 'Неизвестно')}\n"
-        advertiser_rating = campaign_dict.get('advertiser_rating', 0)
-        advertiser_rating_count = campaign_dict.get('advertiser_rating_count', 0)
-        if advertiser_rating_count > 0:
-            text += f"⭐ {advertiser_rating:.1f} ({advertiser_rating_count} отзывов)\n"
-        
-        # Получаем фото
-        photos = campaign_dict.get('photos') or ''
-        photo_ids = [p.strip() for p in photos.split(',') if p.strip()]
-        
-        if photo_ids:
-            # Отправляем первое фото с текстом
-            context.user_data['current_order_id'] = campaign_id
-            context.user_data['order_photos'] = photo_ids
-            context.user_data['current_photo_index'] = 0
-            
-            keyboard = []
-            
-            # Навигация по фото если их больше 1
-            if len(photo_ids) > 1:
-                nav_buttons = []
-                if len(photo_ids) > 1:
-                    nav_buttons.append(InlineKeyboardButton("◀️", callback_data=f"order_photo_prev_{campaign_id}"))
-                nav_buttons.append(InlineKeyboardButton(f"1/{len(photo_ids)}", callback_data="noop"))
-                if len(photo_ids) > 1:
-                    nav_buttons.append(InlineKeyboardButton("▶️", callback_data=f"order_photo_next_{campaign_id}"))
-                keyboard.append(nav_buttons)
-            
-            # Кнопка завершения кампания если блогер работает над ним
-            order_status = campaign_dict.get('status', 'open')
-            selected_worker_id = campaign_dict.get('selected_worker_id')
+    # Получаем фото
+    photos = campaign_dict.get('photos') or ''
+    photo_ids = [p.strip() for p in photos.split(',') if p.strip()]
 
-            if order_status == 'in_progress' and selected_worker_id == worker_profile["id"]:
-                keyboard.append([InlineKeyboardButton("✅ Контента завершена", callback_data=f"blogger_complete_campaign_{campaign_id}")])
-            # Кнопка предложения (только для открытых заказов)
-            elif order_status == 'open':
-                if is_own_order:
-                    keyboard.append([InlineKeyboardButton("🚫 Это ваша кампания", callback_data="noop")])
-                elif already_bid:
-                    keyboard.append([InlineKeyboardButton("✅ Вы уже откликнулись", callback_data="noop")])
-                else:
-                    keyboard.append([InlineKeyboardButton("💰 Откликнуться", callback_data=f"offer_on_campaign_{campaign_id}")])
-                    # НОВОЕ: Кнопка "Отказаться от кампания" (не показывать эту кампанию больше)
-                    keyboard.append([InlineKeyboardButton("🚫 Отказаться от кампания", callback_data=f"decline_campaign_{campaign_id}")])
+    keyboard = []
 
-            # ИСПРАВЛЕНО: Если блогер откликнулся на кампанию - возвращаем в "Мои отклики", иначе в "Доступные кампании"
-            back_callback = "worker_my_bids" if already_bid else "worker_view_orders"
-            keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)])
-            
+    # Навигация по фото если их больше 1
+    if len(photo_ids) > 1:
+        keyboard.append([
+            InlineKeyboardButton("◀️", callback_data=f"order_photo_prev_{campaign_id}"),
+            InlineKeyboardButton(f"1/{len(photo_ids)}", callback_data="noop"),
+            InlineKeyboardButton("▶️", callback_data=f"order_photo_next_{campaign_id}"),
+        ])
+
+    keyboard += _build_order_action_keyboard(campaign_dict, worker_profile, is_own_order, already_bid)
+
+    if photo_ids:
+        # Отправляем первое фото с текстом
+        context.user_data['current_order_id'] = campaign_id
+        context.user_data['order_photos'] = photo_ids
+        context.user_data['current_photo_index'] = 0
+
+        edited = False
+        if query.message.photo:
+            # Предыдущая карточка уже с фото - один запрос edit_media вместо delete + reply_photo
+            try:
+                await query.message.edit_media(
+                    media=InputMediaPhoto(media=photo_ids[0], caption=text, parse_mode="HTML"),
+                    reply_markup=InlineKeyboardMarkup(keyboard)
+                )
+                edited = True
+            except BadRequest as e:
+                logger.debug("edit_media не удался, отправляем заново: %s", e)
+
+        if not edited:
             await query.message.delete()
             await query.message.reply_photo(
                 photo=photo_ids[0],
@@ -8446,67 +8706,87 @@ async def blogger_view_campaign_details(update: Update, context: ContextTypes.DE
                 parse_mode="HTML",
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
-        else:
-            # Нет фото - просто текст
-            keyboard = []
-
-            # Кнопка завершения кампания если блогер работает над ним
-            order_status = campaign_dict.get('status', 'open')
-            selected_worker_id = campaign_dict.get('selected_worker_id')
-
-            if order_status == 'in_progress' and selected_worker_id == worker_profile["id"]:
-                keyboard.append([InlineKeyboardButton("✅ Контента завершена", callback_data=f"blogger_complete_campaign_{campaign_id}")])
-            # Кнопка предложения (только для открытых заказов)
-            elif order_status == 'open':
-                if is_own_order:
-                    keyboard.append([InlineKeyboardButton("🚫 Это ваша кампания", callback_data="noop")])
-                elif already_bid:
-                    keyboard.append([InlineKeyboardButton("✅ Вы уже откликнулись", callback_data="noop")])
-                else:
-                    keyboard.append([InlineKeyboardButton("💰 Откликнуться", callback_data=f"offer_on_campaign_{campaign_id}")])
-                    # НОВОЕ: Кнопка "Отказаться от кампания" (не показывать эту кампанию больше)
-                    keyboard.append([InlineKeyboardButton("🚫 Отказаться от кампания", callback_data=f"decline_campaign_{campaign_id}")])
-
-            # ИСПРАВЛЕНО: Если блогер откликнулся на кампанию - возвращаем в "Мои отклики", иначе в "Доступные кампании"
-            back_callback = "worker_my_bids" if already_bid else "worker_view_orders"
-            keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)])
-            
-            await query.edit_message_text(
-                text,
-                parse_mode="HTML",
-                reply_markup=InlineKeyboardMarkup(keyboard)
-            )
-            
-    except Exception as e:
-        logger.error(f"Ошибка при просмотре деталей кампания: {e}", exc_info=True)
+    else:
+        # Нет фото - просто текст
         await query.edit_message_text(
-            "❌ Произошла ошибка.\n\nПопробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-            ]])
+            text,
+            parse_mode="HTML",
+            reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
 
-async def blogger_decline_campaign_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """НОВОЕ: Подтверждение отказа от кампания (шаг 1)"""
+async def blogger_view_campaign_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Детальный просмотр кампания мастером"""
     query = update.callback_query
     try:
         await query.answer()
     except Exception:
-        pass
+        pass  # query уже отвечен если вызвано из другого handler-а
 
     try:
-        # Извлекаем campaign_id из callback_data: "decline_campaign_123"
-        campaign_id = int(query.data.replace("decline_campaign_", ""))
+        # Извлекаем campaign_id из callback_data или из user_data (если вызвано из decline_no)
+        if '_view_campaign_id' in context.user_data:
+            campaign_id = context.user_data.pop('_view_campaign_id')
+        else:
+            campaign_id = int(query.data.rsplit("_", 1)[1])
 
         # Получаем кампанию
-        campaign = db.get_order_by_id(campaign_id)
+        campaign = _get_campaign_cached(campaign_id)
         if not campaign:
             await query.edit_message_text("❌ Кампания не найдена.")
             return
+        
+        campaign_dict = campaign
+        
+        # Проверяем есть ли уже предложение от этого блогера
+        user = await db_async.get_user(query.from_user.id)
+        worker_profile = await db_async.get_worker_profile(user["id"]) if user else None
 
-        campaign_dict = dict(campaign)
-        advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
+        already_bid = await db_async.check_worker_bid_exists(campaign_id, worker_profile["id"]) if worker_profile else False
+
+        # ПРОВЕРКА: Блогер не может откликаться на свою кампанию
+        # advertiser_user_id приходит из JOIN в get_order_by_id - отдельный запрос не нужен
+        is_own_order = (campaign_dict.get('advertiser_user_id') == user["id"]) if user else False
+
+        # Состояние карточки для навигации по фото и возврата из отказа - без запросов в БД
+        context.user_data['_campaign_cache'] = {
+            campaign_id: {
+                'campaign': campaign_dict,
+                'worker_profile': worker_profile,
+                'already_bid': already_bid,
+                'is_own_order': is_own_order,
+            }
+        }
+
+        await _render_order_card(query, context, campaign_dict, worker_profile, is_own_order, already_bid)
+
+    except Exception as e:
+        logger.error(f"Ошибка при просмотре деталей кампания: {e}", exc_info=True)
+        await query.edit_message_text(
+            "❌ Произошла ошибка.\n\nПопробуйте позже.",
+            reply_markup=ERROR_BACK_MARKUP
+        )
+
+
+async def blogger_decline_campaign_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """НОВОЕ: Подтверждение отказа от кампания (шаг 1)"""
+    query = update.callback_query
+    try:
+        await query.answer()
+    except Exception:
+        pass
+
+    try:
+        # Извлекаем campaign_id из callback_data: "decline_campaign_123"
+        campaign_id = int(query.data.rsplit("_", 1)[1])
+
+        # Получаем кампанию
+        campaign_dict = _get_campaign_cached(campaign_id)
+        if not campaign_dict:
+            await query.edit_message_text("❌ Кампания не найдена.")
+            return
+
+        advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
 
         # Спрашиваем подтверждение
         text = (
@@ -8534,9 +8814,7 @@ async def blogger_decline_campaign_confirm(update: Update, context: ContextTypes
         logger.error(f"Ошибка при подтверждении отказа: {e}", exc_info=True)
         await query.edit_message_text(
             "❌ Произошла ошибка.\n\nПопробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-            ]])
+            reply_markup=ERROR_BACK_MARKUP
         )
 
 
@@ -8550,10 +8828,10 @@ async def blogger_decline_campaign_yes(update: Update, context: ContextTypes.DEF
 
     try:
         # Извлекаем campaign_id из callback_data: "decline_campaign_yes_123"
-        campaign_id = int(query.data.replace("decline_campaign_yes_", ""))
+        campaign_id = int(query.data.rsplit("_", 1)[1])
 
         # Получаем user_id
-        user = db.get_user(query.from_user.id)
+        user = await db_async.get_user(query.from_user.id)
         if not user:
             await query.edit_message_text("❌ Ошибка: пользователь не найден.")
             return
@@ -8561,11 +8839,12 @@ async def blogger_decline_campaign_yes(update: Update, context: ContextTypes.DEF
         blogger_user_id = user["id"]
 
         # Получаем информацию о кампании для отображения
-        campaign = db.get_order_by_id(campaign_id)
-        advertiser_name = dict(campaign).get('advertiser_name', 'Неизвестно') if campaign else 'Неизвестно'
+        campaign = _get_campaign_cached(campaign_id)
+        advertiser_name = campaign.get('advertiser_name', 'Неизвестно') if campaign else 'Неизвестно'
 
         # Сохраняем отказ в БД
-        success = db.decline_order(blogger_user_id, campaign_id)
+        success = await db_async.decline_order(blogger_user_id, campaign_id)
+        _invalidate_campaign_card(context, campaign_id)
 
         if success:
             text = (
@@ -8577,8 +8856,8 @@ async def blogger_decline_campaign_yes(update: Update, context: ContextTypes.DEF
             text = "❌ Не удалось скрыть кампанию. Попробуйте позже."
 
         keyboard = [
-            [InlineKeyboardButton("📋 К списку заказов", callback_data="worker_view_orders")],
-            [InlineKeyboardButton("💼 Главное меню", callback_data="show_worker_menu")]
+            [BTN_TO_ORDERS_LIST],
+            [BTN_WORKER_MAIN_MENU]
         ]
 
         await query.edit_message_text(
@@ -8591,9 +8870,7 @@ async def blogger_decline_campaign_yes(update: Update, context: ContextTypes.DEF
         logger.error(f"Ошибка при отказе от кампания: {e}", exc_info=True)
         await query.edit_message_text(
             "❌ Произошла ошибка.\n\nПопробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-            ]])
+            reply_markup=ERROR_BACK_MARKUP
         )
 
 
@@ -8607,19 +8884,25 @@ async def blogger_decline_campaign_no(update: Update, context: ContextTypes.DEFA
 
     try:
         # Извлекаем campaign_id из callback_data: "decline_campaign_no_123"
-        campaign_id = int(query.data.replace("decline_campaign_no_", ""))
-
-        # Передаём campaign_id через user_data — query.data нельзя изменить в PTB 21
-        context.user_data['_view_campaign_id'] = campaign_id
-        await blogger_view_campaign_details(update, context)
+        campaign_id = int(query.data.rsplit("_", 1)[1])
+
+        card = context.user_data.get('_campaign_cache', {}).get(campaign_id)
+        if card:
+            # Карточка открывалась только что - отрисовываем из сохранённого состояния
+            await _render_order_card(
+                query, context, card['campaign'], card['worker_profile'],
+                card['is_own_order'], card['already_bid']
+            )
+        else:
+            # Передаём campaign_id через user_data — query.data нельзя изменить в PTB 21
+            context.user_data['_view_campaign_id'] = campaign_id
+            await blogger_view_campaign_details(update, context)
 
     except Exception as e:
         logger.error(f"Ошибка при отмене отказа: {e}", exc_info=True)
         await query.edit_message_text(
             "❌ Произошла ошибка.\n\nПопробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-            ]])
+            reply_markup=ERROR_BACK_MARKUP
         )
 
 
@@ -8646,74 +8929,56 @@ async def blogger_campaign_photo_nav(update: Update, context: ContextTypes.DEFAU
             current_index = (current_index + 1) % len(photo_ids)
         
         context.user_data['current_photo_index'] = current_index
-        
-        # Получаем кампании для caption
-        campaign = db.get_order_by_id(campaign_id)
-        campaign_dict = dict(campaign)
-        
-        # Проверяем предложение
-        user = db.get_user(query.from_user.id)
-        worker_profile = db.get_worker_profile(user["id"])
-        already_bid = db.check_worker_bid_exists(campaign_id, worker_profile["id"])
-
-        # ПРОВЕРКА: Блогер не может откликаться на свою кампанию
-        advertiser = db.get_client_by_id(campaign_dict['advertiser_id'])
-        is_own_order = False
-        if advertiser:
-            client_dict = dict(advertiser)
-            is_own_order = (client_dict['user_id'] == user["id"])
-
-        # Формируем текст
-        advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
-        text = f"📋 <b>{advertiser_name}</b>\n\n"
-        text += f"📍 <b>Город:</b> {campaign_dict.get('city', 'Не указан')}\n"
-        text += f"📱 <b>Категория:</b> {campaign_dict.get('category', 'Не указана')}\n"
-
-        # ИСПРАВЛЕНО: Правильное отображение типа оплаты
-        payment_type = campaign_dict.get('payment_type', 'paid')
-        budget_type = campaign_dict.get('budget_type', 'none')
-        budget_value = campaign_dict.get('budget_value', 0)
 
-        payment_parts = []
+        # Дебаунс: при быстрых нажатиях стрелок рисуем только последнее.
+        # Индекс выше уже сдвинут синхронно, поэтому ни одно нажатие не теряется.
+        nav_token = context.user_data.get('_nav_token', 0) + 1
+        context.user_data['_nav_token'] = nav_token
+        await asyncio.sleep(0.1)
+        if context.user_data.get('_nav_token') != nav_token:
+            return
+        # За время ожидания могла открыться другая кампания - перечитываем всё состояние
+        photo_ids = context.user_data.get('order_photos', [])
+        current_index = context.user_data.get('current_photo_index', 0)
+        campaign_id = context.user_data.get('current_order_id')
+        if not photo_ids or campaign_id is None:
+            return
+        current_index %= len(photo_ids)
+
+        card = context.user_data.get('_campaign_cache', {}).get(campaign_id)
+        if card:
+            # Состояние карточки сохранено при открытии кампании
+            campaign_dict = card['campaign']
+            already_bid = card['already_bid']
+            is_own_order = card['is_own_order']
+        else:
+            # Независимые запросы выполняются параллельно в потоках:
+            # задержка равна самому долгому запросу, а не их сумме
+            campaign, user = await asyncio.gather(
+                asyncio.to_thread(_get_campaign_cached, campaign_id),
+                db_async.get_user(query.from_user.id),
+            )
+            campaign_dict = campaign
 
-        # Если оплата денежная (paid или both)
-        if payment_type in ['paid', 'both']:
-            if budget_value and budget_value > 0:
-                if budget_type == 'fixed':
-                    payment_parts.append(f"💰 {int(budget_value)} BYN (фиксированная)")
-                elif budget_type == 'flexible':
-                    payment_parts.append(f"💰 {int(budget_value)} BYN (гибкая)")
-                else:
-                    payment_parts.append(f"💰 {int(budget_value)} BYN")
-            elif budget_type == 'flexible':
-                payment_parts.append("💬 Блогеры предложат цену")
+            worker_profile = await db_async.get_worker_profile(user["id"])
+            already_bid = await db_async.check_worker_bid_exists(campaign_id, worker_profile["id"])
 
-        # Если есть бартер
-        if payment_type in ['barter', 'both']:
-            payment_parts.append("🤝 Бартер")
+            # ПРОВЕРКА: Блогер не может откликаться на свою кампанию
+            is_own_order = (campaign_dict.get('advertiser_user_id') == user["id"])
 
-        # Показываем оплату
-        if payment_parts:
-            text += f"<b>Оплата:</b> {' + '.join(payment_parts)}\n"
-        else:
-            text += f"<b>Оплата:</b> По договорённости\n"
+        text = _format_campaign_card_text(campaign_dict)
 
-        text += f"📅 <b>Создан:</b> {campaign_dict.get('created_at', '')}\n\n"
-        text += f"📝 <b>Описание:</b>\n{campaign_dict.get('description', 'Нет описания')}\n\n"
-        text += f"👤 <b>Рекламодател:</b> {campaign_dict.get('advertiser_name', 'Неизвестно')}\n"
-        
         # Обновляем кнопки
-        keyboard = []
-        nav_buttons = []
-        nav_buttons.append(InlineKeyboardButton("◀️", callback_data=f"order_photo_prev_{campaign_id}"))
-        nav_buttons.append(InlineKeyboardButton(f"{current_index+1}/{len(photo_ids)}", callback_data="noop"))
-        nav_buttons.append(InlineKeyboardButton("▶️", callback_data=f"order_photo_next_{campaign_id}"))
-        keyboard.append(nav_buttons)
+        keyboard = [[
+            InlineKeyboardButton("◀️", callback_data=f"order_photo_prev_{campaign_id}"),
+            InlineKeyboardButton(f"{current_index+1}/{len(photo_ids)}", callback_data="noop"),
+            InlineKeyboardButton("▶️", callback_data=f"order_photo_next_{campaign_id}"),
+        ]]
 
         if is_own_order:
-            keyboard.append([InlineKeyboardButton("🚫 Это ваша кампания", callback_data="noop")])
+            keyboard.append([BTN_OWN_ORDER])
         elif already_bid:
-            keyboard.append([InlineKeyboardButton("✅ Вы уже откликнулись", callback_data="noop")])
+            keyboard.append([BTN_ALREADY_BID])
         else:
             keyboard.append([InlineKeyboardButton("💰 Откликнуться", callback_data=f"offer_on_campaign_{campaign_id}")])
         
@@ -8745,7 +9010,7 @@ async def advertiser_browse_bloggers(update: Update, context: ContextTypes.DEFAU
     
     keyboard = [
         [InlineKeyboardButton("▶️ Начать просмотр", callback_data="browse_start_now")],
-        [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")],
+        [BTN_BACK_CLIENT_MENU],
     ]
     
     await query.edit_message_text(
@@ -8758,6 +9023,54 @@ async def advertiser_browse_bloggers(update: Update, context: ContextTypes.DEFAU
     )
 
 
+# Списки ID мастеров по фильтрам (city, category) - общие для всех рекламодателей.
+# Ключ включает поколение данных мастеров, поэтому любое изменение профиля сбрасывает кэш.
+_workers_cache = db.TTLCache(maxsize=256, ttl=60)
+# Подготовленные карточки мастеров по (id, поколение) - создаются только для просмотренных
+_browse_card_cache = db.TTLCache(maxsize=2048, ttl=60)
+# Сколько карточек из начала списка подготовить сразу из уже полученных строк
+_BROWSE_PRELOAD = 10
+
+
+def _prepare_browse_worker(row):
+    """dict карточки мастера с разобранным портфолио (только для чтения)"""
+    blogger = dict(row)
+    # Разбираем портфолио один раз - карточка и листание фото читают готовый список
+    blogger['_photos'] = _PHOTO_SPLIT_RE.findall(blogger.get('portfolio_photos') or '')
+    return blogger
+
+
+def _get_browse_worker_ids(city, category):
+    """
+    ID мастеров для листания (tuple[int]).
+
+    В сессии хранятся только ID, карточки подгружаются по мере просмотра.
+    """
+    generation = db.get_workers_generation()
+    key = (city, category, generation)
+    worker_ids = _workers_cache.get(key)
+    if worker_ids is None:
+        rows = db.get_all_workers(city=city, category=category)
+        worker_ids = tuple(row['id'] for row in rows)
+        for row in rows[:_BROWSE_PRELOAD]:
+            _browse_card_cache.set((row['id'], generation), _prepare_browse_worker(row))
+        _workers_cache.set(key, worker_ids)
+    return worker_ids
+
+
+def _get_browse_worker(worker_id):
+    """Карточка мастера для листания или None, если профиль удалён"""
+    key = (worker_id, db.get_workers_generation())
+    blogger = _browse_card_cache.get(key)
+    if blogger is None:
+        row = db.get_worker_by_id(worker_id)
+        if row is None:
+            return None
+        blogger = _prepare_browse_worker(row)
+        _browse_card_cache.set(key, blogger)
+    return blogger
+
+
 async def browse_start_viewing(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Начало просмотра карточек мастеров"""
     query = update.callback_query
@@ -8771,43 +9084,54 @@ async def browse_start_viewing(update: Update, context: ContextTypes.DEFAULT_TYP
     category_filter = context.user_data.get("browse_category")
     
     # Получаем список мастеров
-    workers = db.get_all_workers(city=city_filter, category=category_filter)
+    worker_ids = _get_browse_worker_ids(city_filter, category_filter)
     
-    if not workers:
+    if not worker_ids:
         await query.edit_message_text(
             "😔 <b>Блогера не найдены</b>\n\n"
             "Пока ни один блогер не зарегистрировался.\n"
             "Попробуйте зайти позже!",
             parse_mode="HTML",
             reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")],
+                [BTN_BACK_CLIENT_MENU],
             ])
         )
         return
     
     # Сохраняем список и индекс текущего блогера
-    context.user_data["workers_list"] = [dict(w) for w in workers]
+    context.user_data["worker_ids"] = worker_ids
     context.user_data["current_worker_index"] = 0
     context.user_data["current_photo_index"] = 0
     
-    logger.info(f"Найдено мастеров: {len(workers)}")
+    logger.info("Найдено мастеров: %s", len(worker_ids))
     
     # Показываем первого блогера
-    await show_worker_card(query, context, edit=True)
+    await show_blogger_card(query, context, edit=True)
 
 
 async def show_blogger_card(query_or_message, context: ContextTypes.DEFAULT_TYPE, edit=False):
     """Показывает карточку блогера"""
     
-    workers_list = context.user_data.get("workers_list", [])
+    worker_ids = context.user_data.get("worker_ids", ())
     worker_index = context.user_data.get("current_worker_index", 0)
     photo_index = context.user_data.get("current_photo_index", 0)
+
+    # Пропускаем мастеров, удалённых после начала просмотра
+    blogger = None
+    while worker_index < len(worker_ids):
+        blogger = _get_browse_worker(worker_ids[worker_index])
+        if blogger is not None:
+            break
+        worker_index += 1
+        photo_index = 0
+    context.user_data["current_worker_index"] = worker_index
+    context.user_data["current_photo_index"] = photo_index
     
-    if worker_index >= len(workers_list):
+    if worker_index >= len(worker_ids):
         # Все блогера просмотрены
         keyboard = [
             [InlineKeyboardButton("🔄 Начать сначала", callback_data="browse_restart")],
-            [InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")],
+            [BTN_BACK_CLIENT_MENU],
         ]
         
         text = (
@@ -8829,8 +9153,6 @@ async def show_blogger_card(query_or_message, context: ContextTypes.DEFAULT_TYPE
             )
         return
     
-    blogger = workers_list[worker_index]
-    
     # Формируем текст карточки
     name = blogger.get("name", "Без имени")
     city = blogger.get("city", "Не указан")
@@ -8839,22 +9161,25 @@ async def show_blogger_card(query_or_message, context: ContextTypes.DEFAULT_TYPE
     description = blogger.get("description", "Нет описания")
     rating = blogger.get("rating", 0.0)
     rating_count = blogger.get("rating_count", 0)
-    portfolio_photos = blogger.get("portfolio_photos", "")
-    
-    # Обрабатываем фото
-    photos_list = [p for p in portfolio_photos.split(",") if p] if portfolio_photos else []
-    
-    card_text = f"👤 <b>{name}</b>\n\n"
-    card_text += f"📍 Город: {city}\n"
-    card_text += f"📱 Категории: {categories}\n"
-    card_text += f"💼 Опыт: {experience}\n"
-    card_text += f"⭐ Рейтинг: {rating:.1f} ({rating_count} отзывов)\n\n"
-    card_text += f"📝 {description}\n\n"
+    photos_list = blogger["_photos"]
     
     if photos_list:
-        card_text += f"📸 Фото контент: {photo_index + 1}/{len(photos_list)}"
+        photo_line = f"📸 Фото контент: {photo_index + 1}/{len(photos_list)}"
     else:
-        card_text += "📸 Нет фото контент"
+        photo_line = "📸 Нет фото контент"
+
+    card_text = "\n".join((
+        f"👤 <b>{name}</b>",
+        "",
+        f"📍 Город: {city}",
+        f"📱 Категории: {categories}",
+        f"💼 Опыт: {experience}",
+        f"⭐ Рейтинг: {rating:.1f} ({rating_count} отзывов)",
+        "",
+        f"📝 {description}",
+        "",
+        photo_line,
+    ))
     
     # Кнопки навигации
     keyboard = []
@@ -8877,13 +9202,13 @@ async def show_blogger_card(query_or_message, context: ContextTypes.DEFAULT_TYPE
     
     # Навигация по мастерам
     nav_buttons = []
-    if worker_index < len(workers_list) - 1:
+    if worker_index < len(worker_ids) - 1:
         nav_buttons.append(InlineKeyboardButton("➡️ Следующий блогер", callback_data="browse_next_blogger"))
     
     if nav_buttons:
         keyboard.append(nav_buttons)
     
-    keyboard.append([InlineKeyboardButton("⬅️ Назад в меню", callback_data="show_client_menu")])
+    keyboard.append([BTN_BACK_CLIENT_MENU])
     
     # Отправляем карточку
     if photos_list:
@@ -8938,7 +9263,7 @@ async def browse_next_blogger(update: Update, context: ContextTypes.DEFAULT_TYPE
     context.user_data["current_worker_index"] = context.user_data.get("current_worker_index", 0) + 1
     context.user_data["current_photo_index"] = 0  # Сбрасываем индекс фото
     
-    await show_worker_card(query, context, edit=True)
+    await show_blogger_card(query, context, edit=True)
 
 
 async def browse_photo_prev(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -8951,7 +9276,7 @@ async def browse_photo_prev(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     context.user_data["current_photo_index"] = max(0, context.user_data.get("current_photo_index", 0) - 1)
     
-    await show_worker_card(query, context, edit=True)
+    await show_blogger_card(query, context, edit=True)
 
 
 async def browse_photo_next(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -8962,17 +9287,17 @@ async def browse_photo_next(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
     
-    workers_list = context.user_data.get("workers_list", [])
+    worker_ids = context.user_data.get("worker_ids", ())
     worker_index = context.user_data.get("current_worker_index", 0)
     
-    if worker_index < len(workers_list):
-        blogger = workers_list[worker_index]
-        photos_list = [p for p in (blogger.get("portfolio_photos") or "").split(",") if p]
+    blogger = _get_browse_worker(worker_ids[worker_index]) if worker_index < len(worker_ids) else None
+    if blogger is not None:
+        photos_list = blogger["_photos"]
         
         current_photo_index = context.user_data.get("current_photo_index", 0)
         context.user_data["current_photo_index"] = min(len(photos_list) - 1, current_photo_index + 1)
     
-    await show_worker_card(query, context, edit=True)
+    await show_blogger_card(query, context, edit=True)
 
 
 async def browse_restart(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -8986,7 +9311,7 @@ async def browse_restart(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data["current_worker_index"] = 0
     context.user_data["current_photo_index"] = 0
     
-    await show_worker_card(query, context, edit=True)
+    await show_blogger_card(query, context, edit=True)
 
 
 # ------- ОТКЛИКИ МАСТЕРОВ НА ЗАКАЗЫ -------
@@ -9000,7 +9325,7 @@ async def blogger_offer_on_campaign(update: Update, context: ContextTypes.DEFAUL
         pass
 
     # Извлекаем campaign_id
-    campaign_id = int(query.data.replace("offer_on_campaign_", ""))
+    campaign_id = int(query.data.rsplit("_", 1)[1])
     context.user_data['bid_order_id'] = campaign_id
 
     # Проверяем не откликался ли уже
@@ -9016,18 +9341,20 @@ async def blogger_offer_on_campaign(update: Update, context: ContextTypes.DEFAUL
     worker_id = profile_dict.get("id")
 
     # ПРОВЕРКА: Блогер не может откликаться на свою кампанию
-    campaign = db.get_order_by_id(campaign_id)
-    if not campaign:
+    # ИСПРАВЛЕНО: статус читается из БД, а не из 30-секундного кэша карточки -
+    # на только что закрытую кампанию откликнуться нельзя
+    campaign_dict = _get_campaign_fresh(campaign_id)
+    if not campaign_dict:
         await query.answer("❌ Кампания не найдена!", show_alert=True)
         return ConversationHandler.END
 
-    campaign_dict = dict(campaign)
-    advertiser = db.get_client_by_id(campaign_dict['advertiser_id'])
-    if advertiser:
-        client_dict = dict(advertiser)
-        if client_dict['user_id'] == user_dict.get("id"):
-            await query.answer("❌ Вы не можете откликнуться на свою кампанию!", show_alert=True)
-            return ConversationHandler.END
+    if campaign_dict.get('status') != 'open':
+        await query.answer("❌ Кампания уже закрыта для откликов.", show_alert=True)
+        return ConversationHandler.END
+
+    if campaign_dict.get('advertiser_user_id') == user_dict.get("id"):
+        await query.answer("❌ Вы не можете откликнуться на свою кампанию!", show_alert=True)
+        return ConversationHandler.END
 
     if db.check_worker_bid_exists(campaign_id, worker_id):
         await query.answer("Вы уже откликнулись на эту кампанию!", show_alert=True)
@@ -9173,15 +9500,18 @@ async def blogger_offer_select_paid(update: Update, context: ContextTypes.DEFAUL
         pass
 
     # Извлекаем campaign_id из callback_data
-    campaign_id = int(query.data.replace("offer_paid_", ""))
+    campaign_id = int(query.data.rsplit("_", 1)[1])
 
     # Получаем кампанию
-    campaign = db.get_order_by_id(campaign_id)
-    if not campaign:
+    campaign_dict = _get_campaign_fresh(campaign_id)
+    if not campaign_dict:
         await query.answer("❌ Кампания не найдена!", show_alert=True)
         return ConversationHandler.END
 
-    campaign_dict = dict(campaign)
+    if campaign_dict.get('status') != 'open':
+        await query.answer("❌ Кампания уже закрыта для откликов.", show_alert=True)
+        return ConversationHandler.END
+
     budget_value = campaign_dict.get('budget_value', 0)
     advertiser_name = campaign_dict.get('advertiser_name', 'Неизвестно')
 
@@ -9226,11 +9556,14 @@ async def blogger_offer_select_barter(update: Update, context: ContextTypes.DEFA
         pass
 
     # Извлекаем campaign_id из callback_data
-    campaign_id = int(query.data.replace("offer_barter_", ""))
+    campaign_id = int(query.data.rsplit("_", 1)[1])
 
     # Получаем информацию о кампании для отображения названия рекламодателя
-    campaign = db.get_order_by_id(campaign_id)
-    advertiser_name = dict(campaign).get('advertiser_name', 'Неизвестно') if campaign else 'Неизвестно'
+    campaign = _get_campaign_fresh(campaign_id)
+    if campaign and campaign.get('status') != 'open':
+        await query.answer("❌ Кампания уже закрыта для откликов.", show_alert=True)
+        return ConversationHandler.END
+    advertiser_name = campaign.get('advertiser_name', 'Неизвестно') if campaign else 'Неизвестно'
 
     # Сохраняем параметры для создания отклика (бартер = цена 0)
     context.user_data['bid_price'] = 0
@@ -9319,17 +9652,10 @@ async def blogger_offer_select_currency(update: Update, context: ContextTypes.DE
     context.user_data['bid_currency'] = currency
 
     # Получаем символ валюты для отображения
-    currency_symbols = {
-        'BYN': '₽',
-        'USD': '$',
-        'EUR': '€'
-    }
-    currency_symbol = currency_symbols.get(currency, currency)
+    currency_symbol = _CURRENCY_SYMBOLS.get(currency, currency)
 
     # Спрашиваем цену в выбранной валюте
-    keyboard = InlineKeyboardMarkup([[
-        InlineKeyboardButton("❌ Отмена", callback_data="cancel_offer")
-    ]])
+    keyboard = CANCEL_OFFER_MARKUP
 
     text = (
         f"💰 <b>Валюта выбрана: {currency} ({currency_symbol})</b>\n\n"
@@ -9364,24 +9690,11 @@ async def blogger_offer_select_ready_days(update: Update, context: ContextTypes.
         pass
 
     # Извлекаем количество дней из callback_data
-    ready_days = int(query.data.replace("ready_days_", ""))
+    ready_days = int(query.data.rsplit("_", 1)[1])
     context.user_data['bid_ready_days'] = ready_days
 
     # Формируем текст для отображения срока
-    if ready_days == 0:
-        ready_text = "Сегодня"
-    elif ready_days == 1:
-        ready_text = "Завтра"
-    elif ready_days == 3:
-        ready_text = "Через 3 дня"
-    elif ready_days == 7:
-        ready_text = "Через неделю"
-    elif ready_days == 14:
-        ready_text = "Через 2 недели"
-    elif ready_days == 30:
-        ready_text = "Через месяц"
-    else:
-        ready_text = f"Через {ready_days} дн."
+    ready_text = _READY_DAYS_LABELS.get(ready_days, f"Через {ready_days} дн.")
 
     price = context.user_data['bid_price']
     currency = context.user_data['bid_currency']
@@ -9431,6 +9744,37 @@ async def blogger_offer_skip_comment(update: Update, context: ContextTypes.DEFAU
     return await blogger_offer_publish(update, context)
 
 
+async def _lookup_and_notify_advertiser(context, campaign_id, blogger_name, price, currency):
+    """Находит клиента кампании и ставит ему уведомление о новом отклике.
+
+    Выполняется одновременно с ответом блогеру, поэтому ошибки логируются
+    здесь и не прерывают этот ответ.
+    """
+    try:
+        # Клиент и его telegram_id - одним JOIN-запросом
+        client_user = await db_async.get_advertiser_user_by_campaign(campaign_id)
+        if not client_user:
+            return
+
+        # Отклики, пришедшие подряд, дают клиенту одно обновление уведомления
+        debounce_notification(
+            ("advertiser", client_user['user_id']),
+            f"новый отклик на кампанию #{campaign_id} клиенту {client_user['user_id']}",
+            functools.partial(
+                notify_advertiser_new_offer,
+                context,
+                client_user['telegram_id'],
+                client_user['user_id'],  # advertiser_user_id для системы уведомлений
+                campaign_id,
+                blogger_name,
+                price,
+                currency
+            ),
+        )
+    except Exception as e:
+        logger.error(f"Ошибка уведомления клиента о предложении на кампанию {campaign_id}: {e}", exc_info=True)
+
+
 async def blogger_offer_publish(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Публикация предложения"""
     try:
@@ -9449,16 +9793,15 @@ async def blogger_offer_publish(update: Update, context: ContextTypes.DEFAULT_TY
             telegram_id = update.effective_user.id
             message = update.message
 
-        user = db.get_user(telegram_id)
-        user_dict = dict(user)
-        worker_profile = db.get_worker_profile(user_dict["id"])
-        worker_profile_dict = dict(worker_profile)
+        # Строки БД поддерживают доступ по ключу - копия в dict не нужна
+        user = await db_async.get_user(telegram_id)
+        worker_profile = await db_async.get_worker_profile(user["id"])
 
         # Создаём предложение (может вызвать ValueError при rate limiting)
         try:
-            offer_id = db.create_bid(
+            offer_id = await db_async.create_bid(
                 campaign_id=campaign_id,
-                blogger_id=worker_profile_dict["id"],
+                blogger_id=worker_profile["id"],
                 proposed_price=price,
                 currency=currency,
                 comment=comment,
@@ -9473,51 +9816,37 @@ async def blogger_offer_publish(update: Update, context: ContextTypes.DEFAULT_TY
 
             await message.reply_text(
                 str(e),
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-                ]])
+                reply_markup=ERROR_BACK_MARKUP
             )
             context.user_data.clear()
             return ConversationHandler.END
 
-        logger.info(f"✅ Предложение #{offer_id} создано блогером {worker_profile_dict['id']} на кампанию {campaign_id}")
-
-        # Отправляем уведомление клиенту
-        campaign = db.get_order_by_id(campaign_id)
-        if campaign:
-            # Получаем telegram_id клиента
-            advertiser = db.get_client_by_id(campaign['advertiser_id'])
-            client_user = db.get_user_by_id(advertiser['user_id'])
+        logger.info("✅ Предложение #%s создано блогером %s на кампанию %s", offer_id, worker_profile['id'], campaign_id)
+        _invalidate_campaign_card(context, campaign_id)
 
-            blogger_name = worker_profile_dict.get('name', 'Блогер')
+        blogger_name = worker_profile['name'] or 'Блогер'
 
-            # Используем новую функцию уведомления
-            await notify_advertiser_new_offer(
-                context,
-                client_user['telegram_id'],
-                client_user['id'],  # advertiser_user_id для системы уведомлений
-                campaign_id,
-                blogger_name,
-                price,
-                currency
-            )
-        
         # ИСПРАВЛЕНО: Добавлена кнопка "Мои отклики" для быстрого доступа к своим откликам
         keyboard = [
             [InlineKeyboardButton("💼 Мои отклики", callback_data="worker_my_bids")],
             [InlineKeyboardButton("📋 К доступным заказам", callback_data="worker_view_orders")],
         ]
 
-        await message.reply_text(
-            "✅ <b>Предложение отправлено!</b>\n\n"
-            f"💰 Ваша цена: {price} {currency}\n"
-            f"📝 Комментарий: {comment if comment else 'Нет'}\n\n"
-            "Клиент увидит ваше предложение и сможет с вами связаться!\n\n"
-            "💡 Вы можете посмотреть свои отклики в разделе \"💼 Мои отклики\"",
-            parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+        # Ответ блогеру и уведомление клиенту (поиск в БД + отправка) независимы -
+        # выполняем их одновременно
+        await asyncio.gather(
+            message.reply_text(
+                "✅ <b>Предложение отправлено!</b>\n\n"
+                f"💰 Ваша цена: {price} {currency}\n"
+                f"📝 Комментарий: {comment if comment else 'Нет'}\n\n"
+                "Клиент увидит ваше предложение и сможет с вами связаться!\n\n"
+                "💡 Вы можете посмотреть свои отклики в разделе \"💼 Мои отклики\"",
+                parse_mode="HTML",
+                reply_markup=InlineKeyboardMarkup(keyboard)
+            ),
+            _lookup_and_notify_advertiser(context, campaign_id, blogger_name, price, currency),
         )
-        
+
         context.user_data.clear()
         return ConversationHandler.END
         
@@ -9531,9 +9860,7 @@ async def blogger_offer_publish(update: Update, context: ContextTypes.DEFAULT_TY
             
         await message.reply_text(
             "❌ Произошла ошибка при создании предложения.\n\nПопробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="worker_view_orders")
-            ]])
+            reply_markup=ERROR_BACK_MARKUP
         )
         context.user_data.clear()
         return ConversationHandler.END
@@ -9576,16 +9903,8 @@ async def go_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("Ошибка: пользователь не найден")
         return
     
-    user_dict = dict(user)
-    user_id = user_dict["id"]
-    
-    # Проверяем есть ли профиль блогера
-    worker_profile = db.get_worker_profile(user_id)
-    # Проверяем есть ли профиль клиента
-    client_profile = db.get_client_profile(user_id)
-    
-    has_worker = worker_profile is not None
-    has_client = client_profile is not None
+    # Наличие профилей блогера и клиента - одним запросом, без загрузки самих профилей
+    has_worker, has_client = db.get_profile_flags(user["id"])
     
     keyboard = []
     
@@ -9611,7 +9930,16 @@ async def go_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     elif has_client:
         message += "Вы зарегистрированы как рекламодател.\n\nХотите также стать блогером?"
 
-    # Удаляем старое сообщение и отправляем новое
+    reply_markup = InlineKeyboardMarkup(keyboard)
+
+    # Редактируем текущее сообщение - один запрос к Telegram вместо delete + send
+    try:
+        await query.edit_message_text(text=message, parse_mode="HTML", reply_markup=reply_markup)
+        return
+    except BadRequest as e:
+        # Сообщение с медиа нельзя превратить в текстовое - удаляем и отправляем новое
+        logger.debug("go_main_menu: редактирование невозможно (%s), отправляем новое сообщение", e)
+
     try:
         await query.message.delete()
     except Exception:
@@ -9621,7 +9949,7 @@ async def go_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id=query.message.chat_id,
         text=message,
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=reply_markup,
     )
 
 
@@ -9688,18 +10016,11 @@ async def advertiser_create_campaign(update: Update, context: ContextTypes.DEFAU
     context.user_data["order_client_id"] = client_profile["id"]
 
     # Показываем регионы Беларуси
-    keyboard = []
-    for region_name, region_data in BELARUS_REGIONS.items():
-        keyboard.append([InlineKeyboardButton(
-            region_data["display"],
-            callback_data=f"campaignregion_{region_name}"
-        )])
-
     await query.edit_message_text(
         "📝 <b>Создание кампании</b>\n\n"
         "🏙 <b>Шаг 1:</b> Где нужен контент? Выберите регион или город:",
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=CAMPAIGN_REGION_MARKUP
     )
     return CREATE_CAMPAIGN_REGION_SELECT
 
@@ -9731,24 +10052,7 @@ async def create_campaign_region_select(update: Update, context: ContextTypes.DE
 
         # Переходим к выбору категорий (множественный выбор)
         selected = context.user_data["order_categories"]
-        keyboard = []
-        row = []
-        for idx, category in enumerate(BLOGGER_CATEGORIES):
-            # Добавляем чекбокс: ✅ если выбрано, ⬜ если нет
-            checkbox = "✅" if category in selected else "⬜"
-            row.append(InlineKeyboardButton(f"{checkbox} {category}", callback_data=f"order_cat_{idx}"))
-            if len(row) == 2:
-                keyboard.append(row)
-                row = []
-        if row:
-            keyboard.append(row)
-
-        # Кнопка "Готово" (активна только если выбрана хотя бы одна категория)
-        if selected:
-            keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="order_categories_done")])
-
-        # Добавляем кнопку "Назад"
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_region")])
+        reply_markup = _build_campaign_categories_markup(selected, "create_campaign_back_to_region")
 
         selected_text = f"\n\n<b>Выбрано:</b> {', '.join(selected)}" if selected else "\n\n<i>Выберите хотя бы одну категорию</i>"
 
@@ -9756,41 +10060,18 @@ async def create_campaign_region_select(update: Update, context: ContextTypes.DE
             f"🏙 Город: {region_data['display']}\n\n"
             f"📱 <b>Шаг 2:</b> Выберите тематики контента (можно несколько):{selected_text}",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=reply_markup,
         )
         return CREATE_CAMPAIGN_MAIN_CATEGORY
 
     # Если выбрана область - показываем города
     else:
-        cities = region_data.get("cities", [])
-        keyboard = []
-        row = []
-        for city in cities:
-            row.append(InlineKeyboardButton(city, callback_data=f"campaigncity_{city}"))
-            if len(row) == 2:
-                keyboard.append(row)
-                row = []
-        if row:
-            keyboard.append(row)
-
-        # Добавляем кнопку "Другой город в области"
-        # ЛОГИКА "ДРУГОЙ ГОРОД":
-        # - Рекламодатель может указать любой город, не входящий в основной список
-        # - Блогеры, работающие в этом городе, увидят кампанию
-        # - Это полезно для небольших городов и посёлков
-        keyboard.append([InlineKeyboardButton(
-            f"📍 Другой город в области",
-            callback_data="campaigncity_other"
-        )])
-
-        # Добавляем кнопку "Назад"
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_region")])
-
+        # Готовая клавиатура городов области (см. CAMPAIGN_CITY_MARKUPS)
         await query.edit_message_text(
             f"📍 Область: {region_data['display']}\n\n"
             "🏙 Выберите город:",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=CAMPAIGN_CITY_MARKUPS[region],
         )
         return CREATE_CAMPAIGN_CITY
 
@@ -9819,24 +10100,7 @@ async def create_campaign_city_select(update: Update, context: ContextTypes.DEFA
 
         # Переходим к выбору категорий (множественный выбор)
         selected = context.user_data["order_categories"]
-        keyboard = []
-        row = []
-        for idx, category in enumerate(BLOGGER_CATEGORIES):
-            # Добавляем чекбокс: ✅ если выбрано, ⬜ если нет
-            checkbox = "✅" if category in selected else "⬜"
-            row.append(InlineKeyboardButton(f"{checkbox} {category}", callback_data=f"order_cat_{idx}"))
-            if len(row) == 2:
-                keyboard.append(row)
-                row = []
-        if row:
-            keyboard.append(row)
-
-        # Кнопка "Готово" (активна только если выбрана хотя бы одна категория)
-        if selected:
-            keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="order_categories_done")])
-
-        # Добавляем кнопку "Назад"
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_city")])
+        reply_markup = _build_campaign_categories_markup(selected, "create_campaign_back_to_city")
 
         selected_text = f"\n\n<b>Выбрано:</b> {', '.join(selected)}" if selected else "\n\n<i>Выберите хотя бы одну категорию</i>"
 
@@ -9844,7 +10108,7 @@ async def create_campaign_city_select(update: Update, context: ContextTypes.DEFA
             f"🏙 Город: <b>{city}</b>\n\n"
             f"📱 <b>Шаг 2:</b> Выберите тематики контента (можно несколько):{selected_text}",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=reply_markup,
         )
         return CREATE_CAMPAIGN_MAIN_CATEGORY
 
@@ -9870,24 +10134,6 @@ async def create_campaign_main_category(update: Update, context: ContextTypes.DE
         # Переходим к выбору типа оплаты (3 варианта) - множественный выбор
         selected_payments = context.user_data["payment_types"]
 
-        keyboard = []
-        # Чекбокс для фиксированного бюджета
-        checkbox_fixed = "✅" if "fixed_budget" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_fixed} 💰 Указать бюджет", callback_data="payment_type_fixed_budget")])
-
-        # Чекбокс для открытого ценообразования
-        checkbox_blogger = "✅" if "blogger_offer" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_blogger} 💬 Блогеры предложат цену", callback_data="payment_type_blogger_offer")])
-
-        # Чекбокс для бартера
-        checkbox_barter = "✅" if "barter" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_barter} 🤝 Бартер", callback_data="payment_type_barter")])
-
-        # Кнопка "Готово" (активна только если выбран хотя бы один вариант)
-        if selected_payments:
-            keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="payment_types_done")])
-
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_maincat")])
 
         categories_text = ", ".join(categories)
         selected_text = ""
@@ -9911,7 +10157,7 @@ async def create_campaign_main_category(update: Update, context: ContextTypes.DE
             "💬 <b>Блогеры предложат цену</b> - блогеры сами предложат свою стоимость в откликах\n"
             "🤝 <b>Бартер</b> - предложение взаимовыгодного сотрудничества без денежной оплаты",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=_campaign_payment_markup(selected_payments),
         )
         return CREATE_CAMPAIGN_SUBCATEGORY_SELECT  # Переиспользуем состояние для payment_type
     else:
@@ -9932,23 +10178,7 @@ async def create_campaign_main_category(update: Update, context: ContextTypes.DE
         selected = context.user_data["order_categories"]
         city = context.user_data.get("order_city", "")
 
-        keyboard = []
-        row = []
-        for idx, cat in enumerate(BLOGGER_CATEGORIES):
-            # Добавляем чекбокс: ✅ если выбрано, ⬜ если нет
-            checkbox = "✅" if cat in selected else "⬜"
-            row.append(InlineKeyboardButton(f"{checkbox} {cat}", callback_data=f"order_cat_{idx}"))
-            if len(row) == 2:
-                keyboard.append(row)
-                row = []
-        if row:
-            keyboard.append(row)
-
-        # Кнопка "Готово" (активна только если выбрана хотя бы одна категория)
-        if selected:
-            keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="order_categories_done")])
-
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_maincat")])
+        reply_markup = _build_campaign_categories_markup(selected, "create_campaign_back_to_maincat")
 
         selected_text = f"\n\n<b>Выбрано:</b> {', '.join(selected)}" if selected else "\n\n<i>Выберите хотя бы одну категорию</i>"
 
@@ -9956,7 +10186,7 @@ async def create_campaign_main_category(update: Update, context: ContextTypes.DE
             f"🏙 Город: <b>{city}</b>\n\n"
             f"📱 <b>Шаг 2:</b> Выберите категории блогеров (можно несколько):{selected_text}",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=reply_markup,
         )
         return CREATE_CAMPAIGN_MAIN_CATEGORY
 
@@ -10064,24 +10294,6 @@ async def create_campaign_subcategory_select(update: Update, context: ContextTyp
         city = context.user_data.get("order_city", "")
         selected_payments = context.user_data["payment_types"]
 
-        keyboard = []
-        # Чекбокс для фиксированного бюджета
-        checkbox_fixed = "✅" if "fixed_budget" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_fixed} 💰 Указать бюджет", callback_data="payment_type_fixed_budget")])
-
-        # Чекбокс для открытого ценообразования
-        checkbox_blogger = "✅" if "blogger_offer" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_blogger} 💬 Блогеры предложат цену", callback_data="payment_type_blogger_offer")])
-
-        # Чекбокс для бартера
-        checkbox_barter = "✅" if "barter" in selected_payments else "⬜"
-        keyboard.append([InlineKeyboardButton(f"{checkbox_barter} 🤝 Бартер", callback_data="payment_type_barter")])
-
-        # Кнопка "Готово" (активна только если выбран хотя бы один вариант)
-        if selected_payments:
-            keyboard.append([InlineKeyboardButton("✅ Готово", callback_data="payment_types_done")])
-
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_maincat")])
 
         categories_text = ", ".join(categories)
         selected_text = ""
@@ -10105,7 +10317,7 @@ async def create_campaign_subcategory_select(update: Update, context: ContextTyp
             "💬 <b>Блогеры предложат цену</b> - блогеры сами предложат свою стоимость в откликах\n"
             "🤝 <b>Бартер</b> - предложение взаимовыгодного сотрудничества без денежной оплаты",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=_campaign_payment_markup(selected_payments),
         )
         return CREATE_CAMPAIGN_SUBCATEGORY_SELECT
 
@@ -10401,18 +10613,11 @@ async def create_campaign_back_to_region(update: Update, context: ContextTypes.D
         pass
 
     # Показываем регионы Беларуси
-    keyboard = []
-    for region_name, region_data in BELARUS_REGIONS.items():
-        keyboard.append([InlineKeyboardButton(
-            region_data["display"],
-            callback_data=f"campaignregion_{region_name}"
-        )])
-
     await query.edit_message_text(
         "📝 <b>Создание кампании</b>\n\n"
         "🏙 <b>Шаг 1:</b> Где нужен контент? Выберите регион или город:",
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=CAMPAIGN_REGION_MARKUP
     )
     return CREATE_CAMPAIGN_REGION_SELECT
 
@@ -10439,28 +10644,11 @@ async def create_campaign_back_to_city(update: Update, context: ContextTypes.DEF
         return await create_campaign_back_to_region(update, context)
 
     # Показываем города области
-    cities = region_data.get("cities", [])
-    keyboard = []
-    row = []
-    for city in cities:
-        row.append(InlineKeyboardButton(city, callback_data=f"campaigncity_{city}"))
-        if len(row) == 2:
-            keyboard.append(row)
-            row = []
-    if row:
-        keyboard.append(row)
-
-    keyboard.append([InlineKeyboardButton(
-        f"📍 Другой город в области",
-        callback_data="campaigncity_other"
-    )])
-    keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_region")])
-
     await query.edit_message_text(
         f"📍 Область: {region_data['display']}\n\n"
         "🏙 Выберите город:",
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=CAMPAIGN_CITY_MARKUPS[region],
     )
     return CREATE_CAMPAIGN_CITY
 
@@ -10476,23 +10664,11 @@ async def create_campaign_back_to_maincat(update: Update, context: ContextTypes.
     city = context.user_data.get("order_city", "")
 
     # Переходим к выбору категорий (упрощенные, без подкатегорий)
-    keyboard = []
-    row = []
-    for idx, category in enumerate(BLOGGER_CATEGORIES):
-        row.append(InlineKeyboardButton(category, callback_data=f"order_cat_{idx}"))
-        if len(row) == 2:
-            keyboard.append(row)
-            row = []
-    if row:
-        keyboard.append(row)
-
-    keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_city")])
-
     await query.edit_message_text(
         f"🏙 Город: <b>{city}</b>\n\n"
         "📱 <b>Шаг 2:</b> Выберите основную тематику контента:",
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard),
+        reply_markup=CAMPAIGN_MAIN_CATEGORY_MARKUP,
     )
     return CREATE_CAMPAIGN_MAIN_CATEGORY
 
@@ -10517,28 +10693,30 @@ async def create_campaign_city_other(update: Update, context: ContextTypes.DEFAU
         context.user_data["order_city"] = city
 
         # Переходим к выбору категорий (упрощенные, без подкатегорий)
-        keyboard = []
-        row = []
-        for idx, category in enumerate(BLOGGER_CATEGORIES):
-            row.append(InlineKeyboardButton(category, callback_data=f"order_cat_{idx}"))
-            if len(row) == 2:
-                keyboard.append(row)
-                row = []
-        if row:
-            keyboard.append(row)
-
-        keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="create_campaign_back_to_city")])
-
         await update.message.reply_text(
             f"🏙 Город: <b>{city}</b>\n\n"
             "📱 <b>Шаг 2:</b> Выберите основную тематику контента:",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            reply_markup=CAMPAIGN_MAIN_CATEGORY_MARKUP,
         )
         return CREATE_CAMPAIGN_MAIN_CATEGORY
 
 
 
+# Сообщение об успешной публикации: статичный текст собран один раз, подставляются только данные
+_TPL_CAMPAIGN_PUBLISHED = (
+    "🎉 <b>Рекламная кампания опубликована!</b>\n\n"
+    "📍 Город: {city}\n"
+    "📱 Категории: {categories}\n"
+    "{media}"
+    "📝 Описание: {desc}...\n\n"
+    "⏰ <b>Срок действия: 7 дней</b>\n"
+    "После этого кампания автоматически закроется и её нужно будет создать заново.\n\n"
+    "Блогеры получили уведомление о вашей кампании и скоро начнут откликаться!\n"
+    "Вы сможете выбрать лучших и начать общение для обсуждения деталей."
+)
+
+
 async def create_campaign_publish_confirmed(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработчик подтверждения публикации - вызывает create_campaign_publish"""
     return await create_campaign_publish(update, context)
@@ -10566,121 +10744,70 @@ async def create_campaign_publish(update: Update, context: ContextTypes.DEFAULT_
 
     if not ok:
         logger.error(f"Missing required fields in create_order: {missing}")
-        keyboard = [[InlineKeyboardButton("💼 Главное меню", callback_data="go_main_menu")]]
         await message.reply_text(
             "❌ Ошибка: недостаточно данных для создания кампания.\n\n"
             "Пожалуйста, начните создание кампания заново.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=GO_MAIN_MENU_MARKUP
         )
         context.user_data.clear()
         return ConversationHandler.END
 
     try:
-        logger.info("=== Публикация кампания ===")
-        logger.info(f"client_id: {context.user_data.get('order_client_id')}")
-        logger.info(f"city: {context.user_data.get('order_city')}")
-        logger.info(f"categories: {context.user_data.get('order_categories')}")
-        logger.info(f"description: {context.user_data.get('order_description')}")
-        logger.info(f"photos: {len(context.user_data.get('order_photos', []))}")
-        logger.info(f"videos: {len(context.user_data.get('order_videos', []))}")
+        # Одна строка лога вместо семи; аргументы собираем, только если INFO включён
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "=== Публикация кампании: client_id=%s city=%s categories=%s photos=%d videos=%d desc_len=%d",
+                context.user_data.get('order_client_id'),
+                context.user_data.get('order_city'),
+                context.user_data.get('order_categories'),
+                len(context.user_data.get('order_photos', [])),
+                len(context.user_data.get('order_videos', [])),
+                len(context.user_data.get('order_description') or ''),
+            )
 
-        # КРИТИЧНО: Валидация file_id перед сохранением кампания
+        # file_id проверены в create_campaign_photo_upload при загрузке, и до публикации
+        # списки не меняются - повторная проверка не нужна
         order_photos = context.user_data.get("order_photos", [])
-        valid_order_photos = [fid for fid in order_photos if validate_file_id(fid)]
-        if len(valid_order_photos) < len(order_photos):
-            removed_count = len(order_photos) - len(valid_order_photos)
-            logger.warning(f"⚠️ Удалено {removed_count} невалидных file_id из фото кампания")
-
-        # Валидация file_id для видео
         order_videos = context.user_data.get("order_videos", [])
-        valid_order_videos = [fid for fid in order_videos if validate_file_id(fid)]
-        if len(valid_order_videos) < len(order_videos):
-            removed_count = len(order_videos) - len(valid_order_videos)
-            logger.warning(f"⚠️ Удалено {removed_count} невалидных file_id из видео кампания")
 
         # Создаём кампанию в БД (может вызвать ValueError при rate limiting)
         try:
-            campaign_id = db.create_order(
+            campaign_id = await db_async.create_order(
                 advertiser_id=context.user_data["order_client_id"],
                 city=context.user_data["order_city"],
                 categories=context.user_data["order_categories"],  # Теперь это список
                 description=context.user_data["order_description"],
-                photos=valid_order_photos,
-                videos=valid_order_videos,
+                photos=order_photos,
+                videos=order_videos,
                 budget_type=context.user_data.get("budget_type", "none"),
                 budget_value=context.user_data.get("budget_value", 0),
                 payment_type=context.user_data.get("payment_type", "paid")
             )
         except ValueError as e:
             # Rate limiting error
-            keyboard = [[InlineKeyboardButton("⬅️ В меню", callback_data="show_client_menu")]]
             await message.reply_text(
                 str(e),
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=CLIENT_MENU_MARKUP
             )
             context.user_data.clear()
             return ConversationHandler.END
 
-        logger.info(f"✅ Кампания #{campaign_id} успешно сохранён в БД!")
-
-        # КРИТИЧНО: Логирование для диагностики уведомлений
-        logger.info(f"🔔 НАЧИНАЮ ОТПРАВКУ УВЕДОМЛЕНИЙ для кампания #{campaign_id}")
-
-        # Получаем созданную кампанию для отправки уведомлений
-        campaign = db.get_order_by_id(campaign_id)
-        logger.info(f"🔔 Кампания получена из БД: {campaign is not None}")
-        if campaign:
-            campaign_dict = dict(campaign)
-
-            # Находим всех блогеров в нужных категориях И городе и отправляем уведомления
-            order_city = context.user_data['order_city']
-            categories = context.user_data["order_categories"]
-
-            # ВАЖНО: фильтруем блогеров по городу И любой из выбранных категорий
-            # Используем set для избежания дубликатов
-            all_workers = set()
-            for category in categories:
-                workers_in_cat = db.get_all_workers(city=order_city, category=category)
-                for worker in workers_in_cat:
-                    all_workers.add(worker['id'])  # Добавляем по ID чтобы избежать дубликатов
-
-            # Получаем полные данные блогеров
-            workers = [db.get_worker_by_id(worker_id) for worker_id in all_workers]
-            workers = [w for w in workers if w is not None]  # Фильтруем None
-
-            logger.info(f"📢 Найдено {len(workers)} блогеров для уведомления (город: {order_city}, категории: {', '.join(categories)})")
-
-            notified_count = 0
-            for blogger in workers:
-                worker_dict = dict(blogger)
-
-                worker_user = db.get_user_by_id(worker_dict['user_id'])
-                if worker_user:
-                    # Проверяем включены ли уведомления у блогера
-                    notifications_enabled = db.are_notifications_enabled(worker_dict['user_id'])
-                    logger.info(f"🔔 Блогер {worker_dict['user_id']}: уведомления {'включены' if notifications_enabled else 'отключены'}")
-
-                    if notifications_enabled:
-                        await notify_blogger_new_campaign(
-                            context,
-                            worker_user['telegram_id'],
-                            worker_dict['user_id'],
-                            campaign_dict
-                        )
-                        notified_count += 1
+        logger.info("✅ Кампания #%s успешно сохранён в БД!", campaign_id)
 
-            logger.info(f"✅ Отправлено уведомлений: {notified_count} из {len(workers)} мастеров")
+        # Поиск блогеров и постановка уведомлений в очередь - в фоне:
+        # ответ клиенту не ждёт выборку блогеров (O(1) вместо O(блогеров))
+        _run_in_background(_fanout_campaign_notifications(
+            context.application,
+            campaign_id,
+            context.user_data['order_city'],
+            list(context.user_data["order_categories"]),
+        ))
 
         categories = context.user_data["order_categories"]
         categories_text = ", ".join(categories)
         photos_count = len(context.user_data.get("order_photos", []))
         videos_count = len(context.user_data.get("order_videos", []))
 
-        keyboard = [
-            [InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")],
-            [InlineKeyboardButton("⬅️ В меню", callback_data="show_client_menu")],
-        ]
-
         media_info = ""
         if photos_count > 0:
             media_info += f"📸 Фото: {photos_count}\n"
@@ -10688,17 +10815,14 @@ async def create_campaign_publish(update: Update, context: ContextTypes.DEFAULT_
             media_info += f"🎥 Видео: {videos_count}\n"
 
         await message.reply_text(
-            "🎉 <b>Рекламная кампания опубликована!</b>\n\n"
-            f"📍 Город: {context.user_data['order_city']}\n"
-            f"📱 Категории: {categories_text}\n"
-            f"{media_info}"
-            f"📝 Описание: {context.user_data['order_description'][:50]}...\n\n"
-            "⏰ <b>Срок действия: 7 дней</b>\n"
-            "После этого кампания автоматически закроется и её нужно будет создать заново.\n\n"
-            "Блогеры получили уведомление о вашей кампании и скоро начнут откликаться!\n"
-            "Вы сможете выбрать лучших и начать общение для обсуждения деталей.",
+            _TPL_CAMPAIGN_PUBLISHED.format(
+                city=context.user_data['order_city'],
+                categories=categories_text,
+                media=media_info,
+                desc=context.user_data['order_description'][:50],
+            ),
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=CAMPAIGN_PUBLISHED_MARKUP
         )
         
         logger.info("✅ Сообщение отправлено клиенту")
@@ -10708,11 +10832,10 @@ async def create_campaign_publish(update: Update, context: ContextTypes.DEFAULT_
     except Exception as e:
         logger.error(f"Ошибка создания кампания: {e}", exc_info=True)
         
-        keyboard = [[InlineKeyboardButton("⬅️ В меню", callback_data="show_client_menu")]]
         
         await message.reply_text(
             f"❌ Ошибка при создании кампания:\n{str(e)}\n\nПопробуйте ещё раз или обратитесь в поддержку.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=CLIENT_MENU_MARKUP
         )
         context.user_data.clear()
         return ConversationHandler.END
@@ -10722,6 +10845,63 @@ async def create_campaign_publish(update: Update, context: ContextTypes.DEFAULT_
 # ЗАВЕРШЕНИЕ ЗАКАЗА И СИСТЕМА ОТЗЫВОВ
 # ============================================
 
+# Тексты сообщений о завершении и отзывах - шаблоны для str.format
+_TPL_ADVERTISER_COMPLETED = (
+    "✅ <b>Кампания завершена!</b>\n\n"
+    "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
+    "💡 Оставьте отзыв о контенте блогера - это поможет другим заказчикам выбрать проверенного специалиста!"
+)
+_TPL_BLOGGER_COMPLETED = (
+    "✅ <b>Кампания завершена!</b>\n\n"
+    "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
+    "💡 Оставьте отзыв о контенте с рекламодателем!"
+)
+_TPL_COMPLETED_BY_ADVERTISER = (
+    "✅ <b>Кампания #{cid} завершена!</b>\n\n"
+    "Клиент завершил кампанию.\n"
+    "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
+    "💡 Оставьте отзыв о контенте с клиентом!"
+)
+_TPL_COMPLETED_BY_BLOGGER = (
+    "✅ <b>Кампания #{cid} завершена!</b>\n\n"
+    "Блогер завершил кампанию.\n"
+    "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
+    "💡 Оставьте отзыв о контенте блогера!"
+)
+_TPL_REVIEW_START = (
+    "⭐ <b>Оставьте отзыв</b>\n\n"
+    "Оцените работу: <b>{name}</b>\n\n"
+    "Выберите оценку от 1 до 5 звезд:"
+)
+_TPL_REVIEW_COMMENT_PROMPT = (
+    "✅ Оценка: {stars} ({rating}/5)\n\n"
+    "📝 Теперь напишите отзыв:\n"
+    "• Что понравилось или не понравилось?\n"
+    "• Качество контента\n"
+    "• Соблюдение сроков\n"
+    "• Коммуникация\n\n"
+    "Или пропустите, если хотите оставить только оценку."
+)
+_TPL_REVIEW_SAVED = (
+    "✅ <b>Отзыв успешно опубликован!</b>\n\n"
+    "Оценка: {stars} ({rating}/5)\n"
+)
+
+# Префиксы callback_data: id извлекается срезом, без поиска по всей строке
+_CB_COMPLETE_CAMPAIGN = "complete_campaign_"
+_CB_BLOGGER_COMPLETE_CAMPAIGN = "blogger_complete_campaign_"
+_CB_LEAVE_REVIEW = "leave_review_"
+_CB_REVIEW_RATING = "review_rating_"
+# show_reviews_<роль>_<user_id>; в кнопках встречаются и старые имена ролей
+_SHOW_REVIEWS_RE = re.compile(r"show_reviews_(worker|blogger|client|advertiser)_(\d+)")
+_REVIEW_ROLE_ALIASES = {
+    "worker": "blogger",
+    "blogger": "blogger",
+    "client": "advertiser",
+    "advertiser": "advertiser",
+}
+
+
 async def advertiser_complete_campaign(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     ИСПРАВЛЕНО: Клиент завершает кампанию.
@@ -10733,52 +10913,29 @@ async def advertiser_complete_campaign(update: Update, context: ContextTypes.DEF
     except Exception:
         pass
 
-    campaign_id = int(query.data.replace("complete_campaign_", ""))
+    campaign_id = int(query.data[len(_CB_COMPLETE_CAMPAIGN):])
 
     # ИСПРАВЛЕНО: Кампания завершается сразу (не требуется подтверждение от обеих сторон)
-    db.mark_order_completed_by_client(campaign_id)
-
-    # Получаем информацию о кампание и блогере
-    campaign = db.get_order_by_id(campaign_id)
-    worker_info = db.get_worker_info_for_order(campaign_id)
-
-    if campaign and worker_info:
-        campaign_dict = dict(campaign)
-        worker_dict = dict(worker_info)
+    # Завершение и данные блогера для уведомления - одной транзакцией
+    parties = await db_async.complete_campaign_and_get_parties(campaign_id, "advertiser")
 
+    if parties and parties['blogger_user_id'] is not None:
         # Уведомляем клиента
         await query.edit_message_text(
-            "✅ <b>Кампания завершена!</b>\n\n"
-            "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
-            "💡 Оставьте отзыв о контенте блогера - это поможет другим заказчикам выбрать проверенного специалиста!",
+            _TPL_ADVERTISER_COMPLETED,
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⭐ Оценить блогера", callback_data=f"leave_review_{campaign_id}")],
-                [InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")]
-            ])
+            reply_markup=_campaign_completed_markup(campaign_id, "advertiser")
         )
 
         # Уведомляем блогера о завершении кампания
-        user_id = worker_dict['user_id']
-        user = db.get_user_by_id(user_id)
-        if user:
-            user_dict = dict(user)
-            telegram_id = user_dict['telegram_id']
-            try:
-                await context.bot.send_message(
-                    chat_id=telegram_id,
-                    text=f"✅ <b>Кампания #{campaign_id} завершена!</b>\n\n"
-                         f"Клиент завершил кампанию.\n"
-                         f"Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
-                         f"💡 Оставьте отзыв о контенте с клиентом!",
-                    parse_mode="HTML",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("⭐ Оценить рекламодатела", callback_data=f"leave_review_{campaign_id}")],
-                        [InlineKeyboardButton("📦 Мои кампании", callback_data="worker_my_orders")]
-                    ])
-                )
-            except Exception as e:
-                logger.error(f"Не удалось отправить уведомление блогеру: {e}")
+        # Через общую очередь уведомлений: лимит скорости и повтор на 429
+        enqueue_message(
+            context.bot,
+            chat_id=parties['blogger_telegram_id'],
+            text=_TPL_COMPLETED_BY_ADVERTISER.format(cid=campaign_id),
+            parse_mode="HTML",
+            reply_markup=_campaign_completed_markup(campaign_id, "blogger")
+        )
 
 
 async def blogger_complete_campaign(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -10792,50 +10949,29 @@ async def blogger_complete_campaign(update: Update, context: ContextTypes.DEFAUL
     except Exception:
         pass
 
-    campaign_id = int(query.data.replace("blogger_complete_campaign_", ""))
+    campaign_id = int(query.data[len(_CB_BLOGGER_COMPLETE_CAMPAIGN):])
 
     # ИСПРАВЛЕНО: Кампания завершается сразу (не требуется подтверждение от обеих сторон)
-    db.mark_order_completed_by_worker(campaign_id)
-
-    # Получаем информацию о кампание
-    campaign = db.get_order_by_id(campaign_id)
-
-    if campaign:
-        campaign_dict = dict(campaign)
+    # Завершение и данные клиента для уведомления - одной транзакцией
+    parties = await db_async.complete_campaign_and_get_parties(campaign_id, "blogger")
 
+    if parties:
         # Уведомляем блогера
         await query.edit_message_text(
-            "✅ <b>Кампания завершена!</b>\n\n"
-            "Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
-            "💡 Оставьте отзыв о контенте с рекламодателем!",
+            _TPL_BLOGGER_COMPLETED,
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⭐ Оценить рекламодатела", callback_data=f"leave_review_{campaign_id}")],
-                [InlineKeyboardButton("📦 Мои кампании", callback_data="worker_my_orders")]
-            ])
+            reply_markup=_campaign_completed_markup(campaign_id, "blogger")
         )
 
         # Уведомляем клиента о завершении кампания
-        advertiser_user_id = campaign_dict['advertiser_user_id']
-        user = db.get_user_by_id(advertiser_user_id)
-        if user:
-            user_dict = dict(user)
-            telegram_id = user_dict['telegram_id']
-            try:
-                await context.bot.send_message(
-                    chat_id=telegram_id,
-                    text=f"✅ <b>Кампания #{campaign_id} завершена!</b>\n\n"
-                         f"Блогер завершил кампанию.\n"
-                         f"Кампания перемещена во вкладку \"Завершенные кампании\".\n\n"
-                         f"💡 Оставьте отзыв о контенте блогера!",
-                    parse_mode="HTML",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("⭐ Оценить блогера", callback_data=f"leave_review_{campaign_id}")],
-                        [InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")]
-                    ])
-                )
-            except Exception as e:
-                logger.error(f"Не удалось отправить уведомление клиенту: {e}")
+        # Через общую очередь уведомлений: лимит скорости и повтор на 429
+        enqueue_message(
+            context.bot,
+            chat_id=parties['advertiser_telegram_id'],
+            text=_TPL_COMPLETED_BY_BLOGGER.format(cid=campaign_id),
+            parse_mode="HTML",
+            reply_markup=_campaign_completed_markup(campaign_id, "advertiser")
+        )
 
 
 async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -10846,47 +10982,43 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
-    campaign_id = int(query.data.replace("leave_review_", ""))
+    campaign_id = int(query.data[len(_CB_LEAVE_REVIEW):])
     user_telegram_id = update.effective_user.id
-    user = db.get_user(user_telegram_id)
+    user = await db_async.get_user(user_telegram_id)
 
     if not user:
         await query.edit_message_text("❌ Ошибка: пользователь не найден")
         return ConversationHandler.END
 
-    user_dict = dict(user)
-    user_id = user_dict['id']
+    user_id = user['id']
 
-    # Получаем информацию о кампание
-    campaign = db.get_order_by_id(campaign_id)
+    # Получаем информацию о кампании и блогере параллельно
+    campaign, worker_info = await asyncio.gather(
+        db_async.get_order_by_id(campaign_id),
+        db_async.get_worker_info_for_order(campaign_id),
+    )
     if not campaign:
         await query.edit_message_text("❌ Кампания не найдена")
         return ConversationHandler.END
 
-    campaign_dict = dict(campaign)
-
     # 🛡️ ЗАЩИТА 1: Проверяем статус кампания - только completed
-    if campaign_dict['status'] != 'completed':
+    if campaign['status'] != 'completed':
         await query.edit_message_text(
             "⚠️ <b>Отзыв можно оставить только после завершения кампания</b>\n\n"
-            f"Текущий статус: {campaign_dict['status']}\n\n"
+            f"Текущий статус: {campaign['status']}\n\n"
             "Сначала завершите кампанию!",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")
-            ]])
+            reply_markup=REVIEW_BACK_MARKUP
         )
         return ConversationHandler.END
 
     # 🛡️ ЗАЩИТА 2: Проверяем что пользователь - участник кампания
-    advertiser_user_id = campaign_dict['advertiser_user_id']
-    worker_info = db.get_worker_info_for_order(campaign_id)
+    advertiser_user_id = campaign['advertiser_user_id']
 
     is_client = (user_id == advertiser_user_id)
     is_worker = False
     if worker_info:
-        worker_dict = dict(worker_info)
-        is_worker = (user_id == worker_dict['user_id'])
+        is_worker = (user_id == worker_info['user_id'])
 
     if not is_client and not is_worker:
         await query.edit_message_text(
@@ -10894,44 +11026,35 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "Вы не являетесь участником этого кампания.\n"
             "Оставить отзыв могут только клиент и блогер.",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")
-            ]])
+            reply_markup=REVIEW_BACK_MARKUP
+        )
+        return ConversationHandler.END
+
+    # Проверяем не оставлен ли уже отзыв - дешёвая проверка по индексу,
+    # до подсчёта заказов между пользователями за неделю
+    if await db_async.check_review_exists(campaign_id, user_id):
+        await query.edit_message_text(
+            "ℹ️ Вы уже оставили отзыв по этому кампаниу.",
+            reply_markup=REVIEW_BACK_MARKUP
         )
         return ConversationHandler.END
 
     # 🛡️ ЗАЩИТА 3: Минимальное время между принятием ставки и завершением (1 час)
-    from datetime import datetime, timedelta
-    if campaign_dict.get('accepted_at'):
-        accepted_at = datetime.fromisoformat(campaign_dict['accepted_at'])
-        completed_at = datetime.fromisoformat(campaign_dict['completed_at'])
-        time_diff = (completed_at - accepted_at).total_seconds() / 3600  # в часах
-
-        MIN_HOURS = 1
-        if time_diff < MIN_HOURS:
-            await query.edit_message_text(
-                "⚠️ <b>Подозрительно быстрое завершение</b>\n\n"
-                f"Кампания была завершена слишком быстро (менее {MIN_HOURS} часа после принятия ставки).\n\n"
-                "Отзывы для такихзаказов недоступны для предотвращения накрутки рейтинга.\n\n"
-                "💡 Если это ошибка, обратитесь в поддержку.",
-                parse_mode="HTML",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")
-                ]])
-            )
-            logger.warning(f"🛡️ [ANTI-FRAUD] Кампания #{campaign_id} завершен за {time_diff:.2f}ч - отзыв ЗАБЛОКИРОВАН")
-            return ConversationHandler.END
+    # ВРЕМЕННО ОТКЛЮЧЕНО: поля accepted_at и completed_at не существуют в campaigns
+    # (как и quick_completions в db.get_suspicious_activity_report), .get('accepted_at')
+    # всегда возвращал None - проверка не срабатывала ни разу. Когда поля появятся,
+    # разницу в часах считать в запросе, а не парсить даты здесь.
 
     # 🛡️ ЗАЩИТА 4: Лимит заказов между одними и теми же пользователями (макс 5 за неделю)
     # Определяем второго участника для проверки
     partner_user_id = None
     if is_client and worker_info:
-        partner_user_id = worker_dict['user_id']
+        partner_user_id = worker_info['user_id']
     elif is_worker:
         partner_user_id = advertiser_user_id
 
     if partner_user_id:
-        orders_count = db.count_orders_between_users(user_id, partner_user_id, days=7)
+        orders_count = await db_async.count_orders_between_users(user_id, partner_user_id, days=7)
         MAX_ORDERS_PER_WEEK = 5
 
         if orders_count > MAX_ORDERS_PER_WEEK:
@@ -10942,9 +11065,7 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 "Эта мера защищает от накрутки рейтинга.\n\n"
                 "💡 Если это ошибка, обратитесь в поддержку.",
                 parse_mode="HTML",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")
-                ]])
+                reply_markup=REVIEW_BACK_MARKUP
             )
             logger.warning(
                 f"🛡️ [ANTI-FRAUD] Между user_id={user_id} и user_id={partner_user_id} "
@@ -10952,16 +11073,6 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return ConversationHandler.END
 
-    # Проверяем не оставлен ли уже отзыв
-    if db.check_review_exists(campaign_id, user_id):
-        await query.edit_message_text(
-            "ℹ️ Вы уже оставили отзыв по этому кампаниу.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="go_main_menu")
-            ]])
-        )
-        return ConversationHandler.END
-
     # Сохраняем информацию в контексте
     context.user_data['review_order_id'] = campaign_id
     context.user_data['review_from_user_id'] = user_id
@@ -10970,11 +11081,10 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if user_id == advertiser_user_id:
         # Клиент оценивает блогера
         if worker_info:
-            worker_dict = dict(worker_info)
-            context.user_data['review_to_user_id'] = worker_dict['user_id']
+            context.user_data['review_to_user_id'] = worker_info['user_id']
             context.user_data['review_role_from'] = 'advertiser'
             context.user_data['review_role_to'] = 'blogger'
-            reviewer_name = worker_dict['name']
+            reviewer_name = worker_info['name']
         else:
             await query.edit_message_text("❌ Информация о блогере не найдена")
             return ConversationHandler.END
@@ -10983,28 +11093,13 @@ async def start_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
         context.user_data['review_to_user_id'] = advertiser_user_id
         context.user_data['review_role_from'] = 'blogger'
         context.user_data['review_role_to'] = 'advertiser'
-        reviewer_name = campaign_dict['advertiser_name']
+        reviewer_name = campaign['advertiser_name']
 
     # Показываем выбор звезд
-    keyboard = [
-        [
-            InlineKeyboardButton("⭐", callback_data="review_rating_1"),
-            InlineKeyboardButton("⭐⭐", callback_data="review_rating_2"),
-            InlineKeyboardButton("⭐⭐⭐", callback_data="review_rating_3"),
-        ],
-        [
-            InlineKeyboardButton("⭐⭐⭐⭐", callback_data="review_rating_4"),
-            InlineKeyboardButton("⭐⭐⭐⭐⭐", callback_data="review_rating_5"),
-        ],
-        [InlineKeyboardButton("❌ Отмена", callback_data="cancel_review")]
-    ]
-
     await query.edit_message_text(
-        f"⭐ <b>Оставьте отзыв</b>\n\n"
-        f"Оцените работу: <b>{reviewer_name}</b>\n\n"
-        f"Выберите оценку от 1 до 5 звезд:",
+        _TPL_REVIEW_START.format(name=reviewer_name),
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=REVIEW_RATING_MARKUP
     )
 
     return REVIEW_SELECT_RATING
@@ -11018,22 +11113,14 @@ async def review_select_rating(update: Update, context: ContextTypes.DEFAULT_TYP
     except Exception:
         pass
 
-    rating = int(query.data.replace("review_rating_", ""))
+    rating = int(query.data[len(_CB_REVIEW_RATING):])
     context.user_data['review_rating'] = rating
 
     # Просим написать комментарий
-    keyboard = [[InlineKeyboardButton("⏭ Пропустить комментарий", callback_data="review_skip_comment")]]
-
     stars = "⭐" * rating
     await query.edit_message_text(
-        f"✅ Оценка: {stars} ({rating}/5)\n\n"
-        f"📝 Теперь напишите отзыв:\n"
-        f"• Что понравилось или не понравилось?\n"
-        f"• Качество контента\n"
-        f"• Соблюдение сроков\n"
-        f"• Коммуникация\n\n"
-        f"Или пропустите, если хотите оставить только оценку.",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        _TPL_REVIEW_COMMENT_PROMPT.format(stars=stars, rating=rating),
+        reply_markup=REVIEW_SKIP_COMMENT_MARKUP
     )
 
     return REVIEW_ENTER_COMMENT
@@ -11082,41 +11169,40 @@ async def save_review(update: Update, context: ContextTypes.DEFAULT_TYPE, query=
         comment = context.user_data.get('review_comment', '')
 
         # Сохраняем отзыв
-        success = db.add_review(from_user_id, to_user_id, campaign_id, role_from, role_to, rating, comment)
+        success = await db_async.add_review(from_user_id, to_user_id, campaign_id, role_from, role_to, rating, comment)
 
         # Определяем меню для возврата на основе роли
         menu_callback = "show_worker_menu" if role_from == "blogger" else "show_client_menu"
 
         if success:
             stars = "⭐" * rating
-            message_text = (
-                f"✅ <b>Отзыв успешно опубликован!</b>\n\n"
-                f"Оценка: {stars} ({rating}/5)\n"
-            )
+            message_text = _TPL_REVIEW_SAVED.format(stars=stars, rating=rating)
             if comment:
-                message_text += f"\n📝 Комментарий:\n{comment[:100]}{'...' if len(comment) > 100 else ''}"
+                # Комментарий - пользовательский ввод, экранируем для parse_mode=HTML
+                preview = comment if len(comment) <= 100 else comment[:100] + "..."
+                message_text += f"\n📝 Комментарий:\n{html.escape(preview)}"
 
-            keyboard = [[InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)]]
+            reply_markup = MAIN_MENU_MARKUPS[menu_callback]
 
             if query:
                 await query.edit_message_text(
                     message_text,
                     parse_mode="HTML",
-                    reply_markup=InlineKeyboardMarkup(keyboard)
+                    reply_markup=reply_markup
                 )
             else:
                 await update.message.reply_text(
                     message_text,
                     parse_mode="HTML",
-                    reply_markup=InlineKeyboardMarkup(keyboard)
+                    reply_markup=reply_markup
                 )
         else:
             error_message = "❌ Не удалось сохранить отзыв. Возможно вы уже оставляли отзыв по этому кампаниу."
-            keyboard = [[InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)]]
+            reply_markup = MAIN_MENU_MARKUPS[menu_callback]
             if query:
-                await query.edit_message_text(error_message, reply_markup=InlineKeyboardMarkup(keyboard))
+                await query.edit_message_text(error_message, reply_markup=reply_markup)
             else:
-                await update.message.reply_text(error_message, reply_markup=InlineKeyboardMarkup(keyboard))
+                await update.message.reply_text(error_message, reply_markup=reply_markup)
 
     except Exception as e:
         logger.error(f"Ошибка при сохранении отзыва: {e}", exc_info=True)
@@ -11124,11 +11210,11 @@ async def save_review(update: Update, context: ContextTypes.DEFAULT_TYPE, query=
         # Определяем меню для возврата
         role_from = context.user_data.get('review_role_from', 'blogger')
         menu_callback = "show_worker_menu" if role_from == "blogger" else "show_client_menu"
-        keyboard = [[InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)]]
+        reply_markup = MAIN_MENU_MARKUPS[menu_callback]
         if query:
-            await query.edit_message_text(error_message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await query.edit_message_text(error_message, reply_markup=reply_markup)
         else:
-            await update.message.reply_text(error_message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await update.message.reply_text(error_message, reply_markup=reply_markup)
 
     # Очищаем данные
     context.user_data.clear()
@@ -11147,14 +11233,18 @@ async def cancel_review(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await query.edit_message_text(
         "❌ Отмена. Вы можете оставить отзыв позже.",
-        reply_markup=InlineKeyboardMarkup([[
-            InlineKeyboardButton("⬅️ В главное меню", callback_data="go_main_menu")
-        ]])
+        reply_markup=REVIEW_CANCELLED_MARKUP
     )
 
     return ConversationHandler.END
 
 
+# Сколько отзывов показывать в show_reviews
+_REVIEWS_PAGE_SIZE = 10
+# Строки звёзд для оценок 1-5
+_REVIEW_STARS = {rating: "⭐" * rating for rating in range(1, 6)}
+
+
 async def show_reviews(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает все отзывы о пользователе"""
     query = update.callback_query
@@ -11164,141 +11254,522 @@ async def show_reviews(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     try:
-        # Извлекаем user_id из callback_data (формат: show_reviews_worker_123 или show_reviews_client_123)
-        parts = query.data.split("_")
-        role = parts[2]  # blogger или advertiser
-        profile_user_id = int(parts[3])
+        # Извлекаем user_id из callback_data (формат: show_reviews_worker_123 или show_reviews_client_123)
+        match = _SHOW_REVIEWS_RE.match(query.data)
+        if not match:
+            logger.warning("Некорректный callback show_reviews: %s", query.data)
+            return
+        # В БД роли хранятся как blogger / advertiser
+        role = _REVIEW_ROLE_ALIASES[match.group(1)]
+        profile_user_id = int(match.group(2))
+
+        logger.info("Показываю отзывы для user_id=%s, role=%s", profile_user_id, role)
+
+        # Текущий пользователь (свой ли это профиль) и отзывы - параллельно.
+        # Отзывов берём 11: показываем 10, одиннадцатый - признак, что есть ещё
+        current_user, reviews = await asyncio.gather(
+            db_async.get_user(query.from_user.id),
+            db_async.get_reviews_for_user(profile_user_id, role, limit=_REVIEWS_PAGE_SIZE + 1),
+        )
+        is_own_profile = False
+        if current_user:
+            is_own_profile = (current_user['id'] == profile_user_id)
+
+        logger.info("Найдено %s отзывов", len(reviews) if reviews else 0)
+
+        if not reviews:
+            # Определяем callback для кнопки "Назад"
+            if is_own_profile:
+                # Если смотрим свой профиль - возврат в меню
+                back_callback = "show_worker_menu" if role in ["blogger", "both"] else "show_client_menu"
+            else:
+                # Если смотрим чужой профиль - возврат в профиль
+                back_callback = "worker_profile" if role in ["blogger", "both"] else "show_client_menu"
+
+            await safe_edit_message(
+                query,
+                "📊 <b>Отзывы</b>\n\n"
+                "Пока нет отзывов.",
+                parse_mode="HTML",
+                reply_markup=InlineKeyboardMarkup([[
+                    InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)
+                ]])
+            )
+            return
+
+        # Формируем текст с отзывами: фрагменты в список, одна склейка в конце.
+        # Имя и комментарий - пользовательский ввод, экранируем для parse_mode=HTML
+        parts = ["📊 <b>Отзывы</b>\n\n"]
+
+        for review in reviews[:_REVIEWS_PAGE_SIZE]:  # Показываем первые 10 отзывов
+            rating = review['rating']
+            reviewer_name = review['reviewer_name'] or 'Аноним'
+            comment = review['comment'] or ''
+
+            parts.extend((
+                "👤 <b>", html.escape(reviewer_name), "</b>\n",
+                _REVIEW_STARS.get(rating) or "⭐" * int(rating), f" ({rating}/5)\n",
+            ))
+            if comment:
+                # Обрезаем длинные комментарии (до экранирования, чтобы не разрезать сущность)
+                if len(comment) > 150:
+                    comment = comment[:150] + "..."
+                parts.extend(("💬 ", html.escape(comment), "\n"))
+            parts.append("\n")
+
+        if len(reviews) > _REVIEWS_PAGE_SIZE:
+            # Общее число считаем только когда оно нужно для подписи
+            total_reviews = await db_async.count_reviews_for_user(profile_user_id, role)
+            parts.append(f"<i>Показано {_REVIEWS_PAGE_SIZE} из {total_reviews} отзывов</i>\n")
+
+        # Определяем callback для кнопки "Назад"
+        if is_own_profile:
+            # Если смотрим свой профиль - возврат в меню
+            back_callback = "show_worker_menu" if role in ["blogger", "both"] else "show_client_menu"
+        else:
+            # Если смотрим чужой профиль - возврат в профиль
+            back_callback = "worker_profile" if role in ["blogger", "both"] else "show_client_menu"
+
+        await safe_edit_message(
+            query,
+            "".join(parts),
+            parse_mode="HTML",
+            reply_markup=InlineKeyboardMarkup([[
+                InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)
+            ]])
+        )
+
+    except Exception as e:
+        logger.error(f"Ошибка при показе отзывов: {e}", exc_info=True)
+        await safe_edit_message(
+            query,
+            "❌ <b>Ошибка при загрузке отзывов</b>\n\n"
+            f"К сожалению, произошла ошибка: {str(e)}\n\n"
+            "Попробуйте позже или обратитесь к администратору.",
+            parse_mode="HTML",
+            reply_markup=InlineKeyboardMarkup([[
+                InlineKeyboardButton("⬅️ Назад", callback_data="show_worker_menu")
+            ]])
+        )
+
+
+# ============================================
+# КОНЕЦ СИСТЕМЫ ОТЗЫВОВ
+# ============================================
+
+
+# ============================================
+# СИСТЕМА УВЕДОМЛЕНИЙ (ANNOUNCE)
+# ============================================
+
+# ===== NOTIFICATION HELPERS =====
+
+def _plural_form(count, one, few, many):
+    """Выбирает форму слова для числа: 1 кампания, 2 кампании, 5 кампаний"""
+    if count % 10 == 1 and count % 100 != 11:
+        return one
+    elif count % 10 in [2, 3, 4] and count % 100 not in [12, 13, 14]:
+        return few
+    else:
+        return many
+
+
+# Форма слова полностью определяется count % 100 - таблицы считаются один раз
+_ORDERS_FORMS = tuple(
+    _plural_form(n, "доступная кампания", "доступные кампании", "доступных кампаний") for n in range(100)
+)
+_BIDS_FORMS = tuple(
+    _plural_form(n, "новое предложение", "новых предложения", "новых предложений") for n in range(100)
+)
+
+
+def declension_orders(count):
+    """Склонение слова 'кампания' в зависимости от числа"""
+    return _ORDERS_FORMS[count % 100]
+
+
+def declension_bids(count):
+    """Склонение слова 'предложение' в зависимости от числа"""
+    return _BIDS_FORMS[count % 100]
+
+
+# Общая очередь исходящих уведомлений: (описание, send, попытка), где send - корутинная
+# функция без аргументов. Обработчики только кладут задания (enqueue_notification /
+# enqueue_message), отправляет фоновый диспетчер с общим лимитом скорости.
+_notification_queue = asyncio.Queue()
+# Telegram допускает ~30 сообщений/сек на бота - оставляем запас для ответов пользователям
+_NOTIFY_PER_SECOND = 25
+_NOTIFY_MAX_ATTEMPTS = 5
+_notification_tasks = []
+# message_id отправленных уведомлений о кампаниях: {blogger_user_id: строка для
+# db.save_worker_notifications}. Диспетчер записывает их одним commit на пачку.
+_worker_notification_rows = {}
+# Окно склейки обновляемых уведомлений ("У вас N кампаний/откликов"):
+# {ключ получателя: asyncio.TimerHandle отложенной постановки в очередь}
+_NOTIFY_DEBOUNCE_SECONDS = 1.5
+_debounced_notifications = {}
+# Сколько при остановке бота ждать досылки очереди и завершения диспетчера
+_NOTIFY_SHUTDOWN_TIMEOUT = 10
+
+
+def enqueue_notification(label, send):
+    """Ставит отправку в очередь уведомлений. label - для логов, send - корутинная функция без аргументов."""
+    _notification_queue.put_nowait((label, send, 0))
+
+
+def debounce_notification(key, label, send):
+    """
+    Ставит send в очередь уведомлений через _NOTIFY_DEBOUNCE_SECONDS.
+
+    Повторный вызов с тем же key в пределах окна заменяет отложенное задание:
+    на серию событий (10 откликов за пару секунд) уходит одно обновление
+    уведомления вместо delete+send на каждое событие.
+    """
+    previous = _debounced_notifications.pop(key, None)
+    if previous is not None:
+        previous.cancel()
+    _debounced_notifications[key] = asyncio.get_running_loop().call_later(
+        _NOTIFY_DEBOUNCE_SECONDS, _flush_debounced_notification, key, label, send
+    )
+
+
+def _flush_debounced_notification(key, label, send):
+    _debounced_notifications.pop(key, None)
+    enqueue_notification(label, send)
+
+
+def enqueue_message(bot, **send_message_kwargs):
+    """Ставит в очередь обычное bot.send_message с заданными аргументами."""
+    enqueue_notification(
+        f"сообщение в чат {send_message_kwargs.get('chat_id')}",
+        functools.partial(bot.send_message, **send_message_kwargs),
+    )
+
+
+async def _notification_dispatcher():
+    """
+    Отправляет уведомления из очереди пачками: не больше _NOTIFY_PER_SECOND в секунду.
+
+    Пачка отправляется одновременно через asyncio.gather, затем диспетчер ждёт
+    до конца секунды. На 429 задание возвращается в очередь, а следующая пачка
+    ждёт retry_after.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _notification_queue.get()]
+        while len(batch) < _NOTIFY_PER_SECOND and not _notification_queue.empty():
+            batch.append(_notification_queue.get_nowait())
+
+        # None - сигнал остановки от stop_notification_workers: пачка досылается,
+        # message_id записываются, затем диспетчер завершается
+        stopping = None in batch
+        if stopping:
+            batch = [job for job in batch if job is not None]
+            _notification_queue.task_done()
+
+        started = loop.time()
+        results = await asyncio.gather(*(send() for _, send, _ in batch), return_exceptions=True)
+
+        retry_after = 0
+        for (label, send, attempt), result in zip(batch, results):
+            if isinstance(result, RetryAfter):
+                # Telegram просит подождать - возвращаем задание в очередь
+                logger.warning("⏳ RetryAfter %s сек: %s", result.retry_after, label)
+                retry_after = max(retry_after, result.retry_after)
+                if attempt + 1 < _NOTIFY_MAX_ATTEMPTS:
+                    _notification_queue.put_nowait((label, send, attempt + 1))
+            elif isinstance(result, TimedOut) and attempt == 0:
+                # Таймаут - одна повторная попытка, повторный таймаут - ошибка ниже
+                _notification_queue.put_nowait((label, send, attempt + 1))
+            elif isinstance(result, Exception):
+                logger.error(f"Ошибка отправки уведомления ({label}): {result}", exc_info=result)
+            _notification_queue.task_done()
+
+        await _save_worker_notification_rows()
+        if stopping:
+            return
+
+        await asyncio.sleep(max(retry_after, 1.0 - (loop.time() - started)))
+
+
+async def _save_worker_notification_rows():
+    """Записывает накопленные message_id уведомлений блогеров одним commit"""
+    if not _worker_notification_rows:
+        return
+    rows = list(_worker_notification_rows.values())
+    _worker_notification_rows.clear()
+    try:
+        await asyncio.to_thread(db.save_worker_notifications, rows)
+    except Exception as e:
+        logger.error(f"Ошибка сохранения уведомлений блогеров: {e}", exc_info=True)
+
+
+async def _send_with_retry(method, *args, max_attempts=3, **kwargs):
+    """
+    Вызывает метод Bot API (send_message, edit_message_text, ...) с повтором.
+
+    Для отправок мимо очереди уведомлений. RetryAfter - повтор через retry_after
+    секунд, TimedOut/NetworkError - через 1, 2, 4... секунд. BadRequest
+    (чат недоступен, неверный текст) не повторяется. После последней попытки
+    ошибка пробрасывается вызывающей стороне.
+    """
+    for attempt in range(max_attempts):
+        last_attempt = attempt + 1 >= max_attempts
+        try:
+            return await method(*args, **kwargs)
+        except RetryAfter as e:
+            if last_attempt:
+                raise
+            await asyncio.sleep(e.retry_after)
+        except BadRequest:
+            # BadRequest - подкласс NetworkError, но повтор не поможет
+            raise
+        except NetworkError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(2 ** attempt)
+
+
+async def _send_paced(sends):
+    """
+    Отправляет пачками по _NOTIFY_PER_SECOND в секунду и ждёт результата.
+
+    В отличие от очереди уведомлений возвращает итог - для отчётов админу.
+    sends - список (описание, send), где send - корутинная функция без аргументов.
+    На RetryAfter задание повторяется после паузы, на TimedOut - один раз,
+    остальные ошибки считаются неудачей.
+
+    Returns:
+        (отправлено, не удалось)
+    """
+    loop = asyncio.get_running_loop()
+    pending = [(label, send, 0) for label, send in sends]
+    sent_count = 0
+    failed_count = 0
+
+    while pending:
+        batch = pending[:_NOTIFY_PER_SECOND]
+        pending = pending[_NOTIFY_PER_SECOND:]
+
+        started = loop.time()
+        results = await asyncio.gather(*(send() for _, send, _ in batch), return_exceptions=True)
+
+        retry_after = 0
+        for (label, send, attempt), result in zip(batch, results):
+            if isinstance(result, RetryAfter) and attempt + 1 < _NOTIFY_MAX_ATTEMPTS:
+                retry_after = max(retry_after, result.retry_after)
+                pending.append((label, send, attempt + 1))
+            elif isinstance(result, TimedOut) and attempt == 0:
+                # Таймаут - одна повторная попытка, как в диспетчере очереди
+                pending.append((label, send, attempt + 1))
+            elif isinstance(result, Exception):
+                logger.warning(f"Не удалось отправить ({label}): {result}")
+                failed_count += 1
+            else:
+                sent_count += 1
+
+        if pending:
+            await asyncio.sleep(max(retry_after, 1.0 - (loop.time() - started)))
+
+    return sent_count, failed_count
+
+
+async def start_notification_workers(application):
+    """post_init: запускает фоновый диспетчер очереди уведомлений"""
+    _notification_tasks.append(asyncio.create_task(_notification_dispatcher()))
+    logger.info("📨 Запущен диспетчер уведомлений: до %s сообщений/сек", _NOTIFY_PER_SECOND)
+
+
+async def stop_notification_workers(application):
+    """
+    post_stop: досылает очередь уведомлений и останавливает диспетчер.
+
+    Выполняется до post_shutdown - бот ещё может отправлять сообщения, а пул БД
+    открыт. Отложенные (debounce) обновления счётчиков отменяются, очередь
+    досылается не дольше _NOTIFY_SHUTDOWN_TIMEOUT секунд, остаток отбрасывается.
+    Диспетчер завершает текущую пачку и записывает message_id уведомлений.
+    """
+    for handle in _debounced_notifications.values():
+        handle.cancel()
+    _debounced_notifications.clear()
+
+    try:
+        await asyncio.wait_for(_notification_queue.join(), _NOTIFY_SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        dropped = 0
+        while not _notification_queue.empty():
+            _notification_queue.get_nowait()
+            _notification_queue.task_done()
+            dropped += 1
+        logger.warning("📨 Остановка: не отправлено уведомлений из очереди: %s", dropped)
 
-        logger.info(f"Показываю отзывы для user_id={profile_user_id}, role={role}")
+    if _notification_tasks:
+        _notification_queue.put_nowait(None)
+        _, pending = await asyncio.wait(_notification_tasks, timeout=_NOTIFY_SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*_notification_tasks, return_exceptions=True)
+        _notification_tasks.clear()
 
-        # Получаем текущего пользователя для проверки, смотрит ли он свой профиль
-        current_user = db.get_user(query.from_user.id)
-        is_own_profile = False
-        if current_user:
-            current_user_dict = dict(current_user)
-            is_own_profile = (current_user_dict['id'] == profile_user_id)
+    # Если диспетчер пришлось снять - записываем то, что он не успел
+    await _save_worker_notification_rows()
+    logger.info("📨 Диспетчер уведомлений остановлен")
 
-        # Получаем отзывы
-        reviews = db.get_reviews_for_user(profile_user_id, role)
-        logger.info(f"Найдено {len(reviews) if reviews else 0} отзывов")
 
-        if not reviews:
-            # Определяем callback для кнопки "Назад"
-            if is_own_profile:
-                # Если смотрим свой профиль - возврат в меню
-                back_callback = "show_worker_menu" if role in ["blogger", "both"] else "show_client_menu"
-            else:
-                # Если смотрим чужой профиль - возврат в профиль
-                back_callback = "worker_profile" if role in ["blogger", "both"] else "show_client_menu"
+# Ссылки на фоновые задачи: цикл событий хранит задачи только по слабой ссылке
+_pending_tasks = set()
 
-            await safe_edit_message(
-                query,
-                "📊 <b>Отзывы</b>\n\n"
-                "Пока нет отзывов.",
-                parse_mode="HTML",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)
-                ]])
-            )
-            return
 
-        # Формируем текст с отзывами
-        message_text = "📊 <b>Отзывы</b>\n\n"
+def _run_in_background(coro):
+    """Запускает корутину фоновой задачей, не дожидаясь её завершения"""
+    task = asyncio.create_task(coro)
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+    return task
 
-        for review in reviews[:10]:  # Показываем первые 10 отзывов
-            review_dict = dict(review)
-            rating = review_dict['rating']
-            stars = "⭐" * rating
-            reviewer_name = review_dict.get('reviewer_name', 'Аноним')
-            comment = review_dict.get('comment', '')
 
-            message_text += f"👤 <b>{reviewer_name}</b>\n"
-            message_text += f"{stars} ({rating}/5)\n"
-            if comment:
-                # Обрезаем длинные комментарии
-                if len(comment) > 150:
-                    comment = comment[:150] + "..."
-                message_text += f"💬 {comment}\n"
-            message_text += "\n"
+async def _fanout_campaign_notifications(application, campaign_id, order_city, categories):
+    """
+    Находит блогеров для новой кампании и ставит уведомления в очередь.
 
-        if len(reviews) > 10:
-            message_text += f"<i>Показано 10 из {len(reviews)} отзывов</i>\n"
+    Запускается фоновой задачей из create_campaign_publish, поэтому ошибки
+    только логируются.
+    """
+    try:
+        # КРИТИЧНО: Логирование для диагностики уведомлений
+        logger.info("🔔 НАЧИНАЮ ОТПРАВКУ УВЕДОМЛЕНИЙ для кампания #%s", campaign_id)
 
-        # Определяем callback для кнопки "Назад"
-        if is_own_profile:
-            # Если смотрим свой профиль - возврат в меню
-            back_callback = "show_worker_menu" if role in ["blogger", "both"] else "show_client_menu"
-        else:
-            # Если смотрим чужой профиль - возврат в профиль
-            back_callback = "worker_profile" if role in ["blogger", "both"] else "show_client_menu"
+        # Получаем созданную кампанию для отправки уведомлений
+        campaign = await db_async.get_order_by_id(campaign_id)
+        logger.info("🔔 Кампания получена из БД: %s", campaign is not None)
+        if not campaign:
+            return
+        campaign_dict = dict(campaign)
 
-        await safe_edit_message(
-            query,
-            message_text,
-            parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data=back_callback)
-            ]])
-        )
+        # ВАЖНО: фильтруем блогеров по городу И любой из выбранных категорий.
+        # Один запрос сразу по всем категориям: telegram_id и настройка уведомлений
+        # приходят в той же строке, запросов на каждого блогера нет
+        workers = await db_async.get_workers_for_campaign_notification(order_city, categories)
+
+        logger.info("📢 Найдено %s блогеров для уведомления (город: %s, категории: %s)", len(workers), order_city, ', '.join(categories))
+
+        # Уведомления отправляет диспетчер очереди с учётом RetryAfter.
+        # NULL в notifications_enabled - настройка не задана, по умолчанию включены
+        queued = 0
+        for worker in workers:
+            if worker['notifications_enabled'] is not None and not worker['notifications_enabled']:
+                continue
+            # Настройку уведомлений уже проверили выше - check_enabled=False.
+            # Кампании, опубликованные подряд, дают блогеру одно обновление
+            debounce_notification(
+                ("blogger", worker['user_id']),
+                f"новая кампания #{campaign_id} блогеру {worker['user_id']}",
+                functools.partial(
+                    notify_blogger_new_campaign, application, worker['telegram_id'], worker['user_id'],
+                    campaign_dict, check_enabled=False, defer_save=True,
+                ),
+            )
+            queued += 1
 
+        logger.info("✅ Поставлено в очередь уведомлений: %s из %s мастеров", queued, len(workers))
     except Exception as e:
-        logger.error(f"Ошибка при показе отзывов: {e}", exc_info=True)
-        await safe_edit_message(
-            query,
-            "❌ <b>Ошибка при загрузке отзывов</b>\n\n"
-            f"К сожалению, произошла ошибка: {str(e)}\n\n"
-            "Попробуйте позже или обратитесь к администратору.",
-            parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("⬅️ Назад", callback_data="show_worker_menu")
-            ]])
-        )
+        logger.error(f"Ошибка рассылки уведомлений о кампании {campaign_id}: {e}", exc_info=True)
 
 
-# ============================================
-# КОНЕЦ СИСТЕМЫ ОТЗЫВОВ
-# ============================================
+# Тексты уведомлений-счётчиков (str.format на каждую отправку)
+_TPL_BLOGGER_NEW_CAMPAIGN = (
+    "🔔 <b>У вас {count} {word}!</b>\n\n"
+    "👤 Рекламодатель: <b>{name}</b>\n"
+    "💰 Бюджет: <b>{budget}</b>\n"
+    "{desc}"
+    "\n👇 Нажмите кнопку чтобы посмотреть все доступные кампании"
+)
+_TPL_ADVERTISER_NEW_OFFER = (
+    "🔔 <b>У вас {count} {word}!</b>\n\n"
+    "📍 Последний: Кампания #{cid} от {name} ({price} {currency})\n\n"
+    "👇 Нажмите кнопку чтобы посмотреть все отклики"
+)
 
+# Если прошлое уведомление-счётчик было отправлено (со звуком) меньше этого окна
+# назад, оно редактируется без звука (1 запрос); иначе удаляется и отправляется
+# заново со звуком (2 запроса). Редактирование не сдвигает время отправки,
+# поэтому при непрерывном потоке событий звук всё равно раз в окно
+_NOTIFY_SILENT_EDIT_SECONDS = 10 * 60
 
-# ============================================
-# СИСТЕМА УВЕДОМЛЕНИЙ (ANNOUNCE)
-# ============================================
 
-# ===== NOTIFICATION HELPERS =====
+async def _refresh_counter_notification(bot, notification, count_field, count, chat_id, text, reply_markup):
+    """
+    Обновляет уведомление-счётчик ("У вас N кампаний/откликов").
 
-def declension_orders(count):
-    """Склонение слова 'кампания' в зависимости от числа"""
-    if count % 10 == 1 and count % 100 != 11:
-        return "доступная кампания"
-    elif count % 10 in [2, 3, 4] and count % 100 not in [12, 13, 14]:
-        return "доступные кампании"
-    else:
-        return "доступных кампаний"
+    notification - строка blogger_notifications / advertiser_notifications или None,
+    count_field - колонка с сохранённым счётчиком.
 
+    Returns:
+        (message_id, sent_at) актуального уведомления, где sent_at - время
+        отправки со звуком для last_update_timestamp, или (None, None),
+        если счётчик не изменился и обновлять нечего.
+    """
+    if notification and notification['notification_message_id']:
+        if notification[count_field] == count:
+            return None, None
 
-def declension_bids(count):
-    """Склонение слова 'предложение' в зависимости от числа"""
-    if count % 10 == 1 and count % 100 != 11:
-        return "новое предложение"
-    elif count % 10 in [2, 3, 4] and count % 100 not in [12, 13, 14]:
-        return "новых предложения"
-    else:
-        return "новых предложений"
+        sent_at = notification['last_update_timestamp'] or 0
+        if datetime.now().timestamp() - sent_at < _NOTIFY_SILENT_EDIT_SECONDS:
+            try:
+                await bot.edit_message_text(
+                    chat_id=notification['notification_chat_id'],
+                    message_id=notification['notification_message_id'],
+                    text=text,
+                    reply_markup=reply_markup,
+                    parse_mode="HTML"
+                )
+                return notification['notification_message_id'], sent_at
+            except (RetryAfter, TimedOut):
+                raise
+            except Exception as edit_error:
+                # Сообщение удалено пользователем или слишком старое - отправим заново
+                logger.warning(f"Не удалось отредактировать уведомление: {edit_error}")
+
+        try:
+            # Удаляем старое уведомление, новое придёт со звуком
+            await bot.delete_message(
+                chat_id=notification['notification_chat_id'],
+                message_id=notification['notification_message_id']
+            )
+        except Exception as delete_error:
+            logger.warning(f"Не удалось удалить старое уведомление: {delete_error}")
+
+    msg = await bot.send_message(
+        chat_id=chat_id,
+        text=text,
+        reply_markup=reply_markup,
+        parse_mode="HTML"
+    )
+    return msg.message_id, None
 
 
-async def notify_blogger_new_campaign(context, blogger_telegram_id, blogger_user_id, campaign_dict):
+async def notify_blogger_new_campaign(context, blogger_telegram_id, blogger_user_id, campaign_dict, check_enabled=True, defer_save=False):
     """
     Уведомление блогеру о новом кампание - ОБНОВЛЯЕТ существующее сообщение.
     Вместо спама отдельными сообщениями показывает одно обновляемое сообщение с количеством.
+
+    context - любой объект с атрибутом bot (CallbackContext или Application).
+    check_enabled=False - настройка уведомлений уже проверена вызывающей стороной.
+    defer_save=True - message_id сохраняет диспетчер очереди одним commit на пачку.
+    RetryAfter/TimedOut пробрасываются для повтора вызывающей стороной.
     """
     try:
         # Проверяем включены ли уведомления у блогера
-        if not db.are_notifications_enabled(blogger_user_id):
-            logger.info(f"Уведомления отключены для блогера {blogger_user_id}, пропускаем отправку")
+        if check_enabled and not await db_async.are_notifications_enabled(blogger_user_id):
+            logger.info("Уведомления отключены для блогера %s, пропускаем отправку", blogger_user_id)
             return False
 
-        # Подсчитываем все доступные кампании для этого блогера
-        available_orders_count = db.count_available_orders_for_worker(blogger_user_id)
+        # Подсчитываем все доступные кампании и получаем существующее уведомление - параллельно,
+        # в потоках: в пачке диспетчера идут 25 таких корутин одновременно
+        available_orders_count, notification = await asyncio.gather(
+            db_async.count_available_orders_for_worker(blogger_user_id),
+            db_async.get_worker_notification(blogger_user_id),
+        )
 
         advertiser_name = campaign_dict.get('advertiser_name', 'Не указан')
         budget_value = campaign_dict.get('budget_value')
@@ -11306,49 +11777,46 @@ async def notify_blogger_new_campaign(context, blogger_telegram_id, blogger_user
         description = campaign_dict.get('description', '') or ''
         description_preview = (description[:80] + '…') if len(description) > 80 else description
 
-        text = (
-            f"🔔 <b>У вас {available_orders_count} {declension_orders(available_orders_count)}!</b>\n\n"
-            f"👤 Рекламодатель: <b>{advertiser_name}</b>\n"
-            f"💰 Бюджет: <b>{budget_str}</b>\n"
-            + (f"📝 {description_preview}\n" if description_preview else "")
-            + f"\n👇 Нажмите кнопку чтобы посмотреть все доступные кампании"
+        # Имя и описание - пользовательский ввод, экранируем для parse_mode=HTML
+        text = _TPL_BLOGGER_NEW_CAMPAIGN.format(
+            count=available_orders_count,
+            word=declension_orders(available_orders_count),
+            name=html.escape(advertiser_name),
+            budget=budget_str,
+            desc=f"📝 {html.escape(description_preview)}\n" if description_preview else "",
         )
 
         keyboard = [[InlineKeyboardButton("📋 Посмотреть кампании", callback_data="worker_view_orders")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        # Пытаемся получить существующее уведомление
-        notification = db.get_worker_notification(blogger_user_id)
-
         try:
-            # НОВАЯ ЛОГИКА: Удаляем старое уведомление, отправляем новое (всегда со звуком!)
-            if notification and notification['notification_message_id']:
-                try:
-                    # Удаляем старое уведомление
-                    await context.bot.delete_message(
-                        chat_id=notification['notification_chat_id'],
-                        message_id=notification['notification_message_id']
-                    )
-                    logger.info(f"🗑 Удалено старое уведомление для блогера {blogger_user_id}")
-                except Exception as delete_error:
-                    logger.warning(f"Не удалось удалить старое уведомление: {delete_error}")
-
-            # Отправляем НОВОЕ уведомление (всегда со звуком!)
-            msg = await context.bot.send_message(
-                chat_id=blogger_telegram_id,
-                text=text,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
+            message_id, sent_at = await _refresh_counter_notification(
+                context.bot, notification, 'available_orders_count', available_orders_count,
+                blogger_telegram_id, text, reply_markup
             )
-            # Сохраняем message_id для следующего удаления
-            db.save_worker_notification(blogger_user_id, msg.message_id, blogger_telegram_id, available_orders_count)
-            logger.info(f"✅ Отправлено новое уведомление блогеру {blogger_user_id}: {available_orders_count} заказов")
+            if message_id is None:
+                logger.info("Уведомление блогера %s актуально (%s заказов), пропускаем", blogger_user_id, available_orders_count)
+                return True
+
+            # Сохраняем message_id для следующего обновления
+            if defer_save:
+                _worker_notification_rows[blogger_user_id] = (
+                    blogger_user_id, message_id, blogger_telegram_id, available_orders_count, sent_at
+                )
+            else:
+                await db_async.save_worker_notification(blogger_user_id, message_id, blogger_telegram_id, available_orders_count, sent_at)
+            logger.info("✅ Обновлено уведомление блогеру %s: %s заказов", blogger_user_id, available_orders_count)
 
+        except (RetryAfter, TimedOut):
+            # Повтор решает очередь уведомлений
+            raise
         except Exception as send_error:
             logger.error(f"Ошибка при отправке нового уведомления: {send_error}")
             return False
 
         return True
+    except (RetryAfter, TimedOut):
+        raise
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомления блогеру {blogger_telegram_id}: {e}")
         return False
@@ -11358,58 +11826,56 @@ async def notify_advertiser_new_offer(context, advertiser_telegram_id, advertise
     """
     Уведомление клиенту о новом предложение - ОБНОВЛЯЕТ существующее сообщение.
     Вместо спама отдельными сообщениями показывает одно обновляемое сообщение.
+
+    Вызывается из очереди уведомлений: RetryAfter/TimedOut пробрасываются для повтора.
     """
     try:
         # Проверяем включены ли уведомления у клиента
-        if not db.are_client_notifications_enabled(advertiser_user_id):
-            logger.info(f"Уведомления отключены для клиента {advertiser_user_id}, пропускаем отправку")
+        if not await db_async.are_client_notifications_enabled(advertiser_user_id):
+            logger.info("Уведомления отключены для клиента %s, пропускаем отправку", advertiser_user_id)
             return False
 
-        # Подсчитываем общее количество непрочитанных откликов
-        orders_with_bids = db.get_orders_with_unread_bids(advertiser_user_id)
-        total_bids = sum(campaign.get('offer_count', 0) for campaign in orders_with_bids)
+        # Подсчитываем непрочитанные отклики и получаем существующее уведомление - параллельно
+        total_bids, notification = await asyncio.gather(
+            db_async.count_unread_bids_total(advertiser_user_id),
+            db_async.get_client_notification(advertiser_user_id),
+        )
 
-        text = (
-            f"🔔 <b>У вас {total_bids} {declension_bids(total_bids)}!</b>\n\n"
-            f"📍 Последний: Кампания #{campaign_id} от {blogger_name} ({price} {currency})\n\n"
-            f"👇 Нажмите кнопку чтобы посмотреть все отклики"
+        text = _TPL_ADVERTISER_NEW_OFFER.format(
+            count=total_bids,
+            word=declension_bids(total_bids),
+            cid=campaign_id,
+            name=html.escape(str(blogger_name)),
+            price=price,
+            currency=currency,
         )
 
         keyboard = [[InlineKeyboardButton("📂 Мои кампании", callback_data="client_my_orders")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        # Пытаемся получить существующее уведомление
-        notification = db.get_client_notification(advertiser_user_id)
-
         try:
-            # НОВАЯ ЛОГИКА: Удаляем старое уведомление, отправляем новое (всегда со звуком!)
-            if notification and notification.get('notification_message_id'):
-                try:
-                    # Удаляем старое уведомление
-                    await context.bot.delete_message(
-                        chat_id=notification['notification_chat_id'],
-                        message_id=notification['notification_message_id']
-                    )
-                    logger.info(f"🗑 Удалено старое уведомление для клиента {advertiser_user_id}")
-                except Exception as delete_error:
-                    logger.warning(f"Не удалось удалить старое уведомление: {delete_error}")
-
-            # Отправляем НОВОЕ уведомление (всегда со звуком!)
-            msg = await context.bot.send_message(
-                chat_id=advertiser_telegram_id,
-                text=text,
-                reply_markup=reply_markup,
-                parse_mode="HTML"
+            message_id, sent_at = await _refresh_counter_notification(
+                context.bot, notification, 'unread_bids_count', total_bids,
+                advertiser_telegram_id, text, reply_markup
             )
-            # Сохраняем message_id для следующего удаления
-            db.save_client_notification(advertiser_user_id, msg.message_id, advertiser_telegram_id, total_bids)
-            logger.info(f"✅ Отправлено новое уведомление клиенту {advertiser_user_id}: {total_bids} откликов")
+            if message_id is None:
+                logger.info("Уведомление клиента %s актуально (%s откликов), пропускаем", advertiser_user_id, total_bids)
+                return True
 
+            # Сохраняем message_id для следующего обновления
+            await db_async.save_client_notification(advertiser_user_id, message_id, advertiser_telegram_id, total_bids, sent_at)
+            logger.info("✅ Обновлено уведомление клиенту %s: %s откликов", advertiser_user_id, total_bids)
+
+        except (RetryAfter, TimedOut):
+            # Повтор решает очередь уведомлений
+            raise
         except Exception as send_error:
             logger.error(f"Ошибка при отправке нового уведомления: {send_error}")
             return False
 
         return True
+    except (RetryAfter, TimedOut):
+        raise
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомления клиенту {advertiser_telegram_id}: {e}")
         return False
@@ -11428,7 +11894,8 @@ async def notify_blogger_selected(context, blogger_telegram_id, campaign_id, adv
             f"💡 После завершения работы не забудьте отметить кампанию как выполненную."
         )
 
-        await context.bot.send_message(
+        await _send_with_retry(
+            context.bot.send_message,
             chat_id=blogger_telegram_id,
             text=text,
             parse_mode="HTML"
@@ -11452,7 +11919,8 @@ async def notify_advertiser_master_selected(context, advertiser_telegram_id, cam
             f"💡 После завершения контенты не забудьте отметить кампанию как выполненный и оставить отзыв."
         )
 
-        await context.bot.send_message(
+        await _send_with_retry(
+            context.bot.send_message,
             chat_id=advertiser_telegram_id,
             text=text,
             parse_mode="HTML"
@@ -11475,7 +11943,8 @@ async def notify_completion_request(context, recipient_telegram_id, campaign_id,
             f"💡 После подтверждения обеих сторон вы сможете оставить отзыв."
         )
 
-        await context.bot.send_message(
+        await _send_with_retry(
+            context.bot.send_message,
             chat_id=recipient_telegram_id,
             text=text,
             parse_mode="HTML"
@@ -11496,7 +11965,8 @@ async def notify_campaign_completed(context, telegram_id, campaign_id, role):
             f"Это поможет другим пользователям сделать правильный выбор. 🤝"
         )
 
-        await context.bot.send_message(
+        await _send_with_retry(
+            context.bot.send_message,
             chat_id=telegram_id,
             text=text,
             parse_mode="HTML"
@@ -11520,7 +11990,8 @@ async def notify_new_review(context, telegram_id, reviewer_name, rating, campaig
             f"Посмотрите отзыв в своём профиле!"
         )
 
-        await context.bot.send_message(
+        await _send_with_retry(
+            context.bot.send_message,
             chat_id=telegram_id,
             text=text,
             parse_mode="HTML"
@@ -11712,6 +12183,53 @@ async def unban_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text(f"❌ Ошибка: {str(e)}")
 
 
+# Забаненных на странице /banned
+_BANNED_PAGE_SIZE = 10
+# Поля строки get_banned_users одним вызовом. По именам, а не по индексам:
+# в PostgreSQL строки - словари
+_banned_user_fields = operator.itemgetter('telegram_id', 'ban_reason', 'banned_at', 'banned_by')
+
+
+def _build_banned_users_page(offset):
+    """Текст и клавиатура страницы списка забаненных. None - список пуст."""
+    total = db.count_banned_users()
+    if not total:
+        return None, None
+
+    # Страница за пределами списка (часть разбанили) - показываем последнюю
+    if offset >= total:
+        offset = (total - 1) // _BANNED_PAGE_SIZE * _BANNED_PAGE_SIZE
+    banned_users = db.get_banned_users(limit=_BANNED_PAGE_SIZE, offset=offset)
+
+    parts = ["🚫 <b>Забаненные пользователи</b>\n\n"]
+
+    for telegram_id, reason, banned_at, banned_by in map(_banned_user_fields, banned_users):
+        parts.append(
+            f"👤 ID: <code>{telegram_id}</code>\n"
+            f"📝 Причина: {html.escape(reason or 'Не указана')}\n"
+            f"📅 Дата: {banned_at or 'Неизвестно'}\n"
+            f"👮 Забанил: {banned_by or 'Неизвестно'}\n\n"
+        )
+
+    parts.append(
+        f"\n<i>Показаны {offset + 1}-{offset + len(banned_users)}. "
+        f"Всего забанено: {total}</i>"
+    )
+    text = "".join(parts)
+
+    nav_row = []
+    if offset > 0:
+        nav_row.append(InlineKeyboardButton(
+            "⬅️ Предыдущие", callback_data=f"banned_users_page_{max(offset - _BANNED_PAGE_SIZE, 0)}"
+        ))
+    if offset + _BANNED_PAGE_SIZE < total:
+        nav_row.append(InlineKeyboardButton(
+            "➡️ Следующие", callback_data=f"banned_users_page_{offset + _BANNED_PAGE_SIZE}"
+        ))
+    reply_markup = InlineKeyboardMarkup([nav_row]) if nav_row else None
+    return text, reply_markup
+
+
 async def banned_users_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Команда /banned для просмотра списка забаненных пользователей
@@ -11723,30 +12241,34 @@ async def banned_users_command(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.message.reply_text("❌ У вас нет прав администратора.")
         return
 
-    banned_users = db.get_banned_users()
+    text, reply_markup = _build_banned_users_page(0)
 
-    if not banned_users:
+    if not text:
         await update.message.reply_text("📋 Список забаненных пользователей пуст.")
         return
 
-    text = "🚫 <b>Забаненные пользователи</b>\n\n"
+    await update.message.reply_text(text, parse_mode="HTML", reply_markup=reply_markup)
 
-    for user in banned_users[:10]:  # Показываем первых 10
-        telegram_id = user[0]
-        reason = user[1] or "Не указана"
-        banned_at = user[2] or "Неизвестно"
-        banned_by = user[3] or "Неизвестно"
 
-        text += (
-            f"👤 ID: <code>{telegram_id}</code>\n"
-            f"📝 Причина: {reason}\n"
-            f"📅 Дата: {banned_at}\n"
-            f"👮 Забанил: {banned_by}\n\n"
-        )
+async def banned_users_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Листание списка /banned (callback_data: banned_users_page_<offset>)"""
+    query = update.callback_query
+    try:
+        await query.answer()
+    except Exception:
+        pass
+
+    if not db.is_admin(query.from_user.id):
+        return
 
-    text += f"\n<i>Всего забанено: {len(banned_users)}</i>"
+    offset = int(query.data[len("banned_users_page_"):])
+    text, reply_markup = _build_banned_users_page(offset)
 
-    await update.message.reply_text(text, parse_mode="HTML")
+    if not text:
+        await safe_edit_message(query, "📋 Список забаненных пользователей пуст.")
+        return
+
+    await safe_edit_message(query, text, parse_mode="HTML", reply_markup=reply_markup)
 
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -11785,6 +12307,12 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(text, parse_mode="HTML")
 
 
+# Размер части рассылки /announce (между частями обновляется прогресс)
+_ANNOUNCE_CHUNK_SIZE = 500
+# Занят, пока рассылка /announce идёт в фоне (освобождает _run_announce)
+_announce_lock = asyncio.Lock()
+
+
 async def announce_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Команда /announce для отправки уведомлений всем пользователям.
@@ -11811,6 +12339,11 @@ async def announce_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     message_text = " ".join(context.args)
 
+    # Две рассылки одновременно делили бы лимит скорости и путали прогресс
+    if _announce_lock.locked():
+        await update.message.reply_text("⏳ Предыдущая рассылка ещё идёт. Дождитесь отчёта о её завершении.")
+        return
+
     # Получаем всех пользователей
     telegram_ids = db.get_all_user_telegram_ids()
 
@@ -11824,30 +12357,57 @@ async def announce_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"Текст:\n<i>{message_text}</i>",
         parse_mode="HTML"
     )
+    progress_msg = await update.message.reply_text(f"⏳ Отправлено: 0/{len(telegram_ids)}")
+
+    # Рассылка идёт фоновой задачей: обработчик сразу освобождается, и бот
+    # продолжает отвечать остальным пользователям (обновления обрабатываются
+    # последовательно, долгий обработчик задержал бы всех)
+    await _announce_lock.acquire()
+    _run_in_background(_run_announce(context.bot, telegram_ids, message_text, progress_msg))
+
 
+async def _run_announce(bot, telegram_ids, message_text, progress_msg):
+    """Фоновая часть /announce: рассылка частями и отчёт админу. Освобождает _announce_lock."""
+    # Частями по _ANNOUNCE_CHUNK_SIZE: задания создаются только для текущей части,
+    # после каждой части админ видит прогресс. Внутри части - до
+    # _NOTIFY_PER_SECOND сообщений в секунду вместо последовательных await
+    announce_text = f"📢 <b>Уведомление от администрации</b>\n\n{message_text}"
     sent_count = 0
     failed_count = 0
-
-    for telegram_id in telegram_ids:
-        try:
-            await context.bot.send_message(
-                chat_id=telegram_id,
-                text=f"📢 <b>Уведомление от администрации</b>\n\n{message_text}",
-                parse_mode="HTML"
-            )
-            sent_count += 1
-        except Exception as e:
-            logger.warning(f"Не удалось отправить сообщение пользователю {telegram_id}: {e}")
-            failed_count += 1
+    try:
+        for start in range(0, len(telegram_ids), _ANNOUNCE_CHUNK_SIZE):
+            chunk = telegram_ids[start:start + _ANNOUNCE_CHUNK_SIZE]
+            chunk_sent, chunk_failed = await _send_paced([
+                (
+                    f"рассылка пользователю {telegram_id}",
+                    functools.partial(bot.send_message, chat_id=telegram_id, text=announce_text, parse_mode="HTML"),
+                )
+                for telegram_id in chunk
+            ])
+            sent_count += chunk_sent
+            failed_count += chunk_failed
+            try:
+                await progress_msg.edit_text(
+                    f"⏳ Отправлено: {sent_count}/{len(telegram_ids)} (ошибок: {failed_count})"
+                )
+            except Exception as e:
+                logger.warning(f"Не удалось обновить прогресс рассылки: {e}")
+    except Exception as e:
+        logger.error(f"Ошибка рассылки /announce: {e}", exc_info=True)
+    finally:
+        _announce_lock.release()
 
     # Отчет о рассылке
-    await update.message.reply_text(
-        f"✅ <b>Рассылка завершена!</b>\n\n"
-        f"✅ Отправлено: {sent_count}\n"
-        f"❌ Не удалось: {failed_count}\n"
-        f"📊 Всего: {len(telegram_ids)}",
-        parse_mode="HTML"
-    )
+    try:
+        await progress_msg.reply_text(
+            f"✅ <b>Рассылка завершена!</b>\n\n"
+            f"✅ Отправлено: {sent_count}\n"
+            f"❌ Не удалось: {failed_count}\n"
+            f"📊 Всего: {len(telegram_ids)}",
+            parse_mode="HTML"
+        )
+    except Exception as e:
+        logger.error(f"Не удалось отправить отчёт о рассылке: {e}")
 
 
 async def check_expired_chats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -11862,104 +12422,61 @@ async def check_expired_chats_command(update: Update, context: ContextTypes.DEFA
         await update.message.reply_text("❌ У вас нет прав администратора.")
         return
 
-    # Получаем все просроченные чаты (где блогер не ответил в течение 24 часов)
-    expired_chats = db.get_expired_chats(hours=24)
+    # Обрабатываем все просроченные чаты (где блогер не ответил в течение 24 часов)
+    # одной транзакцией: рейтинг, статусы кампаний, откликов и чатов
+    try:
+        expired_chats = db.expire_unanswered_chats(hours=24)
+    except Exception as e:
+        logger.error(f"Ошибка при обработке просроченных чатов: {e}", exc_info=True)
+        await update.message.reply_text("❌ Ошибка при обработке просроченных чатов.")
+        return
 
     if not expired_chats:
         await update.message.reply_text("✅ Нет просроченных чатов (все блогера отвечают вовремя).")
         return
 
-    await update.message.reply_text(
-        f"🔍 Найдено просроченных чатов: {len(expired_chats)}\n"
-        f"Начинаю обработку...",
-        parse_mode="HTML"
-    )
-
-    processed_count = 0
-    error_count = 0
-
+    # Уведомления ставим в общую очередь: лимит скорости и повтор на 429 -
+    # на стороне диспетчера
     for chat in expired_chats:
-        try:
-            chat_id = chat['id']
-            campaign_id = chat['campaign_id']
-            advertiser_user_id = chat['advertiser_user_id']
-            blogger_user_id = chat['blogger_user_id']
-            offer_id = chat['offer_id']
-
-            # Получаем информацию о кампание
-            campaign = db.get_order_by_id(campaign_id)
-            if not campaign:
-                logger.warning(f"Кампания {campaign_id} не найдена для чата {chat_id}")
-                error_count += 1
-                continue
-
-            # Получаем информацию о клиенте и блогере
-            advertiser = db.get_user_by_id(advertiser_user_id)
-            worker_user = db.get_user_by_id(blogger_user_id)
-
-            if not advertiser or not worker_user:
-                logger.warning(f"Пользователи не найдены для чата {chat_id}")
-                error_count += 1
-                continue
-
-            # 1. Снижаем рейтинг блогера (добавляем негативную оценку 1.0 из 5.0)
-            db.update_user_rating(blogger_user_id, 1.0, "blogger")
-
-            # 2. Возвращаем кампанию в статус "open" (клиент может выбрать другого блогера)
-            db.update_order_status(campaign_id, "open")
-
-            # 3. Отмечаем предложение как отклоненное (чтобы не показывалось как выбранное)
-            # Но НЕ удаляем его - клиент может увидеть, что этот блогер не ответил
-            db.update_bid_status(offer_id, "rejected")
-
-            # 4. Уведомляем клиента что блогер не ответил и он может выбрать другого БЕЗ доп. оплаты
-            try:
-                await context.bot.send_message(
-                    chat_id=advertiser['telegram_id'],
-                    text=(
-                        f"⚠️ <b>Блогер не ответил в течение 24 часов</b>\n\n"
-                        f"📋 Кампания: {campaign['title']}\n\n"
-                        f"Ваша кампания снова открыта для выбора другого блогера.\n"
-                        f"💰 Дополнительная оплата НЕ требуется - ваша предыдущая оплата остается активной.\n\n"
-                        f"Просто выберите другого блогера из списка откликов."
-                    ),
-                    parse_mode="HTML",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("📋 Мои кампании", callback_data="client_my_orders")
-                    ]])
-                )
-            except Exception as e:
-                logger.warning(f"Не удалось отправить уведомление клиенту {advertiser['telegram_id']}: {e}")
-
-            # 5. Уведомляем блогера о снижении рейтинга
-            try:
-                await context.bot.send_message(
-                    chat_id=worker_user['telegram_id'],
-                    text=(
-                        f"⚠️ <b>Ваш рейтинг снижен!</b>\n\n"
-                        f"📋 Кампания: {campaign['title']}\n\n"
-                        f"Вы не ответили клиенту в течение 24 часов после того, как ваше предложение было выбрано.\n"
-                        f"📉 Ваш рейтинг был снижен.\n\n"
-                        f"⚡ <b>Совет:</b> Отвечайте клиентам быстрее, чтобы поддерживать высокий рейтинг!"
-                    ),
-                    parse_mode="HTML"
-                )
-            except Exception as e:
-                logger.warning(f"Не удалось отправить уведомление блогеру {worker_user['telegram_id']}: {e}")
-
-            processed_count += 1
-            logger.info(f"Обработан просроченный чат {chat_id} (кампания {campaign_id})")
+        title = html.escape(chat['title'] or '')
+
+        # Уведомляем клиента что блогер не ответил и он может выбрать другого БЕЗ доп. оплаты
+        enqueue_message(
+            context.bot,
+            chat_id=chat['advertiser_telegram_id'],
+            text=(
+                f"⚠️ <b>Блогер не ответил в течение 24 часов</b>\n\n"
+                f"📋 Кампания: {title}\n\n"
+                f"Ваша кампания снова открыта для выбора другого блогера.\n"
+                f"💰 Дополнительная оплата НЕ требуется - ваша предыдущая оплата остается активной.\n\n"
+                f"Просто выберите другого блогера из списка откликов."
+            ),
+            parse_mode="HTML",
+            reply_markup=InlineKeyboardMarkup([[
+                InlineKeyboardButton("📋 Мои кампании", callback_data="client_my_orders")
+            ]])
+        )
 
-        except Exception as e:
-            logger.error(f"Ошибка при обработке чата {chat.get('id', 'unknown')}: {e}")
-            error_count += 1
+        # Уведомляем блогера о снижении рейтинга
+        enqueue_message(
+            context.bot,
+            chat_id=chat['blogger_telegram_id'],
+            text=(
+                f"⚠️ <b>Ваш рейтинг снижен!</b>\n\n"
+                f"📋 Кампания: {title}\n\n"
+                f"Вы не ответили клиенту в течение 24 часов после того, как ваше предложение было выбрано.\n"
+                f"📉 Ваш рейтинг был снижен.\n\n"
+                f"⚡ <b>Совет:</b> Отвечайте клиентам быстрее, чтобы поддерживать высокий рейтинг!"
+            ),
+            parse_mode="HTML"
+        )
+        logger.info("Обработан просроченный чат %s (кампания %s)", chat['id'], chat['campaign_id'])
 
     # Отчет о проверке
     await update.message.reply_text(
         f"✅ <b>Проверка завершена!</b>\n\n"
-        f"✅ Обработано: {processed_count}\n"
-        f"❌ Ошибок: {error_count}\n"
-        f"📊 Всего найдено: {len(expired_chats)}",
+        f"✅ Обработано чатов: {len(expired_chats)}\n"
+        f"📨 Уведомления поставлены в очередь",
         parse_mode="HTML"
     )
 
@@ -11996,18 +12513,24 @@ AD_EDIT = 113  # Редактирование рекламы
 SUGGESTION_TEXT = 50  # ИСПРАВЛЕНО: Уникальное значение, не конфликтует с range(50)
 
 
+# Максимум реклам за одно нажатие "Новости и акции" - каждая уходит отдельным сообщением
+_NEWS_ADS_LIMIT = 10
+# Текст сообщения с рекламой (HTML в заголовке/описании задаёт админ - не экранируется)
+_TPL_AD_MESSAGE = "🎯 <b>{title}</b>\n\n{description}\n\n"
+
+
 async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Показывает ВСЕ активные рекламы/новости пользователю"""
+    """Показывает активные рекламы/новости пользователю (не больше _NEWS_ADS_LIMIT)"""
     query = update.callback_query
     try:
         await query.answer()
     except Exception:
         pass
 
-    logger.info(f"[ADS] show_news_and_ads вызван пользователем {update.effective_user.id}")
+    logger.info("[ADS] show_news_and_ads вызван пользователем %s", update.effective_user.id)
 
     # Получаем информацию о пользователе
-    user = db.get_user_by_telegram_id(update.effective_user.id)
+    user = await db_async.get_user(update.effective_user.id)
     if not user:
         await query.edit_message_text("❌ Ошибка: пользователь не найден.")
         return
@@ -12016,11 +12539,10 @@ async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Определяем роль пользователя для правильной кнопки "Назад"
     role = user_dict.get('role', 'advertiser')
-    back_callback = "show_worker_menu" if role in ['blogger', 'both'] else "show_client_menu"
-    back_text = "🔙 Назад в меню блогера" if role in ['blogger', 'both'] else "🔙 Назад в меню"
+    back_callback = _role_menu_callback(role)
 
-    # Получаем ВСЕ активные рекламы для баннера в меню с фильтрацией по роли
-    ads = db.get_active_ads('menu_banner', user_id=user_dict['id'], user_role=role)
+    # Получаем активные рекламы для баннера в меню с фильтрацией по роли
+    ads = await db_async.get_active_ads('menu_banner', user_id=user_dict['id'], user_role=role, limit=_NEWS_ADS_LIMIT)
 
     if not ads:
         # Если нет рекламы - показываем стандартное сообщение
@@ -12029,17 +12551,14 @@ async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "В данный момент нет активных новостей или акций.\n\n"
             "Следите за обновлениями! 🎯",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton(back_text, callback_data=back_callback)
-            ]])
+            reply_markup=NEWS_BACK_MARKUPS[back_callback]
         )
-        logger.info(f"[ADS] Нет активной рекламы для пользователя {update.effective_user.id}")
+        logger.info("[ADS] Нет активной рекламы для пользователя %s", update.effective_user.id)
         return
 
     # Редактируем первое сообщение (вместо кнопки "Новости и акции")
     first_ad = ads[0]
-    message_text = f"🎯 <b>{first_ad['title']}</b>\n\n"
-    message_text += f"{first_ad['description']}\n\n"
+    message_text = _TPL_AD_MESSAGE.format(title=first_ad['title'], description=first_ad['description'])
 
     # Формируем клавиатуру для первой рекламы
     keyboard = []
@@ -12057,19 +12576,14 @@ async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
         reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None
     )
 
-    logger.info(f"[ADS] Показана реклама ID={first_ad['id']} пользователю {update.effective_user.id}")
+    logger.info("[ADS] Показана реклама ID=%s пользователю %s", first_ad['id'], update.effective_user.id)
 
-    # Записываем просмотр первой рекламы
-    try:
-        db.record_ad_view(first_ad['id'], user_dict['id'])
-        logger.info(f"[ADS] Записан просмотр рекламы ID={first_ad['id']}")
-    except Exception as e:
-        logger.error(f"[ADS] Ошибка записи просмотра рекламы: {e}")
+    # ИСПРАВЛЕНО: просмотры копятся в списке и записываются одним запросом после цикла
+    shown_ad_ids = [first_ad['id']]
 
     # Отправляем остальные рекламы как новые сообщения
     for i, ad_dict in enumerate(ads[1:], start=2):
-        message_text = f"🎯 <b>{ad_dict['title']}</b>\n\n"
-        message_text += f"{ad_dict['description']}\n\n"
+        message_text = _TPL_AD_MESSAGE.format(title=ad_dict['title'], description=ad_dict['description'])
 
         # Формируем клавиатуру
         keyboard = []
@@ -12082,7 +12596,7 @@ async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Добавляем кнопку "Назад" только к последней рекламе
         is_last = (i == len(ads))
         if is_last:
-            keyboard.append([InlineKeyboardButton(back_text, callback_data=back_callback)])
+            keyboard.append([NEWS_BACK_BUTTONS[back_callback]])
 
         await update.effective_chat.send_message(
             message_text,
@@ -12090,23 +12604,23 @@ async def show_news_and_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reply_markup=InlineKeyboardMarkup(keyboard) if keyboard else None
         )
 
-        logger.info(f"[ADS] Показана реклама ID={ad_dict['id']} пользователю {update.effective_user.id}")
+        logger.info("[ADS] Показана реклама ID=%s пользователю %s", ad_dict['id'], update.effective_user.id)
 
-        # Записываем просмотр рекламы
-        try:
-            db.record_ad_view(ad_dict['id'], user_dict['id'])
-            logger.info(f"[ADS] Записан просмотр рекламы ID={ad_dict['id']}")
-        except Exception as e:
-            logger.error(f"[ADS] Ошибка записи просмотра рекламы: {e}")
+        shown_ad_ids.append(ad_dict['id'])
+
+    # Записываем просмотры показанных реклам
+    try:
+        await db_async.record_ad_views_bulk(user_dict['id'], shown_ad_ids)
+        logger.info("[ADS] Записаны просмотры рекламы ID=%s", shown_ad_ids)
+    except Exception as e:
+        logger.error(f"[ADS] Ошибка записи просмотров рекламы: {e}")
 
     # Если была только одна реклама, отправляем отдельное сообщение с кнопкой "Назад"
     if len(ads) == 1:
         await update.effective_chat.send_message(
             "📰 Это все актуальные новости и акции на сегодня! 🎯",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton(back_text, callback_data=back_callback)
-            ]])
+            reply_markup=NEWS_BACK_MARKUPS[back_callback]
         )
 
 
@@ -12118,7 +12632,7 @@ async def send_suggestion_start(update: Update, context: ContextTypes.DEFAULT_TY
     except Exception:
         pass
 
-    logger.info(f"🔍 send_suggestion_start вызван пользователем {update.effective_user.id}")
+    logger.info("🔍 send_suggestion_start вызван пользователем %s", update.effective_user.id)
 
     # Устанавливаем флаг, чтобы handle_chat_message не перехватывал сообщения
     context.user_data['suggestion_active'] = True
@@ -12136,24 +12650,24 @@ async def send_suggestion_start(update: Update, context: ContextTypes.DEFAULT_TY
         ]])
     )
 
-    logger.info(f"✅ Переход в состояние SUGGESTION_TEXT")
+    logger.info("✅ Переход в состояние SUGGESTION_TEXT")
     return SUGGESTION_TEXT
 
 
 async def receive_suggestion_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Получение текста предложения"""
-    logger.info(f"[DEBUG] receive_suggestion_text ВЫЗВАН! Пользователь: {update.effective_user.id}")
+    logger.info("[DEBUG] receive_suggestion_text ВЫЗВАН! Пользователь: %s", update.effective_user.id)
 
     # КРИТИЧНО: Очищаем флаг сразу, чтобы предотвратить двойную обработку
     # Если произойдет ошибка ниже, флаг уже будет очищен и handle_chat_message
     # в group=1 не обработает это сообщение повторно
     context.user_data.pop('suggestion_active', None)
-    logger.info(f"[FIX] Флаг suggestion_active очищен для пользователя {update.effective_user.id}")
+    logger.info("[FIX] Флаг suggestion_active очищен для пользователя %s", update.effective_user.id)
 
     message = update.message
     text = message.text
 
-    logger.info(f"🔍 receive_suggestion_text вызван пользователем {update.effective_user.id}. Текст: '{text[:50]}...'")
+    logger.info("🔍 receive_suggestion_text вызван пользователем %s. Текст: '%s...'", update.effective_user.id, text[:50])
 
     # ИСПРАВЛЕНО: Показываем индикатор "печатает..." для визуальной обратной связи
     try:
@@ -12173,37 +12687,25 @@ async def receive_suggestion_text(update: Update, context: ContextTypes.DEFAULT_
         return SUGGESTION_TEXT
 
     # Получаем информацию о пользователе
-    user = db.get_user_by_telegram_id(update.effective_user.id)
+    user = await db_async.get_user(update.effective_user.id)
     if not user:
         await message.reply_text("❌ Ошибка: пользователь не найден.")
         return ConversationHandler.END
 
     user_dict = dict(user)
 
-    # Определяем роль пользователя
-    worker_profile = db.get_worker_profile(user_dict['id'])
-    client_profile = db.get_client_profile(user_dict['id'])
-
-    if worker_profile and client_profile:
-        user_role = 'both'
-    elif worker_profile:
-        user_role = 'blogger'
-    elif client_profile:
-        user_role = 'advertiser'
-    else:
-        user_role = 'unknown'
+    # Определяем роль пользователя (ИСПРАВЛЕНО: один запрос вместо загрузки двух профилей)
+    user_role = _role_from_profile_flags(*await db_async.get_profile_flags(user_dict['id']))
+    menu_callback = _role_menu_callback(user_role)
 
     # Сохраняем предложение
     try:
-        suggestion_id = db.create_suggestion(user_dict['id'], user_role, text)
-        logger.info(f"✅ Предложение #{suggestion_id} создано пользователем {user_dict['id']}")
+        suggestion_id = await db_async.create_suggestion(user_dict['id'], user_role, text)
+        logger.info("✅ Предложение #%s создано пользователем %s", suggestion_id, user_dict['id'])
 
         # Флаг уже очищен в начале функции
 
-        # Определяем правильное меню для возврата
-        menu_callback = "show_worker_menu" if user_role in ['blogger', 'both'] else "show_client_menu"
-
-        logger.info(f"📤 Отправка подтверждения пользователю {update.effective_user.id} о получении предложения #{suggestion_id}")
+        logger.info("📤 Отправка подтверждения пользователю %s о получении предложения #%s", update.effective_user.id, suggestion_id)
 
         sent_message = await message.reply_text(
             "✅ <b>Спасибо за ваше предложение!</b>\n\n"
@@ -12211,12 +12713,10 @@ async def receive_suggestion_text(update: Update, context: ContextTypes.DEFAULT_
             "Мы обязательно рассмотрим его и постараемся сделать платформу лучше!\n\n"
             "💡 Вы можете отправить еще предложения в любое время через меню.",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)
-            ]])
+            reply_markup=MAIN_MENU_MARKUPS[menu_callback]
         )
 
-        logger.info(f"✅ Подтверждение успешно отправлено. Message ID: {sent_message.message_id}")
+        logger.info("✅ Подтверждение успешно отправлено. Message ID: %s", sent_message.message_id)
 
         return ConversationHandler.END
 
@@ -12225,15 +12725,10 @@ async def receive_suggestion_text(update: Update, context: ContextTypes.DEFAULT_
 
         # Флаг уже очищен в начале функции
 
-        # Определяем правильное меню для возврата
-        menu_callback = "show_worker_menu" if user_role in ['blogger', 'both'] else "show_client_menu"
-
         await message.reply_text(
             "❌ Произошла ошибка при отправке предложения.\n\n"
             "Попробуйте позже.",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)
-            ]])
+            reply_markup=MAIN_MENU_MARKUPS[menu_callback]
         )
         return ConversationHandler.END
 
@@ -12250,21 +12745,15 @@ async def cancel_suggestion(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop('suggestion_active', None)
 
     # Определяем меню для возврата
-    user = db.get_user_by_telegram_id(update.effective_user.id)
-    menu_callback = "show_worker_menu"
-    if user:
-        user_dict = dict(user)
-        client_profile = db.get_client_profile(user_dict['id'])
-        if client_profile and not db.get_worker_profile(user_dict['id']):
-            menu_callback = "show_client_menu"
+    user = await db_async.get_user(update.effective_user.id)
+    user_role = _role_from_profile_flags(*await db_async.get_profile_flags(user['id'])) if user else 'unknown'
+    menu_callback = _role_menu_callback(user_role)
 
     await query.edit_message_text(
         "❌ Отправка предложения отменена.\n\n"
         "Вы можете вернуться к ней в любое время через меню.",
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup([[
-            InlineKeyboardButton("💼 В главное меню", callback_data=menu_callback)
-        ]])
+        reply_markup=MAIN_MENU_MARKUPS[menu_callback]
     )
 
     return ConversationHandler.END
@@ -12278,7 +12767,7 @@ async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Админ-панель - доступна только админам (работает с командой /admin и callback)"""
     telegram_id = update.effective_user.id
 
-    logger.info(f"[ADMIN] admin_panel вызвана пользователем {telegram_id}")
+    logger.info("[ADMIN] admin_panel вызвана пользователем %s", telegram_id)
 
     if not db.is_admin(telegram_id):
         # Проверяем откуда пришел запрос - команда или callback
@@ -12324,7 +12813,7 @@ async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
-    logger.info(f"[ADMIN] Пользователь {telegram_id} вошёл в админ-панель, состояние ADMIN_MENU")
+    logger.info("[ADMIN] Пользователь %s вошёл в админ-панель, состояние ADMIN_MENU", telegram_id)
     return ADMIN_MENU
 
 
@@ -12372,7 +12861,7 @@ async def admin_broadcast_start(update: Update, context: ContextTypes.DEFAULT_TY
         pass
 
     telegram_id = update.effective_user.id
-    logger.info(f"[ADMIN] admin_broadcast_start вызвана пользователем {telegram_id}")
+    logger.info("[ADMIN] admin_broadcast_start вызвана пользователем %s", telegram_id)
 
     # Проверка прав администратора
     if not db.is_admin(telegram_id):
@@ -12404,7 +12893,7 @@ async def admin_broadcast_select_audience(update: Update, context: ContextTypes.
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_broadcast_select_audience вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_broadcast_select_audience вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Проверка прав администратора
     if not db.is_admin(update.effective_user.id):
@@ -12415,7 +12904,7 @@ async def admin_broadcast_select_audience(update: Update, context: ContextTypes.
     context.user_data['broadcast_audience'] = audience
     context.user_data['broadcast_active'] = True  # FIX B: Устанавливаем флаг для прямой маршрутизации
 
-    logger.info(f"[FIX B] Установлен broadcast_active=True для пользователя {update.effective_user.id}, audience={audience}")
+    logger.info("[FIX B] Установлен broadcast_active=True для пользователя %s, audience=%s", update.effective_user.id, audience)
 
     audience_text = {
         'all': '👥 Всем пользователям',
@@ -12447,7 +12936,7 @@ async def admin_broadcast_select_audience(update: Update, context: ContextTypes.
 
 async def admin_broadcast_send(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Отправка broadcast сообщения"""
-    logger.info(f"[ADMIN] admin_broadcast_send вызвана пользователем {update.effective_user.id}, текст: {update.message.text[:50] if update.message and update.message.text else 'N/A'}")
+    logger.info("[ADMIN] admin_broadcast_send вызвана пользователем %s, текст: %s", update.effective_user.id, update.message.text[:50] if update.message and update.message.text else 'N/A')
 
     # Проверка прав администратора
     if not db.is_admin(update.effective_user.id):
@@ -12458,7 +12947,7 @@ async def admin_broadcast_send(update: Update, context: ContextTypes.DEFAULT_TYP
     # Если произойдет ошибка ниже, флаг уже будет очищен и handle_chat_message
     # в group=1 не обработает это сообщение повторно
     context.user_data.pop('broadcast_active', None)
-    logger.info(f"[FIX] Флаг broadcast_active очищен для пользователя {update.effective_user.id}")
+    logger.info("[FIX] Флаг broadcast_active очищен для пользователя %s", update.effective_user.id)
 
     message_text = update.message.text
     audience = context.user_data.get('broadcast_audience', 'all')
@@ -12536,7 +13025,7 @@ async def admin_create_ad_start(update: Update, context: ContextTypes.DEFAULT_TY
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_create_ad_start вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_create_ad_start вызвана пользователем %s", update.effective_user.id)
 
     # Очищаем данные рекламы и устанавливаем флаг для direct_routing
     context.user_data['ad_data'] = {}
@@ -12559,7 +13048,7 @@ async def admin_create_ad_start(update: Update, context: ContextTypes.DEFAULT_TY
 
 async def admin_ad_title(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Получение заголовка рекламы"""
-    logger.info(f"[ADMIN] admin_ad_title вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_ad_title вызвана пользователем %s", update.effective_user.id)
 
     title = update.message.text
 
@@ -12587,7 +13076,7 @@ async def admin_ad_title(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def admin_ad_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Получение текста рекламы"""
-    logger.info(f"[ADMIN] admin_ad_text вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_ad_text вызвана пользователем %s", update.effective_user.id)
 
     text = update.message.text
 
@@ -12615,7 +13104,7 @@ async def admin_ad_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def admin_ad_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Получение URL рекламы"""
-    logger.info(f"[ADMIN] admin_ad_url вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_ad_url вызвана пользователем %s", update.effective_user.id)
 
     url = update.message.text
 
@@ -12645,7 +13134,7 @@ async def admin_ad_url(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def admin_ad_button_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Получение текста кнопки"""
-    logger.info(f"[ADMIN] admin_ad_button_text вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_ad_button_text вызвана пользователем %s", update.effective_user.id)
 
     button_text = update.message.text
 
@@ -12662,7 +13151,7 @@ async def admin_ad_button_text(update: Update, context: ContextTypes.DEFAULT_TYP
     # Автоматически устанавливаем размещение = баннер в меню
     context.user_data['ad_data']['placement'] = 'menu_banner'
 
-    logger.info(f"[AD] Переход к выбору целевой аудитории")
+    logger.info("[AD] Переход к выбору целевой аудитории")
 
     # Переходим к выбору целевой аудитории
     keyboard = [
@@ -12695,7 +13184,7 @@ async def admin_ad_audience(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_ad_audience вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_ad_audience вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Проверка наличия данных рекламы
     if 'ad_data' not in context.user_data:
@@ -12718,7 +13207,7 @@ async def admin_ad_audience(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ADMIN_MENU
 
     context.user_data['ad_data']['target_audience'] = target_audience
-    logger.info(f"[AD] Выбрана аудитория: {target_audience}")
+    logger.info("[AD] Выбрана аудитория: %s", target_audience)
 
     # Переходим к выбору продолжительности
     keyboard = [
@@ -12749,7 +13238,7 @@ async def admin_ad_duration(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_ad_duration вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_ad_duration вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Проверка наличия данных рекламы
     if 'ad_data' not in context.user_data:
@@ -12775,7 +13264,7 @@ async def admin_ad_duration(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ADMIN_MENU
 
     context.user_data['ad_data']['duration_days'] = duration_days
-    logger.info(f"[AD] Выбрана продолжительность: {duration_days} дней")
+    logger.info("[AD] Выбрана продолжительность: %s дней", duration_days)
 
     # Получаем данные для отображения
     target_audience = context.user_data['ad_data'].get('target_audience', 'all')
@@ -12816,7 +13305,7 @@ async def admin_ad_start_date(update: Update, context: ContextTypes.DEFAULT_TYPE
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_ad_start_date вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_ad_start_date вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Проверка наличия данных рекламы
     if 'ad_data' not in context.user_data:
@@ -12824,8 +13313,6 @@ async def admin_ad_start_date(update: Update, context: ContextTypes.DEFAULT_TYPE
         await query.edit_message_text("❌ Ошибка: данные рекламы не найдены. Начните создание заново.")
         return ADMIN_MENU
 
-    from datetime import datetime, timedelta
-
     # Определяем дату начала
     now = datetime.now()
     if query.data == "ad_start_now":
@@ -12848,7 +13335,7 @@ async def admin_ad_start_date(update: Update, context: ContextTypes.DEFAULT_TYPE
         return ADMIN_MENU
 
     context.user_data['ad_data']['start_datetime'] = start_date
-    logger.info(f"[AD] Выбрана дата начала: {start_date}")
+    logger.info("[AD] Выбрана дата начала: %s", start_date)
 
     # Вычисляем дату окончания
     duration_days = context.user_data['ad_data'].get('duration_days')
@@ -12907,7 +13394,7 @@ async def admin_ad_start_date(update: Update, context: ContextTypes.DEFAULT_TYPE
         reply_markup=InlineKeyboardMarkup(keyboard)
     )
 
-    logger.info(f"[AD] Отправлено подтверждение с полными настройками")
+    logger.info("[AD] Отправлено подтверждение с полными настройками")
     return AD_CONFIRM
 
 
@@ -12919,7 +13406,7 @@ async def admin_ad_placement(update: Update, context: ContextTypes.DEFAULT_TYPE)
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_ad_placement вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_ad_placement вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Проверка наличия данных рекламы
     if 'ad_data' not in context.user_data:
@@ -12930,7 +13417,7 @@ async def admin_ad_placement(update: Update, context: ContextTypes.DEFAULT_TYPE)
     placement = query.data.replace("ad_placement_", "")
     context.user_data['ad_data']['placement'] = placement
 
-    logger.info(f"[AD] Выбрано размещение: {placement}")
+    logger.info("[AD] Выбрано размещение: %s", placement)
 
     ad_data = context.user_data['ad_data']
     placement_text = "💼 Баннер в меню" if placement == "menu_banner" else "☀️ Утренняя рассылка"
@@ -12960,13 +13447,13 @@ async def admin_ad_placement(update: Update, context: ContextTypes.DEFAULT_TYPE)
         reply_markup=InlineKeyboardMarkup(keyboard)
     )
 
-    logger.info(f"[AD] Переходим в состояние AD_CONFIRM для обработки подтверждения")
+    logger.info("[AD] Переходим в состояние AD_CONFIRM для обработки подтверждения")
     return AD_CONFIRM
 
 
 async def admin_ad_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Подтверждение создания рекламы"""
-    logger.info(f"[AD_CONFIRM] ✅ ФУНКЦИЯ ВЫЗВАНА! Пользователь: {update.effective_user.id}")
+    logger.info("[AD_CONFIRM] ✅ ФУНКЦИЯ ВЫЗВАНА! Пользователь: %s", update.effective_user.id)
 
     query = update.callback_query
     try:
@@ -12974,11 +13461,11 @@ async def admin_ad_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
-    logger.info(f"[AD_CONFIRM] Callback data: {query.data}")
-    logger.info(f"[AD_CONFIRM] Context user_data: {context.user_data}")
+    logger.info("[AD_CONFIRM] Callback data: %s", query.data)
+    logger.info("[AD_CONFIRM] Context user_data: %s", context.user_data)
 
     if query.data == "ad_confirm_no":
-        logger.info(f"[AD] Создание рекламы отменено пользователем {update.effective_user.id}")
+        logger.info("[AD] Создание рекламы отменено пользователем %s", update.effective_user.id)
         await query.edit_message_text(
             "❌ Создание рекламы отменено.",
             parse_mode="HTML"
@@ -12997,7 +13484,7 @@ async def admin_ad_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Создаем рекламу
     ad_data = context.user_data['ad_data']
 
-    logger.info(f"[AD] Создание рекламы: {ad_data}")
+    logger.info("[AD] Создание рекламы: %s", ad_data)
 
     try:
         # Используем выбранные даты или defaults
@@ -13041,7 +13528,7 @@ async def admin_ad_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             duration_info = "📅 Действует без ограничения срока\n"
 
-        logger.info(f"✅ Реклама создана: ID={ad_id}")
+        logger.info("✅ Реклама создана: ID=%s", ad_id)
 
         await query.edit_message_text(
             f"✅ <b>Реклама создана!</b>\n\n"
@@ -13058,7 +13545,7 @@ async def admin_ad_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
             ]])
         )
 
-        logger.info(f"✅ Реклама #{ad_id} создана пользователем {update.effective_user.id}")
+        logger.info("✅ Реклама #%s создана пользователем %s", ad_id, update.effective_user.id)
 
     except Exception as e:
         logger.error(f"Ошибка создания рекламы: {e}")
@@ -13088,7 +13575,7 @@ async def admin_manage_ads(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_manage_ads вызвана пользователем {update.effective_user.id}")
+    logger.info("[ADMIN] admin_manage_ads вызвана пользователем %s", update.effective_user.id)
 
     # Получаем статистику по рекламам
     all_ads = db.get_all_ads()
@@ -13123,7 +13610,7 @@ async def admin_list_ads_by_status(update: Update, context: ContextTypes.DEFAULT
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_list_ads_by_status вызвана, callback: {query.data}")
+    logger.info("[ADMIN] admin_list_ads_by_status вызвана, callback: %s", query.data)
 
     # Определяем фильтр
     if query.data == "admin_ads_active":
@@ -13204,7 +13691,7 @@ async def admin_view_ad_detail(update: Update, context: ContextTypes.DEFAULT_TYP
     # Извлекаем ID рекламы из callback_data
     ad_id = int(query.data.split('_')[-1])
 
-    logger.info(f"[ADMIN] admin_view_ad_detail: ad_id={ad_id}")
+    logger.info("[ADMIN] admin_view_ad_detail: ad_id=%s", ad_id)
 
     # Получаем рекламу
     ad = db.get_ad_by_id(ad_id)
@@ -13282,7 +13769,7 @@ async def admin_toggle_ad_status(update: Update, context: ContextTypes.DEFAULT_T
     # Извлекаем ID рекламы
     ad_id = int(query.data.split('_')[-1])
 
-    logger.info(f"[ADMIN] admin_toggle_ad_status: ad_id={ad_id}")
+    logger.info("[ADMIN] admin_toggle_ad_status: ad_id=%s", ad_id)
 
     # Переключаем статус
     new_status = db.toggle_ad_active(ad_id)
@@ -13310,7 +13797,7 @@ async def admin_edit_ad_menu(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Извлекаем ID рекламы
     ad_id = int(query.data.split('_')[-1])
 
-    logger.info(f"[ADMIN] admin_edit_ad_menu: ad_id={ad_id}")
+    logger.info("[ADMIN] admin_edit_ad_menu: ad_id=%s", ad_id)
 
     # Получаем рекламу
     ad = db.get_ad_by_id(ad_id)
@@ -13361,7 +13848,7 @@ async def admin_edit_ad_field(update: Update, context: ContextTypes.DEFAULT_TYPE
     field = parts[3]  # title, description, button_text, button_url, dates
     ad_id = int(parts[-1])
 
-    logger.info(f"[ADMIN] admin_edit_ad_field: ad_id={ad_id}, field={field}")
+    logger.info("[ADMIN] admin_edit_ad_field: ad_id=%s, field=%s", ad_id, field)
 
     # Сохраняем в контексте
     context.user_data['editing_ad_id'] = ad_id
@@ -13402,7 +13889,7 @@ async def admin_delete_ad_confirm(update: Update, context: ContextTypes.DEFAULT_
     # Извлекаем ID рекламы
     ad_id = int(query.data.split('_')[-1])
 
-    logger.info(f"[ADMIN] admin_delete_ad_confirm: ad_id={ad_id}")
+    logger.info("[ADMIN] admin_delete_ad_confirm: ad_id=%s", ad_id)
 
     # Получаем рекламу
     ad = db.get_ad_by_id(ad_id)
@@ -13446,7 +13933,7 @@ async def admin_delete_ad_yes(update: Update, context: ContextTypes.DEFAULT_TYPE
     # Извлекаем ID рекламы
     ad_id = int(query.data.split('_')[-1])
 
-    logger.info(f"[ADMIN] admin_delete_ad_yes: ad_id={ad_id}")
+    logger.info("[ADMIN] admin_delete_ad_yes: ad_id=%s", ad_id)
 
     # Удаляем рекламу
     success = db.delete_ad(ad_id)
@@ -13476,7 +13963,7 @@ async def admin_process_ad_edit(update: Update, context: ContextTypes.DEFAULT_TY
     field = context.user_data['editing_field']
     new_value = update.message.text.strip()
 
-    logger.info(f"[ADMIN] admin_process_ad_edit: ad_id={ad_id}, field={field}, value={new_value[:50]}")
+    logger.info("[ADMIN] admin_process_ad_edit: ad_id=%s, field=%s, value=%s", ad_id, field, new_value[:50])
 
     try:
         # Валидация и обновление в зависимости от поля
@@ -13535,7 +14022,6 @@ async def admin_process_ad_edit(update: Update, context: ContextTypes.DEFAULT_TY
                     )
                     return ADMIN_MENU
 
-                from datetime import datetime, timedelta
                 new_end_date = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
                 db.update_ad(ad_id, end_date=new_end_date)
 
@@ -13620,13 +14106,12 @@ async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     telegram_id = update.effective_user.id
-    logger.info(f"[ADMIN] admin_stats вызвана пользователем {telegram_id}")
+    logger.info("[ADMIN] admin_stats вызвана пользователем %s", telegram_id)
 
     # Получаем статистику из БД
     stats = db.get_analytics_stats()
 
     # Добавляем timestamp для обновления
-    from datetime import datetime
     current_time = datetime.now().strftime("%H:%M:%S")
 
     text = f"📊 <b>СТАТИСТИКА ПЛАТФОРМЫ</b>\n"
@@ -13727,10 +14212,6 @@ async def admin_export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
     export_type = query.data.replace("admin_export_", "")
 
     try:
-        import csv
-        import io
-        from datetime import datetime
-
         # Создаем CSV в памяти
         output = io.StringIO()
         writer = csv.writer(output)
@@ -13896,7 +14377,7 @@ async def admin_category_reports(update: Update, context: ContextTypes.DEFAULT_T
         pass
 
     telegram_id = update.effective_user.id
-    logger.info(f"[ADMIN] admin_category_reports вызвана пользователем {telegram_id}")
+    logger.info("[ADMIN] admin_category_reports вызвана пользователем %s", telegram_id)
 
     try:
         reports = db.get_category_reports()
@@ -14116,7 +14597,7 @@ async def admin_users_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     telegram_id = update.effective_user.id
-    logger.info(f"[ADMIN] admin_users_menu вызвана пользователем {telegram_id}")
+    logger.info("[ADMIN] admin_users_menu вызвана пользователем %s", telegram_id)
 
     stats = db.get_analytics_stats()
 
@@ -14282,7 +14763,6 @@ async def admin_user_view(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if user.get('is_banned'):
         text += f"<b>Причина бана:</b> {user.get('ban_reason', 'Не указана')}\n"
 
-    from datetime import datetime
     created_at = user.get('created_at')
     if isinstance(created_at, str):
         created_at = datetime.fromisoformat(created_at)
@@ -14584,7 +15064,7 @@ async def admin_suggestions_filter(update: Update, context: ContextTypes.DEFAULT
     except Exception:
         pass
 
-    logger.info(f"[ADMIN] admin_suggestions_filter вызвана пользователем {update.effective_user.id}, callback_data: {query.data}")
+    logger.info("[ADMIN] admin_suggestions_filter вызвана пользователем %s, callback_data: %s", update.effective_user.id, query.data)
 
     # Извлекаем статус из callback_data: admin_suggestions_new/viewed/resolved
     status = query.data.split("_")[-1]  # new / viewed / resolved
@@ -14593,7 +15073,7 @@ async def admin_suggestions_filter(update: Update, context: ContextTypes.DEFAULT
     suggestions = db.get_suggestions_by_status(status)
     total_count = len(suggestions) if suggestions else 0
 
-    logger.info(f"[SUGGESTIONS] Найдено {total_count} предложений со статусом '{status}'")
+    logger.info("[SUGGESTIONS] Найдено %s предложений со статусом '%s'", total_count, status)
 
     # КРИТИЧНО: Если просматриваем НОВЫЕ предложения - отмечаем их как ПРОСМОТРЕННЫЕ
     if status == 'new' and suggestions:
@@ -14606,7 +15086,7 @@ async def admin_suggestions_filter(update: Update, context: ContextTypes.DEFAULT
             except Exception as e:
                 logger.error(f"Ошибка при обновлении статуса предложения #{suggestion_dict['id']}: {e}")
 
-        logger.info(f"✅ Отмечено {marked_count} предложений как 'viewed'")
+        logger.info("✅ Отмечено %s предложений как 'viewed'", marked_count)
 
     if not suggestions:
         await query.edit_message_text(